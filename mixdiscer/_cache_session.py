@@ -0,0 +1,42 @@
+""" Load-once, save-once session shared by the playlist and track caches """
+
+from pathlib import Path
+from typing import Callable, Optional
+
+
+class CacheSession:
+    """
+    Context manager that loads a cache once and saves it once on exit, and
+    only if something marked it as modified.
+    
+    Args:
+        cache_path: Path to the cache file
+        load: Function that reads the cache data from a path
+        save: Function that writes the cache data to a path
+    """
+    
+    def __init__(
+        self,
+        cache_path: Path,
+        load: Callable[[Path], dict],
+        save: Callable[[dict, Path], None]
+    ):
+        self.cache_path = cache_path
+        self.cache_data: Optional[dict] = None
+        self.dirty = False
+        self._load = load
+        self._save = save
+    
+    def __enter__(self) -> 'CacheSession':
+        self.cache_data = self._load(self.cache_path)
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        # Entries written before an error are still valid, so save regardless
+        if self.dirty:
+            self._save(self.cache_data, self.cache_path)
+            self.dirty = False
+    
+    def mark_dirty(self) -> None:
+        """Record that the cache data has been modified and needs saving"""
+        self.dirty = True
@@ -1,18 +1,42 @@
 """ Module for caching playlist data to avoid redundant music service API calls """
 
+import functools
 import hashlib
 import json
 import logging
+import os
+import sys
 
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import fields
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Optional
 
+from mixdiscer._cache_session import CacheSession
 from mixdiscer.playlists import Playlist
 from mixdiscer.music_service import MusicServicePlaylist, Track
 
 LOG = logging.getLogger(__name__)
 
+# Algorithm used for new content hashes. Entries written before the
+# algorithm was recorded used SHA-256.
+CONTENT_HASH_ALGORITHM = 'blake2b'
+LEGACY_CONTENT_HASH_ALGORITHM = 'sha256'
+_CONTENT_HASHERS = {
+    'blake2b': functools.partial(hashlib.blake2b, digest_size=32),
+    'sha256': hashlib.sha256,
+}
+
+# Hashing is I/O bound, so use more threads than cores
+HASH_WORKERS_PER_CPU = 4
+
+PLAYLIST_CACHE_VERSION = '2.0'
+
+# Track fields serialized directly, in row order; any others are kept in a
+# trailing 'service_specific' dictionary
+_CORE_TRACK_FIELDS = frozenset(('artist', 'title', 'album', 'duration', 'link'))
+
 
 def get_cache_key(playlist: Playlist) -> str:
     """
@@ -27,18 +51,54 @@ def get_cache_key(playlist: Playlist) -> str:
     return f"{playlist.user}/{playlist.title}"
 
 
-def compute_playlist_hash(filepath: Path) -> str:
+def compute_playlist_hash(filepath: Path, algorithm: str = CONTENT_HASH_ALGORITHM) -> str:
     """
-    Compute SHA256 hash of YAML file content.
+    Compute a 256-bit hash of YAML file content.
+    
+    BLAKE2b is used by default as it is faster than SHA-256 in software
+    and ships with hashlib. The file is streamed into the hash through a
+    reusable buffer rather than read into memory whole.
     
     Args:
         filepath: Path to playlist YAML file
+        algorithm: Hash algorithm name, a key of _CONTENT_HASHERS
         
     Returns:
-        Hex digest of file content hash
+        Hex digest of file content hash (64 characters)
     """
     with open(filepath, 'rb') as f:
-        return hashlib.sha256(f.read()).hexdigest()
+        return hashlib.file_digest(f, _CONTENT_HASHERS[algorithm]).hexdigest()
+
+
+def compute_playlist_hashes(
+    paths: list[Path],
+    algorithm: str = CONTENT_HASH_ALGORITHM
+) -> dict[Path, str]:
+    """
+    Compute content hashes for several playlist files using a thread pool.
+    
+    Args:
+        paths: Paths to playlist YAML files
+        algorithm: Hash algorithm name, a key of _CONTENT_HASHERS
+        
+    Returns:
+        Dictionary mapping each path to its hex digest
+    """
+    if not paths:
+        return {}
+    max_workers = min(len(paths), (os.cpu_count() or 1) * HASH_WORKERS_PER_CPU)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        digests = executor.map(functools.partial(compute_playlist_hash, algorithm=algorithm), paths)
+        return dict(zip(paths, digests))
+
+
+def _empty_cache() -> dict:
+    """Return a new, empty playlist cache structure"""
+    return {
+        'version': PLAYLIST_CACHE_VERSION,
+        'last_updated': datetime.now(timezone.utc).isoformat(),
+        'playlists': {}
+    }
 
 
 def load_cache(cache_path: Path) -> dict:
@@ -51,26 +111,50 @@ def load_cache(cache_path: Path) -> dict:
     Returns:
         Cache data dictionary
     """
-    if not cache_path.exists():
-        LOG.debug("Cache file not found, creating empty cache structure")
-        return {
-            'version': '1.0',
-            'last_updated': datetime.now(timezone.utc).isoformat(),
-            'playlists': {}
-        }
-    
     try:
-        with open(cache_path, 'r', encoding='utf-8') as f:
-            cache_data = json.load(f)
-            LOG.debug("Loaded cache from %s with %d playlists", cache_path, len(cache_data.get('playlists', {})))
-            return cache_data
-    except (json.JSONDecodeError, IOError) as e:
+        cache_data = json.loads(cache_path.read_bytes())
+    except FileNotFoundError:
+        LOG.debug("Cache file not found, creating empty cache structure")
+        return _empty_cache()
+    except (ValueError, IOError) as e:
         LOG.warning("Failed to load cache from %s: %s. Starting with empty cache.", cache_path, e)
-        return {
-            'version': '1.0',
-            'last_updated': datetime.now(timezone.utc).isoformat(),
-            'playlists': {}
-        }
+        return _empty_cache()
+    
+    if cache_data.get('version') != PLAYLIST_CACHE_VERSION:
+        _migrate_tracks_to_rows(cache_data)
+        cache_data['version'] = PLAYLIST_CACHE_VERSION
+        LOG.info("Migrated playlist cache to version %s", PLAYLIST_CACHE_VERSION)
+    
+    LOG.debug("Loaded cache from %s with %d playlists", cache_path, len(cache_data.get('playlists', {})))
+    return cache_data
+
+
+def _migrate_tracks_to_rows(cache_data: dict) -> None:
+    """
+    Convert version 1.0 caches, which store each track as a dictionary,
+    to the row format written by _serialize_track.
+    
+    Args:
+        cache_data: Cache data dictionary (modified in place)
+    """
+    for playlist_entry in cache_data.get('playlists', {}).values():
+        for service_cache in playlist_entry.get('music_services', {}).values():
+            rows = []
+            for track_data in service_cache.get('tracks', []):
+                if not isinstance(track_data, dict):
+                    rows.append(track_data)
+                    continue
+                row = [
+                    track_data['artist'],
+                    track_data['title'],
+                    track_data.get('album'),
+                    track_data['duration_seconds'],
+                    track_data.get('link'),
+                ]
+                if track_data.get('service_specific'):
+                    row.append(track_data['service_specific'])
+                rows.append(row)
+            service_cache['tracks'] = rows
 
 
 def save_cache(cache_data: dict, cache_path: Path) -> None:
@@ -91,28 +175,127 @@ def save_cache(cache_data: dict, cache_path: Path) -> None:
     
     cache_data['last_updated'] = datetime.now(timezone.utc).isoformat()
     
-    with open(cache_path, 'w', encoding='utf-8') as f:
-        json.dump(cache_data, f, indent=2)
+    # Write to a temporary file and swap it in so a crash mid-write never
+    # leaves a truncated cache behind
+    tmp_path = cache_path.with_name(cache_path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(json.dumps(cache_data, indent=2).encode('utf-8'))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, cache_path)
     
     LOG.debug("Saved cache to %s", cache_path)
 
 
-def is_cache_valid(playlist: Playlist, cache_entry: dict) -> bool:
+class PlaylistCacheSession(CacheSession):
+    """
+    Context manager that loads the playlist cache once and saves it once on
+    exit, and only if something marked it as modified. Use it around a batch
+    of playlists instead of loading and saving the cache for each one.
+    
+    Example:
+        with PlaylistCacheSession(cache_path) as session:
+            update_cache_entry(cache_key, playlist, service_playlist, session.cache_data)
+            session.mark_dirty()
+    """
+    
+    def __init__(self, cache_path: Path):
+        super().__init__(cache_path, load_cache, save_cache)
+
+
+def is_cache_valid(
+    playlist: Playlist,
+    cache_entry: dict,
+    content_hash: Optional[str] = None
+) -> bool:
     """
-    Check if cached data matches current playlist content by comparing hash.
+    Check if cached data matches current playlist content.
+    
+    An entry recorded for a different user or title is rejected without
+    touching the file. Otherwise the file content hash is compared.
     
     Args:
         playlist: Playlist object
         cache_entry: Cache entry dictionary
+        content_hash: Precomputed CONTENT_HASH_ALGORITHM hash of the file,
+                      used instead of reading it when the entry's algorithm matches
         
     Returns:
         True if cache is valid, False otherwise
     """
-    current_hash = compute_playlist_hash(playlist.filepath)
+    if (cache_entry.get('user', playlist.user) != playlist.user
+            or cache_entry.get('title', playlist.title) != playlist.title):
+        return False
+    
+    algorithm = cache_entry.get('content_hash_algorithm', LEGACY_CONTENT_HASH_ALGORITHM)
+    if algorithm not in _CONTENT_HASHERS:
+        return False
+    if content_hash is not None and algorithm == CONTENT_HASH_ALGORITHM:
+        current_hash = content_hash
+    else:
+        current_hash = compute_playlist_hash(playlist.filepath, algorithm)
     cached_hash = cache_entry.get('content_hash')
     return cached_hash == current_hash
 
 
+def _serialize_track(track: Optional[Track]) -> Optional[list]:
+    """
+    Convert a track to its cached form.
+    
+    Tracks are stored as fixed-order rows of
+    [artist, title, album, duration_seconds, link] rather than dictionaries,
+    so field names are not repeated for every track.
+    
+    Args:
+        track: Track to serialize, or None for a track that was not found
+        
+    Returns:
+        Row of track data, or None
+    """
+    if track is None:
+        return None
+    row = [
+        track.artist,
+        track.title,
+        track.album,
+        int(track.duration.total_seconds()),
+        track.link,
+    ]
+    # Store service-specific data if available (e.g., SpotifyTrack.uri)
+    service_specific = {
+        field.name: getattr(track, field.name)
+        for field in fields(track) if field.name not in _CORE_TRACK_FIELDS
+    }
+    if service_specific:
+        row.append(service_specific)
+    return row
+
+
+def _deserialize_track(row: Optional[list]) -> Optional[Track]:
+    """
+    Rebuild a track from its cached form.
+    
+    Artist and album names repeat heavily across playlists, so they are
+    interned to share one string object per name.
+    
+    Args:
+        row: Row written by _serialize_track, or None
+        
+    Returns:
+        Track object, or None for a track that was not found
+    """
+    if row is None:
+        return None
+    artist, title, album, duration_seconds, link = row[:5]
+    return Track(
+        artist=sys.intern(artist),
+        title=title,
+        album=sys.intern(album) if album is not None else None,
+        duration=timedelta(seconds=duration_seconds),
+        link=link
+    )
+
+
 def get_cached_music_service_playlist(
     cache_key: str,
     service_name: str,
@@ -133,24 +316,29 @@ def get_cached_music_service_playlist(
     if not playlist_cache:
         return None
     
-    service_cache = playlist_cache.get('music_services', {}).get(service_name)
+    return get_entry_music_service_playlist(playlist_cache, service_name)
+
+
+def get_entry_music_service_playlist(
+    cache_entry: dict,
+    service_name: str
+) -> Optional[MusicServicePlaylist]:
+    """
+    Retrieve cached MusicServicePlaylist for specific service from a
+    playlist cache entry that has already been looked up.
+    
+    Args:
+        cache_entry: Cache entry dictionary for one playlist
+        service_name: Name of music service (e.g., "spotify")
+        
+    Returns:
+        MusicServicePlaylist if cached, None otherwise
+    """
+    service_cache = cache_entry.get('music_services', {}).get(service_name)
     if not service_cache:
         return None
     
-    # Deserialize tracks
-    tracks = []
-    for track_data in service_cache['tracks']:
-        if track_data is None:
-            tracks.append(None)
-        else:
-            # Reconstruct Track object
-            tracks.append(Track(
-                artist=track_data['artist'],
-                title=track_data['title'],
-                album=track_data.get('album'),
-                duration=timedelta(seconds=track_data['duration_seconds']),
-                link=track_data.get('link')
-            ))
+    tracks = [_deserialize_track(row) for row in service_cache['tracks']]
     
     return MusicServicePlaylist(
         service_name=service_name,
@@ -164,7 +352,8 @@ def update_cache_entry(
     playlist: Playlist,
     music_service_playlist: MusicServicePlaylist,
     cache_data: dict,
-    snapshot_id: Optional[str] = None
+    snapshot_id: Optional[str] = None,
+    content_hash: Optional[str] = None
 ) -> None:
     """
     Update cache entry for a specific music service.
@@ -176,13 +365,18 @@ def update_cache_entry(
         music_service_playlist: Processed music service playlist
         cache_data: Cache data dictionary (modified in place)
         snapshot_id: Optional Spotify snapshot_id for remote playlists
+        content_hash: Precomputed CONTENT_HASH_ALGORITHM hash of the file,
+                      used instead of reading it again
     """
+    if content_hash is None:
+        content_hash = compute_playlist_hash(playlist.filepath)
+    
     if cache_key not in cache_data['playlists']:
         cache_data['playlists'][cache_key] = {
             'user': playlist.user,
             'title': playlist.title,
             'filepath': str(playlist.filepath),
-            'content_hash': compute_playlist_hash(playlist.filepath),
+            'content_hash': content_hash,
             'music_services': {},
             'cached_at': datetime.now(timezone.utc).isoformat()
         }
@@ -190,7 +384,11 @@ def update_cache_entry(
     playlist_entry = cache_data['playlists'][cache_key]
     
     # Update content hash in case playlist was modified
-    playlist_entry['content_hash'] = compute_playlist_hash(playlist.filepath)
+    playlist_entry['content_hash'] = content_hash
+    playlist_entry['content_hash_algorithm'] = CONTENT_HASH_ALGORITHM
+    # Drop the file size and mtime stored by earlier versions
+    playlist_entry.pop('file_size', None)
+    playlist_entry.pop('file_mtime_ns', None)
     playlist_entry['filepath'] = str(playlist.filepath)
     
     # Update remote playlist metadata if applicable
@@ -209,28 +407,7 @@ def update_cache_entry(
         playlist_entry['remote_frozen_at'] = None
         playlist_entry['remote_frozen_reason'] = None
     
-    # Serialize tracks
-    serialized_tracks = []
-    for track in music_service_playlist.tracks:
-        if track is None:
-            serialized_tracks.append(None)
-        else:
-            track_data = {
-                'artist': track.artist,
-                'title': track.title,
-                'album': track.album,
-                'duration_seconds': int(track.duration.total_seconds()),
-                'link': track.link
-            }
-            # Store service-specific data if available (e.g., SpotifyTrack.uri)
-            if hasattr(track, '__dict__'):
-                service_specific = {}
-                for key, value in track.__dict__.items():
-                    if key not in ['artist', 'title', 'album', 'duration', 'link']:
-                        service_specific[key] = value
-                if service_specific:
-                    track_data['service_specific'] = service_specific
-            serialized_tracks.append(track_data)
+    serialized_tracks = [_serialize_track(track) for track in music_service_playlist.tracks]
     
     # Update service-specific cache
     playlist_entry['music_services'][music_service_playlist.service_name] = {
@@ -255,8 +432,8 @@ def cleanup_stale_cache_entries(
         Count of removed entries
     """
     current_keys = {get_cache_key(p) for p in current_playlists}
-    cached_keys = set(cache_data['playlists'].keys())
-    stale_keys = cached_keys - current_keys
+    # Single pass over the cache in its stored order, so removals are logged deterministically
+    stale_keys = [key for key in cache_data['playlists'] if key not in current_keys]
     
     for key in stale_keys:
         LOG.info("Removing stale cache entry: %s", key)
@@ -1,42 +1,168 @@
 """Utilities for genre management"""
 
+import json
+import os
+import re
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 from collections import Counter
 import yaml
 
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
 
-def get_genres_from_playlists(mixdiscs_dir: Path) -> dict[str, int]:
+# A top-level "genre:" line whose value is unambiguously a plain YAML string:
+# starts with a letter, and has no quoting, comments or mapping indicators
+_GENRE_LINE_PATTERN = re.compile(
+    rb"^genre:[ \t]*([A-Za-z][\w &/+.,'!()-]*?)[ \t]*\r?$",
+    re.MULTILINE
+)
+# Plain words YAML resolves to booleans or null rather than strings
+_YAML_NON_STRING_WORDS = frozenset(('yes', 'no', 'true', 'false', 'on', 'off', 'null'))
+GENRE_INDEX_VERSION = 1
+
+
+def default_genre_index_path() -> Path:
+    """Return the per-user location of the genre index (under XDG_CACHE_HOME)"""
+    cache_home = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(cache_home) / 'mixdiscer' / 'genre_index.json'
+
+
+def _scan_yaml_files(directory: str) -> Iterator[os.DirEntry]:
+    """
+    Recursively yield the .yaml files under a directory, skipping hidden
+    directories (e.g. .git) and __pycache__.
+
+    Args:
+        directory: Directory to scan
+
+    Returns:
+        Iterator over the directory entries of the YAML files
+    """
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if not entry.name.startswith('.') and entry.name != '__pycache__':
+                    yield from _scan_yaml_files(entry.path)
+            elif entry.name.endswith('.yaml') and entry.is_file():
+                yield entry
+
+
+def _load_genre_index(index_path: Path) -> dict:
+    """
+    Load the genre index, mapping each playlist file path to the
+    [mtime_ns, size, genre] it had when last read.
+
+    Args:
+        index_path: Path to the index file
+
+    Returns:
+        The file entries of the index, empty if it is missing or unreadable
+    """
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if index.get('version') != GENRE_INDEX_VERSION:
+        return {}
+    return index.get('files', {})
+
+
+def _save_genre_index(index_path: Path, files: dict) -> None:
+    """Atomically write the genre index, ignoring failures (it is only a cache)"""
+    try:
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = index_path.with_name(index_path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': GENRE_INDEX_VERSION, 'files': files}, f)
+        os.replace(tmp_path, index_path)
+    except OSError:
+        pass
+
+
+def _read_genre(yaml_file: str) -> Optional[str]:
+    """
+    Read the normalized genre from a playlist file. Simple "genre: value"
+    lines are matched directly; anything else falls back to a full YAML parse.
+    The rest of a file with a matching line is not parsed, so its genre is
+    counted even if the file is not valid YAML; playlist validation reports
+    those files, and the genre list is only used for suggestions.
+
+    Args:
+        yaml_file: Path to the playlist file
+
+    Returns:
+        The lowercased genre, or None if the file has no genre
+    """
+    with open(yaml_file, 'rb') as f:
+        data = f.read()
+
+    match = _GENRE_LINE_PATTERN.search(data)
+    if match:
+        genre = match.group(1).decode('ascii').lower()
+        if genre not in _YAML_NON_STRING_WORDS:
+            return genre
+
+    parsed = yaml.load(data, Loader=_Loader)
+    if parsed and 'genre' in parsed:
+        return parsed['genre'].strip().lower()
+    return None
+
+
+def get_genres_from_playlists(
+    mixdiscs_dir: Path,
+    index_path: Optional[Path] = None
+) -> dict[str, int]:
     """
     Extract genres from existing playlist files with usage counts.
     
     Args:
         mixdiscs_dir: Path to mixdiscs directory
+        index_path: Optional genre index file. Files whose modification time
+                    and size match the index are not re-read.
     
     Returns:
         Dictionary of {genre: count} for all genres found in playlists
     """
     genre_counts = Counter()
+    root = os.path.abspath(mixdiscs_dir)
+    previous = _load_genre_index(index_path) if index_path else {}
+    current = {}
     
     # Scan all YAML files in mixdiscs directory
-    for yaml_file in mixdiscs_dir.rglob("*.yaml"):
+    for entry in _scan_yaml_files(root):
         try:
-            with open(yaml_file, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
-                if data and 'genre' in data:
-                    genre = data['genre'].strip().lower()
-                    if genre:
-                        genre_counts[genre] += 1
+            stat = entry.stat()
+            cached = previous.get(entry.path)
+            if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                genre = cached[2]
+            else:
+                genre = _read_genre(entry.path)
+            current[entry.path] = [stat.st_mtime_ns, stat.st_size, genre]
+            if genre:
+                genre_counts[genre] += 1
         except Exception:
             # Skip files that can't be parsed
             continue
     
+    if index_path:
+        root_prefix = root + os.sep
+        indexed = {path: value for path, value in previous.items() if path.startswith(root_prefix)}
+        if current != indexed:
+            # Keep the entries of any other playlist directories sharing the index
+            others = {path: value for path, value in previous.items() if path not in indexed}
+            _save_genre_index(index_path, {**others, **current})
+    
     return dict(genre_counts)
 
 
 def get_suggested_genres(
     config: dict,
-    mixdiscs_dir: Optional[Path] = None
+    mixdiscs_dir: Optional[Path] = None,
+    index_path: Optional[Path] = None
 ) -> tuple[list[str], dict[str, str]]:
     """
     Get suggested genres from config and existing playlists.
@@ -52,6 +178,7 @@ def get_suggested_genres(
     Args:
         config: Configuration dictionary
         mixdiscs_dir: Optional path to scan for existing genres
+        index_path: Optional genre index file used to skip unchanged playlists
     
     Returns:
         Tuple of (sorted genre list, genre metadata dict)
@@ -61,7 +188,7 @@ def get_suggested_genres(
     # Get genres from existing playlists with counts
     playlist_genres = {}
     if mixdiscs_dir and mixdiscs_dir.exists():
-        playlist_genres = get_genres_from_playlists(mixdiscs_dir)
+        playlist_genres = get_genres_from_playlists(mixdiscs_dir, index_path)
     
     # Get genres from config
     config_genres = set(
@@ -1,9 +1,21 @@
 """Validation functions for CLI inputs"""
 
 import re
+import string
 from pathlib import Path
 from typing import Optional
 
+# NAME_MAX on most filesystems, which counts bytes, less room for the
+# ".yaml" extension. Stems are limited to this many UTF-8 encoded bytes.
+MAX_FILENAME_STEM_LENGTH = 255 - len(".yaml")
+
+_ALNUM_CHARS = frozenset(string.ascii_letters + string.digits)
+_USERNAME_CHARS = _ALNUM_CHARS | frozenset("_-")
+_SPOTIFY_URL_RE = re.compile(r"https?://open\.spotify\.com/playlist/[a-zA-Z0-9]+")
+_SPOTIFY_URI_RE = re.compile(r"spotify:playlist:[a-zA-Z0-9]+")
+_FILENAME_TRANSLATION = str.maketrans(dict.fromkeys('/\\:*?"<>|', '-'))
+_FILENAME_RUN_RE = re.compile(r'\s+|-{2,}')
+
 
 def validate_username(username: str) -> tuple[bool, Optional[str]]:
     """
@@ -26,7 +38,7 @@ def validate_username(username: str) -> tuple[bool, Optional[str]]:
     if len(username) > 30:
         return False, "Username must be at most 30 characters"
     
-    if not re.match(r"^[a-zA-Z0-9][a-zA-Z0-9_-]*$", username):
+    if username[0] not in _ALNUM_CHARS or not _USERNAME_CHARS.issuperset(username):
         return (
             False,
             "Username must start with a letter or number and contain only "
@@ -72,10 +84,9 @@ def validate_title_uniqueness(
     # Sanitize title to match how it will be saved
     safe_filename = sanitize_filename(title)
     
-    # Check for existing files with same title
-    for yaml_file in user_dir.glob("*.yaml"):
-        if yaml_file.stem == safe_filename:
-            return False, f"You already have a playlist titled '{title}'"
+    # Check for an existing file with the same title
+    if (user_dir / f"{safe_filename}.yaml").exists():
+        return False, f"You already have a playlist titled '{title}'"
     
     return True, None
 
@@ -97,10 +108,7 @@ def validate_spotify_url(url: str) -> tuple[bool, Optional[str]]:
     url = url.strip()
     
     # Check for Spotify URL patterns
-    url_pattern = r"https?://open\.spotify\.com/playlist/[a-zA-Z0-9]+"
-    uri_pattern = r"spotify:playlist:[a-zA-Z0-9]+"
-    
-    if re.match(url_pattern, url) or re.match(uri_pattern, url):
+    if _SPOTIFY_URL_RE.match(url) or _SPOTIFY_URI_RE.match(url):
         return True, None
     
     return (
@@ -117,22 +125,33 @@ def sanitize_filename(filename: str) -> str:
     - Removes leading/trailing whitespace
     - Replaces problematic characters with safe alternatives
     - Preserves readable format
+    - Truncates to MAX_FILENAME_STEM_LENGTH bytes when UTF-8 encoded
     """
     # Strip whitespace
     filename = filename.strip()
     
     # Replace problem characters but keep spaces and common punctuation
     # Remove: / \ : * ? " < > |
-    for char in ['/', '\\', ':', '*', '?', '"', '<', '>', '|']:
-        filename = filename.replace(char, '-')
+    filename = filename.translate(_FILENAME_TRANSLATION)
     
     # Replace multiple spaces/dashes with single
-    filename = re.sub(r'\s+', ' ', filename)
-    filename = re.sub(r'-+', '-', filename)
+    filename = _FILENAME_RUN_RE.sub(_collapse_run, filename)
+    
+    encoded = filename.encode('utf-8')
+    if len(encoded) > MAX_FILENAME_STEM_LENGTH:
+        # Cut on the byte limit, dropping any character split by the cut
+        filename = encoded[:MAX_FILENAME_STEM_LENGTH].decode('utf-8', errors='ignore')
+        # Don't leave a space or dash dangling where the name was cut
+        filename = filename.rstrip(' -')
     
     return filename
 
 
+def _collapse_run(match: re.Match) -> str:
+    """Replace a run of whitespace with a space and a run of dashes with a dash"""
+    return '-' if match.group()[0] == '-' else ' '
+
+
 def validate_description(description: str) -> tuple[bool, Optional[str]]:
     """
     Validate playlist description.
@@ -173,7 +192,7 @@ def validate_genre(genre: str) -> tuple[bool, Optional[str]]:
     if len(genre) > 50:
         return False, "Genre must be at most 50 characters"
     
-    if not re.match(r"^[a-zA-Z0-9\s-]+$", genre):
+    if not all(c in _ALNUM_CHARS or c == '-' or c.isspace() for c in genre):
         return (
             False,
             "Genre must contain only letters, numbers, spaces, and hyphens"
@@ -3,6 +3,11 @@ from pathlib import Path
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
 LOG = logging.getLogger(__name__)
 
 MIXDISC_DIRECTORY_CONFIG = "mixdisc_directory"
@@ -22,6 +27,6 @@ def load_config(filepath: str):
         raise FileNotFoundError(f"Config file {config_path} does not exist")
 
     with open(config_path, 'r', encoding="utf8") as config_file:
-        config_data = yaml.load(config_file, Loader=yaml.FullLoader)
+        config_data = yaml.load(config_file, Loader=_Loader)
 
     return config_data
\ No newline at end of file
@@ -21,7 +21,7 @@ from mixdiscer.cli.prompts import (
 )
 from mixdiscer.cli.generators import generate_yaml
 from mixdiscer.cli.validators import sanitize_filename
-from mixdiscer.cli.genre_utils import get_suggested_genres
+from mixdiscer.cli.genre_utils import get_suggested_genres, default_genre_index_path
 
 
 def find_mixdiscs_directory() -> Path:
@@ -116,7 +116,9 @@ def main():
             pass
         
         # Get genre suggestions (sorted by usage)
-        suggested_genres, genre_metadata = get_suggested_genres(config, mixdiscs_dir)
+        suggested_genres, genre_metadata = get_suggested_genres(
+            config, mixdiscs_dir, default_genre_index_path()
+        )
         
         # Prompt for username
         username, is_new_user = prompt_username(mixdiscs_dir)
@@ -1,5 +1,8 @@
+import atexit
+import functools
 import logging
 
+from contextlib import nullcontext
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
@@ -23,21 +26,26 @@ from mixdiscer.music_service import (
     ProcessedPlaylist,
     ValidationWarning,
 )
+from mixdiscer.music_service.music_service import calculate_total_duration
 from mixdiscer.music_service.spotify import SpotifyMusicService
 from mixdiscer.output.render import render_output
 from mixdiscer.validation import ValidationResult
 from mixdiscer.cache import (
+    PlaylistCacheSession,
     get_cache_key,
+    compute_playlist_hashes,
     load_cache,
     save_cache,
     is_cache_valid,
     get_cached_music_service_playlist,
+    get_entry_music_service_playlist,
     update_cache_entry,
     cleanup_stale_cache_entries,
 )
 from mixdiscer.track_cache import (
     load_track_cache,
     save_track_cache,
+    TrackCacheSession,
 )
 
 LOG = logging.getLogger(__name__)
@@ -55,15 +63,7 @@ class RemotePlaylistCheckResult:
 
 def calculate_duration(tracks: list[Optional[Track]]) -> timedelta:
 
-    total_duration = timedelta()
-
-    for track in tracks:
-        if track is None:
-            continue
-
-        total_duration += track.duration
-
-    return total_duration
+    return calculate_total_duration(tracks)
 
 
 def _build_frozen_warning(cache_entry: dict, service_name: str) -> ValidationWarning:
@@ -140,11 +140,7 @@ def check_remote_playlist_update(
         if cache_entry.get('remote_validation_status') == 'frozen':
             warning = _build_frozen_warning(cache_entry, music_service.name)
         
-        cached_playlist = get_cached_music_service_playlist(
-            get_cache_key(playlist),
-            music_service.name,
-            {'playlists': {get_cache_key(playlist): cache_entry}}
-        )
+        cached_playlist = get_entry_music_service_playlist(cache_entry, music_service.name)
         
         return RemotePlaylistCheckResult(
             music_service_playlist=cached_playlist,
@@ -186,11 +182,7 @@ def check_remote_playlist_update(
         )
         
         # Get cached version for comparison
-        cached_playlist = get_cached_music_service_playlist(
-            get_cache_key(playlist),
-            music_service.name,
-            {'playlists': {get_cache_key(playlist): cache_entry}}
-        )
+        cached_playlist = get_entry_music_service_playlist(cache_entry, music_service.name)
         cached_track_count = len([t for t in cached_playlist.tracks if t is not None])
         cached_at = datetime.fromisoformat(
             cache_entry['music_services'][music_service.name]['cached_at']
@@ -277,17 +269,22 @@ def _load_rendering_config(config_path: str) -> tuple[str, Path, Path, timedelta
     return mixdisc_directory, template_dir, output_dir, duration_threshold, cache_path, track_cache_path
 
 
+@functools.lru_cache(maxsize=None)
 def _get_music_service() -> MusicService:
     """
     Initialize and return the music service to use.
     
     Currently returns Spotify, but could be extended to support
-    multiple services based on configuration.
+    multiple services based on configuration. The service is created
+    once per process and shared by later calls, and closed when the
+    process exits.
     
     Returns:
         MusicService instance
     """
-    return SpotifyMusicService()
+    music_service = SpotifyMusicService()
+    atexit.register(music_service.close)
+    return music_service
 
 
 def _process_single_playlist(
@@ -361,7 +358,10 @@ def validate_playlist(
     duration_threshold: timedelta,
     cache_path: Optional[Path] = None,
     track_cache_path: Optional[Path] = None,
-    skip_music_service_if_cached: bool = False
+    skip_music_service_if_cached: bool = False,
+    track_cache: Optional[TrackCacheSession] = None,
+    content_hash: Optional[str] = None,
+    playlist_cache: Optional[PlaylistCacheSession] = None
 ) -> ValidationResult:
     """ 
     Validate a single playlist and optionally update cache.
@@ -374,22 +374,37 @@ def validate_playlist(
         cache_path: Path to playlist cache file (for updates)
         track_cache_path: Path to track cache file (for incremental updates)
         skip_music_service_if_cached: If True, use cached data if unchanged
+        track_cache: Open track cache session shared across several playlists.
+                     Takes precedence over track_cache_path and is saved by
+                     the caller rather than after this playlist.
+        content_hash: Precomputed content hash of the playlist file
+        playlist_cache: Open playlist cache session shared across several
+                        playlists. Takes precedence over cache_path and is
+                        saved by the caller rather than after this playlist.
     """
 
     try:
         # Load track cache if available
-        track_cache_data = load_track_cache(track_cache_path) if track_cache_path else None
+        if track_cache is not None:
+            track_cache_data = track_cache.cache_data
+        else:
+            track_cache_data = load_track_cache(track_cache_path) if track_cache_path else None
+        
+        # Load the playlist cache once for both the lookup and the update
+        if playlist_cache is not None:
+            cache_data = playlist_cache.cache_data
+        else:
+            cache_data = load_cache(cache_path) if cache_path else None
+        cache_key = get_cache_key(playlist)
         
         # Check if we can use cache to skip music service calls
         music_service_playlist = None
         used_cache = False
         
-        if skip_music_service_if_cached and cache_path:
-            cache_data = load_cache(cache_path)
-            cache_key = get_cache_key(playlist)
+        if skip_music_service_if_cached and cache_data is not None:
             cache_entry = cache_data['playlists'].get(cache_key)
             
-            if cache_entry and is_cache_valid(playlist, cache_entry):
+            if cache_entry and is_cache_valid(playlist, cache_entry, content_hash):
                 # Playlist unchanged - use cached data
                 cached_playlist = get_cached_music_service_playlist(
                     cache_key,
@@ -414,6 +429,8 @@ def validate_playlist(
                     playlist,
                     track_cache_data
                 )
+                if track_cache is not None:
+                    track_cache.mark_dirty()
             else:
                 # Use standard processing
                 music_service_playlist = music_service.process_user_playlist(playlist)
@@ -428,10 +445,8 @@ def validate_playlist(
 
         is_valid = music_service_playlist.total_duration <= duration_threshold
 
-        # Update playlist cache if cache_path provided and validation passed
-        if cache_path and is_valid and not used_cache:
-            cache_data = load_cache(cache_path)
-            cache_key = get_cache_key(playlist)
+        # Update playlist cache if a cache was provided and validation passed
+        if cache_data is not None and is_valid and not used_cache:
             # Get snapshot for remote playlists
             snapshot_id = None
             if playlist.remote_playlist:
@@ -439,12 +454,18 @@ def validate_playlist(
                     snapshot_id = music_service.get_playlist_snapshot(playlist.remote_playlist)
                 except Exception as e:
                     LOG.warning("Failed to get snapshot for %s: %s", playlist.title, e)
-            update_cache_entry(cache_key, playlist, music_service_playlist, cache_data, snapshot_id)
-            save_cache(cache_data, cache_path)
+            update_cache_entry(
+                cache_key, playlist, music_service_playlist, cache_data, snapshot_id,
+                content_hash
+            )
+            if playlist_cache is not None:
+                playlist_cache.mark_dirty()
+            else:
+                save_cache(cache_data, cache_path)
             LOG.debug("Updated playlist cache for %s", playlist.title)
         
-        # Save track cache if it was used
-        if track_cache_data and track_cache_path:
+        # Save track cache if it was used (a shared session is saved by its owner)
+        if track_cache is None and track_cache_data and track_cache_path:
             save_track_cache(track_cache_data, track_cache_path)
             LOG.debug("Saved track cache")
 
@@ -800,21 +821,18 @@ def validate_playlists_from_files(
 
     # Load all existing playlists for uniqueness checking, EXCLUDING files being validated
     # (to avoid detecting a file as duplicate of itself)
-    existing_playlists = []
-    for playlist in get_playlists(mixdisc_directory):
-        # Only include if this playlist file is NOT being validated
-        if playlist.filepath not in playlist_files:
-            existing_playlists.append(playlist)
+    validated_paths = set(playlist_files)
+    existing_playlists = [
+        playlist for playlist in get_playlists(mixdisc_directory)
+        if playlist.filepath not in validated_paths
+    ]
     LOG.debug("Loaded %d existing playlists for uniqueness checking (excluding files being validated)", len(existing_playlists))
 
-    # Create a mapping of successfully loaded playlists
-    loaded_playlists = {}
-    for playlist in get_playlists_from_paths(playlist_files, Path(mixdisc_directory)):
-        # Find the matching file path by checking which file hasn't been processed yet
-        for path in playlist_files:
-            if path not in loaded_playlists:
-                loaded_playlists[path] = playlist
-                break
+    # Map each successfully loaded playlist to the file it was loaded from
+    loaded_playlists = {
+        playlist.filepath: playlist
+        for playlist in get_playlists_from_paths(playlist_files, Path(mixdisc_directory))
+    }
 
     # Check for duplicates between new playlists and existing ones
     all_playlists = existing_playlists + list(loaded_playlists.values())
@@ -824,66 +842,77 @@ def validate_playlists_from_files(
     duplicate_map = {}
     for original, duplicate in duplicate_pairs:
         # Only flag if the duplicate is one of the files being validated
-        if duplicate.filepath in playlist_files:
+        if duplicate.filepath in validated_paths:
             duplicate_map[duplicate.filepath] = original.filepath
 
-    # Process each file
-    for playlist_path in playlist_files:
-        if playlist_path not in loaded_playlists:
-            # File failed to load
-            LOG.error("Failed to load playlist: %s", playlist_path)
-            results.append(ValidationResult(
-                filepath=playlist_path,
-                user="Unknown",
-                title="Unknown",
-                is_valid=False,
-                total_duration=timedelta(),
-                duration_threshold=playlist_duration_threshold,
-                missing_tracks=[],
-                error_message="Failed to load playlist file"
-            ))
-            continue
-
-        playlist = loaded_playlists[playlist_path]
+    # Process each file, sharing one load/save of each cache across all of them
+    track_session = TrackCacheSession(track_cache_path) if update_cache else nullcontext()
+    playlist_session = PlaylistCacheSession(cache_path) if update_cache else nullcontext()
+    with track_session as track_cache, playlist_session as playlist_cache:
+        # Hash every file up front; each hash serves both the cache check and the cache update
+        file_digests = {}
+        if playlist_cache is not None:
+            file_digests = compute_playlist_hashes([
+                path for path in loaded_playlists if path not in duplicate_map
+            ])
+
+        for playlist_path in playlist_files:
+            if playlist_path not in loaded_playlists:
+                # File failed to load
+                LOG.error("Failed to load playlist: %s", playlist_path)
+                results.append(ValidationResult(
+                    filepath=playlist_path,
+                    user="Unknown",
+                    title="Unknown",
+                    is_valid=False,
+                    total_duration=timedelta(),
+                    duration_threshold=playlist_duration_threshold,
+                    missing_tracks=[],
+                    error_message="Failed to load playlist file"
+                ))
+                continue
+
+            playlist = loaded_playlists[playlist_path]
         
-        # Check if this is a duplicate
-        if playlist_path in duplicate_map:
-            LOG.error("✗ Playlist %s is a duplicate of %s", playlist.title, duplicate_map[playlist_path])
-            results.append(ValidationResult(
-                filepath=playlist_path,
-                user=playlist.user,
-                title=playlist.title,
-                is_valid=False,
-                total_duration=timedelta(),
-                duration_threshold=playlist_duration_threshold,
-                missing_tracks=[],
-                duplicate_of=duplicate_map[playlist_path]
-            ))
-            continue
-
-        LOG.info("Validating playlist: %s", playlist_path)
-        result = validate_playlist(
-            playlist_path,
-            playlist,
-            music_service,
-            playlist_duration_threshold,
-            cache_path=cache_path if update_cache else None,
-            track_cache_path=track_cache_path if update_cache else None,
-            skip_music_service_if_cached=update_cache  # Use cache during validation if updating cache
-        )
-        results.append(result)
+            # Check if this is a duplicate
+            if playlist_path in duplicate_map:
+                LOG.error("✗ Playlist %s is a duplicate of %s", playlist.title, duplicate_map[playlist_path])
+                results.append(ValidationResult(
+                    filepath=playlist_path,
+                    user=playlist.user,
+                    title=playlist.title,
+                    is_valid=False,
+                    total_duration=timedelta(),
+                    duration_threshold=playlist_duration_threshold,
+                    missing_tracks=[],
+                    duplicate_of=duplicate_map[playlist_path]
+                ))
+                continue
+
+            LOG.info("Validating playlist: %s", playlist_path)
+            result = validate_playlist(
+                playlist_path,
+                playlist,
+                music_service,
+                playlist_duration_threshold,
+                skip_music_service_if_cached=update_cache,  # Use cache during validation if updating cache
+                track_cache=track_cache,
+                content_hash=file_digests.get(playlist_path),
+                playlist_cache=playlist_cache
+            )
+            results.append(result)
 
-        if result.is_valid:
-            LOG.info("✓ Playlist %s is valid (duration: %s)", playlist.title, result.total_duration)
-        else:
-            if result.error_message:
-                LOG.error("✗ Playlist %s failed: %s", playlist.title, result.error_message)
+            if result.is_valid:
+                LOG.info("✓ Playlist %s is valid (duration: %s)", playlist.title, result.total_duration)
             else:
-                LOG.error(
-                    "✗ Playlist %s exceeds duration limit by %s",
-                    playlist.title,
-                    result.duration_difference
-                )
+                if result.error_message:
+                    LOG.error("✗ Playlist %s failed: %s", playlist.title, result.error_message)
+                else:
+                    LOG.error(
+                        "✗ Playlist %s exceeds duration limit by %s",
+                        playlist.title,
+                        result.duration_difference
+                    )
 
     valid_count = sum(1 for r in results if r.is_valid)
     LOG.info(
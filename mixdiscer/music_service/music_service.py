@@ -29,7 +29,7 @@ class MusicServiceError(Exception):
         super().__init__(f"[{service_name}] {message}")
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Track:
     """ Dataclass representing a Track and its metadata """
     artist: str
@@ -39,7 +39,7 @@ class Track:
     link: Optional[str]
 
 
-@dataclass
+@dataclass(slots=True)
 class MusicServicePlaylist:
     """ Dataclass representing a processed playlist from a music service """
     service_name: str
@@ -57,7 +57,7 @@ class ValidationWarning:
     frozen_version_date: Optional[datetime] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessedPlaylist:
     """ Dataclass representing a processed playlist with its total duration """
     user_playlist: Playlist
@@ -65,17 +65,19 @@ class ProcessedPlaylist:
     validation_warning: Optional[ValidationWarning] = None
 
 
-def calculate_total_duration(tracks: Sequence[Optional[Track]]) -> timedelta:
-    """ Calculate the total duration of a list of tracks """
-    total_duration = timedelta()
+_MICROSECOND = timedelta(microseconds=1)
 
-    for track in tracks:
-        if track is None:
-            continue
 
-        total_duration += track.duration
+def calculate_total_duration(tracks: Sequence[Optional[Track]]) -> timedelta:
+    """ Calculate the total duration of a list of tracks
 
-    return total_duration
+    Durations are summed as whole microseconds so that only a single
+    timedelta is built for the total. None entries (tracks that were not
+    found) are skipped.
+    """
+    return timedelta(microseconds=sum(
+        track.duration // _MICROSECOND for track in tracks if track is not None
+    ))
 
 
 class MusicService(ABC):
@@ -119,3 +121,7 @@ class MusicService(ABC):
             A MusicServicePlaylist object containing the tracks and
             other metadata for the playlist.
         """
+
+    def close(self) -> None:
+        """ Release any resources held by the music service, such as open
+        HTTP sessions. The default implementation holds none and does nothing. """
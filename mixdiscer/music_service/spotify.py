@@ -1,6 +1,9 @@
 import logging
 import re
+import threading
+import time
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import timedelta
 from typing import Optional
@@ -17,8 +20,22 @@ from mixdiscer.music_service.music_service import (
 
 LOG = logging.getLogger(__name__)
 
+# How long a fetched playlist snapshot_id is reused before asking Spotify again
+SNAPSHOT_CACHE_TTL_SECONDS = 300
 
-@dataclass
+# Maximum number of track searches in flight at once for a single playlist
+TRACK_LOOKUP_WORKERS = 4
+
+# How many times a rate-limited (HTTP 429) search is retried after spotipy's
+# own retries are exhausted, and the wait used when Spotify sends no Retry-After
+RATE_LIMIT_RETRIES = 3
+RATE_LIMIT_DEFAULT_WAIT_SECONDS = 1
+
+# Longest Retry-After wait honoured; a search asked to wait longer fails instead
+MAX_RATE_LIMIT_WAIT_SECONDS = 30
+
+
+@dataclass(frozen=True, slots=True)
 class SpotifyTrack(Track):
     """ Dataclass representing a Spotify Track and its metadata """
     uri: str
@@ -33,6 +50,21 @@ class SpotifyMusicService(MusicService):
         # (tokens are short-lived and we fetch a new one each session)
         self.auth_manager = SpotifyClientCredentials(cache_handler=None)
         self.spotify = spotipy.Spotify(auth_manager=self.auth_manager)
+        # playlist_id -> (expiry time on the monotonic clock, snapshot_id)
+        self._snapshot_cache: dict[str, tuple[float, str]] = {}
+        # (artist, title, album) -> track found by find_track, shared by every
+        # playlist processed in this session. Misses are not remembered, so a
+        # transient miss is searched for again by the next playlist.
+        self._track_lookups: dict[tuple[str, str, Optional[str]], SpotifyTrack] = {}
+        # Track lookup worker threads each hold their own client, and so their
+        # own HTTP session, as spotipy clients are not documented as thread-safe.
+        # The pool and its clients are created on first use and kept until close().
+        # _lookup_lock is held while the pool is in use or being replaced.
+        self._thread_clients = threading.local()
+        self._worker_clients: list[spotipy.Spotify] = []
+        self._worker_clients_lock = threading.Lock()
+        self._lookup_executor: Optional[ThreadPoolExecutor] = None
+        self._lookup_lock = threading.Lock()
 
     @property
     def name(self) -> str:
@@ -55,7 +87,7 @@ class SpotifyMusicService(MusicService):
         if album:
             LOG.debug("Searching Spotify for %s - %s (album: %s)", artist, track, album)
             query = f'artist:{artist} track:{track} album:{album}'
-            results = self.spotify.search(q=query, type='track')
+            results = self._client().search(q=query, type='track')
             
             if results and results['tracks']['total'] > 0:
                 first_track = results['tracks']['items'][0]
@@ -79,7 +111,7 @@ class SpotifyMusicService(MusicService):
         # No album specified or album not found - use default search
         LOG.debug("Searching Spotify for %s - %s (default)", artist, track)
         query = f'artist:{artist} track:{track}'
-        results = self.spotify.search(q=query, type='track')
+        results = self._client().search(q=query, type='track')
 
         if not results or results['tracks']['total'] == 0:
             LOG.warning("No tracks found for %s - %s", artist, track)
@@ -130,10 +162,133 @@ class SpotifyMusicService(MusicService):
         
         raise ValueError(f"Invalid Spotify playlist URL or URI: {url}")
 
+    def clear_snapshot_cache(self) -> None:
+        """ Forget all remembered playlist snapshot IDs """
+        self._snapshot_cache.clear()
+
+    def clear_track_lookups(self) -> None:
+        """ Forget all remembered track search results """
+        self._track_lookups.clear()
+
+    def close(self) -> None:
+        """ Shut down the track lookup worker pool and close its clients' HTTP sessions
+
+        Waits for any track lookups in progress. The service can still be
+        used afterwards; a new pool is started when needed.
+        """
+        with self._lookup_lock:
+            executor, self._lookup_executor = self._lookup_executor, None
+            if executor is not None:
+                executor.shutdown(wait=True)
+            with self._worker_clients_lock:
+                clients, self._worker_clients = self._worker_clients, []
+        for client in clients:
+            session = getattr(client, '_session', None)
+            if session is not None:
+                session.close()
+
+    def _new_client(self) -> spotipy.Spotify:
+        """ Create a Spotify client with its own HTTP session, sharing this service's credentials """
+        return spotipy.Spotify(auth_manager=self.auth_manager)
+
+    def _init_lookup_worker(self) -> None:
+        """ Give a track lookup worker thread its own Spotify client """
+        client = self._new_client()
+        self._thread_clients.client = client
+        with self._worker_clients_lock:
+            self._worker_clients.append(client)
+
+    def _executor(self) -> ThreadPoolExecutor:
+        """ Return the track lookup worker pool, starting it on first use.
+        The caller must hold _lookup_lock. """
+        if self._lookup_executor is None:
+            self._lookup_executor = ThreadPoolExecutor(
+                max_workers=TRACK_LOOKUP_WORKERS,
+                thread_name_prefix='spotify-lookup',
+                initializer=self._init_lookup_worker
+            )
+        return self._lookup_executor
+
+    def _client(self) -> spotipy.Spotify:
+        """ Return the calling thread's Spotify client """
+        return getattr(self._thread_clients, 'client', None) or self.spotify
+
+    def _find_track_or_raise(self, entry: tuple[str, str, Optional[str]]) -> Optional[SpotifyTrack]:
+        """
+        Find a playlist entry's track, wrapping any failure in a MusicServiceError.
+        
+        Searches that are still rate limited after spotipy's own retries are
+        retried up to RATE_LIMIT_RETRIES times, waiting as long as Spotify's
+        Retry-After header asks. A search asked to wait longer than
+        MAX_RATE_LIMIT_WAIT_SECONDS fails straight away.
+        """
+        artist, track, album = entry
+        try:
+            for attempt in range(1, RATE_LIMIT_RETRIES + 1):
+                try:
+                    return self.find_track(artist, track, album)
+                except spotipy.SpotifyException as e:
+                    if e.http_status != 429:
+                        raise
+                    wait = float(e.headers.get('Retry-After', RATE_LIMIT_DEFAULT_WAIT_SECONDS))
+                    if wait > MAX_RATE_LIMIT_WAIT_SECONDS:
+                        raise
+                    LOG.warning(
+                        "Rate limited searching for %s - %s, retrying in %.0fs (attempt %d of %d)",
+                        artist, track, wait, attempt, RATE_LIMIT_RETRIES
+                    )
+                    time.sleep(wait)
+            return self.find_track(artist, track, album)
+        except Exception as e:
+            msg = f"Error finding track {artist} - {track}: {e}"
+            LOG.error(msg)
+            raise MusicServiceError(
+                message=msg,
+                service_name=self.name,
+                original_exception=e
+            ) from e
+
+    def _lookup_tracks(self, entries: list[tuple[str, str, Optional[str]]]) -> list[Optional[SpotifyTrack]]:
+        """
+        Find the tracks for a list of playlist entries, in order.
+        
+        Entries not already found are searched for concurrently on the
+        service's thread pool, as each search is a blocking HTTP request. Each
+        worker uses its own Spotify client. Each distinct entry is searched for at most once
+        per call, and found tracks are remembered for later calls.
+        
+        Args:
+            entries: (artist, title, album) tuples
+            
+        Returns:
+            SpotifyTrack, or None if not found, for each entry
+            
+        Raises:
+            MusicServiceError: If a search fails
+        """
+        pending = list(dict.fromkeys(entry for entry in entries if entry not in self._track_lookups))
+        if pending:
+            # Fetch (or reuse) the access token before the workers share it
+            self.auth_manager.get_access_token(as_dict=False)
+            with self._lookup_lock:
+                found = list(self._executor().map(self._find_track_or_raise, pending))
+            self._track_lookups.update(
+                (entry, track) for entry, track in zip(pending, found) if track is not None
+            )
+        return [self._track_lookups.get(entry) for entry in entries]
+
+    def _remember_snapshot(self, playlist_id: str, snapshot_id: str) -> None:
+        """ Remember a playlist's snapshot_id for SNAPSHOT_CACHE_TTL_SECONDS """
+        self._snapshot_cache[playlist_id] = (time.monotonic() + SNAPSHOT_CACHE_TTL_SECONDS, snapshot_id)
+
     def get_playlist_snapshot(self, playlist_url: str) -> str:
         """
         Get current snapshot_id for a playlist (lightweight metadata-only call).
         
+        Snapshot IDs seen within the last SNAPSHOT_CACHE_TTL_SECONDS, either
+        from this method or from fetch_remote_playlist, are returned without
+        calling Spotify.
+        
         Args:
             playlist_url: Spotify playlist URL or URI
             
@@ -145,7 +300,11 @@ class SpotifyMusicService(MusicService):
         """
         try:
             playlist_id = self.extract_playlist_id(playlist_url)
+            cached = self._snapshot_cache.get(playlist_id)
+            if cached is not None and time.monotonic() < cached[0]:
+                return cached[1]
             result = self.spotify.playlist(playlist_id, fields="snapshot_id")
+            self._remember_snapshot(playlist_id, result['snapshot_id'])
             return result['snapshot_id']
         except Exception as e:
             raise MusicServiceError(
@@ -221,6 +380,7 @@ class SpotifyMusicService(MusicService):
             
             LOG.info("Fetched %d tracks from remote playlist (total duration: %s)", 
                      len(tracks), total_duration)
+            self._remember_snapshot(playlist_id, playlist_meta['snapshot_id'])
             
             return MusicServicePlaylist(
                 service_name=self.name,
@@ -243,30 +403,12 @@ class SpotifyMusicService(MusicService):
             LOG.info("Processing remote playlist: %s", playlist.title)
             return self.fetch_remote_playlist(playlist.remote_playlist)
 
-        tracks = []
-        total_duration = timedelta()
-
-        for artist, track, album in playlist.tracks:
-            spotify_track = None
-            try:
-                spotify_track = self.find_track(artist, track, album)
-                tracks.append(spotify_track)
-            except Exception as e:
-                msg = f"Error finding track {artist} - {track}: {e}"
-                LOG.error(msg)
-                raise MusicServiceError(
-                    message=msg,
-                    service_name=self.name,
-                    original_exception=e
-                ) from e
-
-            if spotify_track is not None:
-                total_duration += spotify_track.duration
+        tracks = self._lookup_tracks([tuple(entry) for entry in playlist.tracks])
 
         return MusicServicePlaylist(
             service_name=self.name,
             tracks=tracks,
-            total_duration=total_duration
+            total_duration=calculate_total_duration(tracks)
         )
 
     def process_user_playlist_incremental(
@@ -297,7 +439,6 @@ class SpotifyMusicService(MusicService):
         )
         
         tracks = []
-        total_duration = timedelta()
         api_calls = 0
         cache_hits = 0
         fallbacks = 0
@@ -316,8 +457,6 @@ class SpotifyMusicService(MusicService):
                 # Cache hit - use it
                 tracks.append(cached_track)
                 cache_hits += 1
-                if cached_track is not None:
-                    total_duration += cached_track.duration
                 LOG.debug("Track cache hit: %s - %s%s",
                          artist, track_title,
                          f" | {album}" if album else "")
@@ -352,9 +491,6 @@ class SpotifyMusicService(MusicService):
                         track_cache_data,
                         is_default=is_default
                     )
-                    
-                    if spotify_track is not None:
-                        total_duration += spotify_track.duration
                         
                 except Exception as e:
                     msg = f"Error finding track {artist} - {track_title}: {e}"
@@ -371,5 +507,5 @@ class SpotifyMusicService(MusicService):
         return MusicServicePlaylist(
             service_name=self.name,
             tracks=tracks,
-            total_duration=total_duration
+            total_duration=calculate_total_duration(tracks)
         )
@@ -1,12 +1,18 @@
+import functools
+import hashlib
+import json
 import logging
+import os
 import shutil
 
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 from collections import defaultdict
-from typing import Optional
+from itertools import repeat
+from typing import Iterator, Optional
 
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import BytecodeCache, Environment, FileSystemBytecodeCache, FileSystemLoader, Template
 
 from mixdiscer.music_service import ProcessedPlaylist
 
@@ -15,6 +21,12 @@ LOG = logging.getLogger(__name__)
 DEFAULT_TEMPLATE_DIR = Path("templates")
 PLAYLISTS_PER_PAGE = 20
 RECENT_PLAYLISTS_COUNT = 10
+LAYOUT_TEMPLATE = "_layout.html.j2"
+PLAYLIST_LIST_TEMPLATE = "_playlist_list.html.j2"
+BODY_PLACEHOLDER = "__BODY__"
+PARALLEL_RENDER_MIN_PAGES = 50
+WRITE_BUFFER_SIZE = 128 * 1024
+STATIC_FILES = ("style.css", "script.js")
 
 
 def duration_format(duration: timedelta) -> str:
@@ -25,6 +37,16 @@ def duration_format(duration: timedelta) -> str:
     return f"{minutes}:{seconds:02d}"
 
 
+def datetime_format(dt: Optional[datetime]) -> str:
+    """Format a datetime as e.g. 'January 05, 2025'"""
+    return dt.strftime('%B %d, %Y') if dt else 'Unknown'
+
+
+def datetime_short(dt: Optional[datetime]) -> str:
+    """Format a datetime as YYYY-MM-DD"""
+    return dt.strftime('%Y-%m-%d') if dt else 'Unknown'
+
+
 def get_file_modified_time(processed_playlist: ProcessedPlaylist) -> float:
     """Get the modification time of the playlist file"""
     if processed_playlist.user_playlist.filepath:
@@ -49,20 +71,18 @@ def create_pagination_info(current_page: int, total_pages: int, base_filename: s
     
     pages = list(range(start_page, end_page + 1))
     
+    # Only the pages in the window and either side of the current page are linked
+    linked_pages = set(pages)
+    linked_pages.update((current_page - 1, current_page + 1))
     page_links = {}
-    for page_num in range(1, total_pages + 1):
+    for page_num in linked_pages:
         if page_num == 1:
             page_links[page_num] = f"{base_filename}.html"
-        else:
+        elif 1 < page_num <= total_pages:
             page_links[page_num] = f"{base_filename}-page{page_num}.html"
     
-    prev_page = None
-    if current_page > 1:
-        prev_page = page_links[current_page - 1]
-    
-    next_page = None
-    if current_page < total_pages:
-        next_page = page_links[current_page + 1]
+    prev_page = page_links.get(current_page - 1)
+    next_page = page_links.get(current_page + 1)
     
     return {
         'current_page': current_page,
@@ -74,32 +94,259 @@ def create_pagination_info(current_page: int, total_pages: int, base_filename: s
     }
 
 
+class RenderManifest:
+    """
+    Content fingerprints of the pages written to an output directory.
+
+    Each page is fingerprinted from the template sources and the repr of its
+    template context (the playlist dataclasses include every rendered field),
+    so a page whose fingerprint matches the previous run can be left as is.
+    The manifest is kept in the user cache directory, not in the published
+    output directory.
+    """
+
+    def __init__(self, output_dir: Path, template_dir: Path):
+        self.path = render_manifest_path(output_dir)
+        self.previous = self._load()
+        self.current: dict[str, str] = {}
+        self.templates_fingerprint = self._fingerprint_templates(template_dir)
+
+    def _load(self) -> dict:
+        """Load the manifest from the previous render, if there is one"""
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            LOG.warning("Failed to load render manifest from %s: %s. Rendering all pages.", self.path, e)
+            return {}
+
+    @staticmethod
+    def _fingerprint_templates(template_dir: Path) -> str:
+        """Hash the sources of all templates so template edits re-render every page"""
+        digest = hashlib.blake2b(digest_size=16)
+        for template_file in sorted(template_dir.glob('*.j2')):
+            digest.update(template_file.name.encode('utf-8'))
+            digest.update(template_file.read_bytes())
+        return digest.hexdigest()
+
+    def is_current(self, output_file: Path, context: dict) -> bool:
+        """
+        Record the fingerprint for a page and check whether the existing file is up to date.
+
+        Args:
+            output_file: Path of the page to be written
+            context: Template context the page would be rendered with
+
+        Returns:
+            True if the page exists and was rendered from identical input
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(self.templates_fingerprint.encode('utf-8'))
+        digest.update(repr(sorted(context.items())).encode('utf-8'))
+        fingerprint = digest.hexdigest()
+
+        self.current[output_file.name] = fingerprint
+        return self.previous.get(output_file.name) == fingerprint and output_file.exists()
+
+    def save(self) -> None:
+        """Atomically replace the manifest with the fingerprints from this render"""
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.current, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            LOG.warning("Failed to save render manifest to %s: %s", self.path, e)
+
+
+def create_environment(template_dir: Path) -> Environment:
+    """Return the Jinja2 environment for a template directory, creating it on first use"""
+    return _create_environment(template_dir.resolve())
+
+
+def _user_cache_dir() -> Path:
+    """Return the per-user mixdiscer cache directory (under XDG_CACHE_HOME)"""
+    cache_home = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(cache_home) / 'mixdiscer'
+
+
+def default_bytecode_cache_dir() -> Path:
+    """Return the per-user location of the template bytecode cache (under XDG_CACHE_HOME)"""
+    return _user_cache_dir() / 'jinja2'
+
+
+def render_manifest_path(output_dir: Path) -> Path:
+    """Return the render manifest location for an output directory (under XDG_CACHE_HOME)"""
+    key = hashlib.blake2b(str(output_dir.resolve()).encode('utf-8'), digest_size=16).hexdigest()
+    return _user_cache_dir() / 'render' / f"{key}.json"
+
+
+def _create_bytecode_cache() -> Optional[BytecodeCache]:
+    """Create the on-disk template bytecode cache, or None if the cache directory is unusable"""
+    cache_dir = default_bytecode_cache_dir()
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        return FileSystemBytecodeCache(str(cache_dir))
+    except (OSError, RuntimeError) as e:
+        LOG.warning("Template bytecode cache disabled: %s", e)
+        return None
+
+
+@functools.lru_cache(maxsize=8)
+def _create_environment(template_dir: Path) -> Environment:
+    """Create the Jinja2 environment with the custom filters registered.
+
+    Compiled templates are kept for the life of the process, and auto_reload
+    stays on so an edited template is picked up rather than served stale.
+    Compiled bytecode is also cached on disk so later runs, and the render
+    worker processes, skip compiling unchanged templates.
+    """
+    env = Environment(
+        loader=FileSystemLoader(template_dir),
+        auto_reload=True,
+        cache_size=400,
+        bytecode_cache=_create_bytecode_cache()
+    )
+
+    # Add custom filters
+    env.filters['duration_format'] = duration_format
+    env.filters['datetime_format'] = datetime_format
+    env.filters['datetime_short'] = datetime_short
+
+    return env
+
+
+def render_layout(env: Environment, show_all_link: bool) -> tuple[str, str]:
+    """Render the page chrome once and split it into (header, footer) strings"""
+    layout = env.get_template(LAYOUT_TEMPLATE).render(
+        show_all_link=show_all_link,
+        body_placeholder=BODY_PLACEHOLDER
+    )
+    header, footer = layout.split(BODY_PLACEHOLDER)
+    return header, footer
+
+
+def render_chunks(template: Template, context: dict) -> Iterator[str]:
+    """
+    Yield the rendered chunks of a template by driving its compiled render
+    function directly, skipping the per-call setup of render()/stream().
+
+    Args:
+        template: Compiled template
+        context: Template variables
+
+    Returns:
+        Iterator over the rendered text chunks
+    """
+    try:
+        yield from template.root_render_func(template.new_context(context))
+    except Exception:
+        # Rewrites the traceback to point at the template source, as render() does
+        template.environment.handle_exception()
+
+
+def write_template(output_file: Path, template: Template, **context) -> None:
+    """Stream a rendered template straight into the output file"""
+    with open(output_file, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+        f.writelines(render_chunks(template, context))
+
+
+def write_playlist_page(
+        output_file: Path,
+        layout: tuple[str, str],
+        list_template: Template,
+        **context,
+) -> None:
+    """Write a playlist page using the pre-rendered chrome and the list fragment"""
+    header, footer = layout
+    with open(output_file, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+        f.write(header)
+        f.writelines(render_chunks(list_template, context))
+        f.write(footer)
+
+
+def _render_page_chunk(
+        page_jobs: list[tuple[Path, dict]],
+        layout: tuple[str, str],
+        template_dir: Path,
+) -> int:
+    """Render a chunk of playlist pages in a worker process"""
+    list_template = create_environment(template_dir).get_template(PLAYLIST_LIST_TEMPLATE)
+    for output_file, context in page_jobs:
+        write_playlist_page(output_file, layout, list_template, **context)
+    return len(page_jobs)
+
+
+def render_playlist_pages(
+        page_jobs: list[tuple[Path, dict]],
+        layout: tuple[str, str],
+        template_dir: Path,
+        list_template: Template,
+        max_workers: Optional[int] = None,
+) -> None:
+    """
+    Render independent playlist pages, spreading them across worker processes
+    when there are enough pages to outweigh the cost of starting the pool.
+
+    Args:
+        page_jobs: List of (output file, template context) pairs
+        layout: Pre-rendered (header, footer) for the pages
+        template_dir: Template directory (used to load templates in the workers)
+        list_template: Playlist list template used when rendering in-process
+        max_workers: Maximum number of worker processes (defaults to CPU count)
+    """
+    workers = max_workers or os.cpu_count() or 1
+
+    if workers > 1 and len(page_jobs) >= PARALLEL_RENDER_MIN_PAGES:
+        chunk_size = max(1, len(page_jobs) // (4 * workers))
+        chunks = paginate(page_jobs, chunk_size)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            rendered = sum(executor.map(
+                _render_page_chunk,
+                chunks,
+                repeat(layout),
+                repeat(template_dir)
+            ))
+        LOG.info("Rendered %d playlist pages using %d worker processes", rendered, workers)
+        return
+
+    for output_file, context in page_jobs:
+        write_playlist_page(output_file, layout, list_template, **context)
+        LOG.info("Playlist page written to %s", output_file)
+
+
 def render_output(
         processed_playlists: list[ProcessedPlaylist],
         output_dir: Path,
         template_dir: Path = DEFAULT_TEMPLATE_DIR,
+        max_workers: Optional[int] = None,
 ) -> None:
-    """ Render the processed playlists to HTML using Jinja2 template """
+    """ Render the processed playlists to HTML using Jinja2 template
 
-    LOG.info("Rendering HTML output to %s", output_dir)
+    Args:
+        processed_playlists: Playlists to render
+        output_dir: Directory to write the HTML files to
+        template_dir: Directory containing the Jinja2 templates and static files
+        max_workers: Number of worker processes used for the listing pages.
+                     Defaults to the number of CPUs.
+    """
 
-    # Set up Jinja2 environment
-    env = Environment(loader=FileSystemLoader(template_dir))
+    LOG.info("Rendering HTML output to %s", output_dir)
 
-    # Add custom filters
-    env.filters['duration_format'] = duration_format
-    env.filters['datetime_format'] = lambda dt: dt.strftime('%B %d, %Y') if dt else 'Unknown'
-    env.filters['datetime_short'] = lambda dt: dt.strftime('%Y-%m-%d') if dt else 'Unknown'
+    env = create_environment(template_dir)
 
     # Ensure output directory exists
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    # Copy CSS and JS files to output directory
-    for static_file in ['style.css', 'script.js']:
+    # Copy only the known static files; anything else in the template
+    # directory is not part of the published site
+    for static_file in STATIC_FILES:
         src_file = template_dir / static_file
         if src_file.exists():
-            dst_file = output_dir / static_file
-            shutil.copy2(src_file, dst_file)
+            shutil.copy2(src_file, output_dir / static_file)
             LOG.info("Copied %s to output directory", static_file)
     
     # Sort playlists by modification time (most recent first)
@@ -109,95 +356,94 @@ def render_output(
         reverse=True
     )
     
+    # The page chrome only varies by navigation style, so render it once per variant
+    # and re-render just the playlist list fragment for each page
+    recent_layout = render_layout(env, show_all_link=False)
+    browse_layout = render_layout(env, show_all_link=True)
+    list_template = env.get_template(PLAYLIST_LIST_TEMPLATE)
+
+    manifest = RenderManifest(output_dir, template_dir)
+
     # Render main index page (10 most recent playlists)
-    recent_playlists = sorted_playlists[:RECENT_PLAYLISTS_COUNT]
-    template = env.get_template("index.html.j2")
-    html_content = template.render(
-        processed_playlists=recent_playlists,
-        show_all_link=False,
-        page_title=f"Recently Updated Playlists"
-    )
-    
+    index_context = {
+        'processed_playlists': sorted_playlists[:RECENT_PLAYLISTS_COUNT],
+        'page_title': "Recently Updated Playlists",
+    }
     output_file = output_dir / "index.html"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
-    LOG.info("Main index page written to %s", output_file)
+    if manifest.is_current(output_file, index_context):
+        LOG.info("Main index page unchanged, skipping %s", output_file)
+    else:
+        write_playlist_page(output_file, recent_layout, list_template, **index_context)
+        LOG.info("Main index page written to %s", output_file)
     
-    # Render paginated all-playlists page
+    # Collect the listing pages; each page is independent so they can be rendered in parallel
+    page_jobs: list[tuple[Path, dict]] = []
+
+    # Paginated all-playlists pages
     pages = paginate(sorted_playlists, PLAYLISTS_PER_PAGE)
     for page_num, page_playlists in enumerate(pages, start=1):
         pagination_info = create_pagination_info(page_num, len(pages), "all-playlists")
-        html_content = template.render(
-            processed_playlists=page_playlists,
-            show_all_link=True,
-            page_title=f"All Playlists (Page {page_num} of {len(pages)})",
-            pagination=pagination_info
-        )
         
         if page_num == 1:
             output_file = output_dir / "all-playlists.html"
         else:
             output_file = output_dir / f"all-playlists-page{page_num}.html"
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        LOG.info("All-playlists page %d written to %s", page_num, output_file)
+        page_jobs.append((output_file, {
+            'processed_playlists': page_playlists,
+            'page_title': f"All Playlists (Page {page_num} of {len(pages)})",
+            'pagination': pagination_info,
+        }))
     
-    # Collect users and genres
+    # Collect users and genres from the sorted list so each bucket is already
+    # ordered most recent first
     users = defaultdict(list)
     genres = defaultdict(list)
+    user_counts = defaultdict(int)
+    genre_counts = defaultdict(int)
     
-    for playlist in processed_playlists:
-        users[playlist.user_playlist.user].append(playlist)
-        genres[playlist.user_playlist.genre].append(playlist)
+    for playlist in sorted_playlists:
+        user_playlist = playlist.user_playlist
+        users[user_playlist.user].append(playlist)
+        genres[user_playlist.genre].append(playlist)
+        user_counts[user_playlist.user] += 1
+        genre_counts[user_playlist.genre] += 1
     
-    # Render user pages
+    # User pages
     for user, user_playlists in users.items():
-        user_playlists_sorted = sorted(user_playlists, key=get_file_modified_time, reverse=True)
-        html_content = template.render(
-            processed_playlists=user_playlists_sorted,
-            show_all_link=True,
-            page_title=f"Playlists by {user}"
-        )
-        
-        output_file = output_dir / f"user-{user}.html"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        LOG.info("User page for %s written to %s", user, output_file)
+        page_jobs.append((output_dir / f"user-{user}.html", {
+            'processed_playlists': user_playlists,
+            'page_title': f"Playlists by {user}",
+        }))
     
-    # Render genre pages
+    # Genre pages
     for genre, genre_playlists in genres.items():
-        genre_playlists_sorted = sorted(genre_playlists, key=get_file_modified_time, reverse=True)
-        html_content = template.render(
-            processed_playlists=genre_playlists_sorted,
-            show_all_link=True,
-            page_title=f"Playlists in {genre.title()}"
-        )
-        
-        output_file = output_dir / f"genre-{genre}.html"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        LOG.info("Genre page for %s written to %s", genre, output_file)
+        page_jobs.append((output_dir / f"genre-{genre}.html", {
+            'processed_playlists': genre_playlists,
+            'page_title': f"Playlists in {genre.title()}",
+        }))
     
-    # Render users index page
-    users_template = env.get_template("users.html.j2")
-    users_list = sorted([(user, len(playlists)) for user, playlists in users.items()])
-    html_content = users_template.render(users=users_list)
+    changed_jobs = [job for job in page_jobs if not manifest.is_current(*job)]
+    LOG.info("%d of %d playlist pages changed", len(changed_jobs), len(page_jobs))
+    render_playlist_pages(changed_jobs, browse_layout, template_dir, list_template, max_workers)
     
+    # Render users index page
+    users_context = {'users': sorted(user_counts.items())}
     output_file = output_dir / "users.html"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
-    LOG.info("Users index page written to %s", output_file)
+    if manifest.is_current(output_file, users_context):
+        LOG.info("Users index page unchanged, skipping %s", output_file)
+    else:
+        write_template(output_file, env.get_template("users.html.j2"), **users_context)
+        LOG.info("Users index page written to %s", output_file)
     
     # Render genres index page
-    genres_template = env.get_template("genres.html.j2")
-    genres_list = sorted([(genre, len(playlists)) for genre, playlists in genres.items()])
-    html_content = genres_template.render(genres=genres_list)
-    
+    genres_context = {'genres': sorted(genre_counts.items())}
     output_file = output_dir / "genres.html"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
-    LOG.info("Genres index page written to %s", output_file)
+    if manifest.is_current(output_file, genres_context):
+        LOG.info("Genres index page unchanged, skipping %s", output_file)
+    else:
+        write_template(output_file, env.get_template("genres.html.j2"), **genres_context)
+        LOG.info("Genres index page written to %s", output_file)
     
     # Render frozen playlists page (always generate, even if empty)
     frozen_playlists = [
@@ -215,20 +461,21 @@ def render_output(
     else:
         frozen_sorted = []
     
-    frozen_template = env.get_template("frozen-playlists.html.j2")
-    html_content = frozen_template.render(
-        frozen_playlists=frozen_sorted,
-        page_title="Frozen Remote Playlists"
-    )
-    
+    frozen_context = {
+        'frozen_playlists': frozen_sorted,
+        'page_title': "Frozen Remote Playlists",
+    }
     output_file = output_dir / "frozen-playlists.html"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
-    
-    if frozen_playlists:
-        LOG.info("Frozen playlists page written to %s (%d frozen)", output_file, len(frozen_playlists))
+    if manifest.is_current(output_file, frozen_context):
+        LOG.info("Frozen playlists page unchanged, skipping %s", output_file)
     else:
-        LOG.info("Frozen playlists page written to %s (no frozen playlists)", output_file)
+        write_template(output_file, env.get_template("frozen-playlists.html.j2"), **frozen_context)
+        if frozen_playlists:
+            LOG.info("Frozen playlists page written to %s (%d frozen)", output_file, len(frozen_playlists))
+        else:
+            LOG.info("Frozen playlists page written to %s (no frozen playlists)", output_file)
+
+    manifest.save()
 
     LOG.info("HTML output successfully rendered with %d playlists", len(processed_playlists))
 
@@ -1,5 +1,7 @@
 """ Module for loading playlists from YAML files """
+import functools
 import logging
+import os
 
 from pathlib import Path
 from dataclasses import dataclass
@@ -8,8 +10,16 @@ import re
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
 LOG = logging.getLogger(__name__)
 
+PARSED_PLAYLIST_CACHE_SIZE = 1024
+USERNAME_PATTERN = re.compile(r'\A[a-zA-Z0-9_-]+\Z')
+
 
 class PlaylistValidationError(Exception):
     """ Exception raised when a playlist fails validation """
@@ -29,6 +39,17 @@ class Playlist:
     remote_service: str = "spotify"  # Service identifier for remote playlists
 
 
+@dataclass(frozen=True, slots=True)
+class _ParsedPlaylist:
+    """ Validated contents of a playlist file, shared between loads of an unchanged file """
+    user: str
+    title: str
+    description: str
+    genre: str
+    tracks: Optional[Tuple[Tuple[str, str, Optional[str]], ...]]
+    remote_playlist: Optional[str]
+
+
 def validate_username_format(username: str) -> None:
     """
     Validate that username follows format rules.
@@ -54,7 +75,7 @@ def validate_username_format(username: str) -> None:
             f"Invalid username '{username}': username must be at most 30 characters"
         )
     
-    if not re.match(r'^[a-zA-Z0-9_-]+$', username):
+    if not USERNAME_PATTERN.match(username):
         raise PlaylistValidationError(
             f"Invalid username '{username}': username can only contain letters, numbers, "
             f"underscores, and hyphens (no spaces or special characters)"
@@ -138,7 +159,7 @@ def get_playlists(directory: str) -> Generator[Playlist]:
         LOG.error("Directory %s does not exist", directory)
         raise FileNotFoundError(f"Directory {directory} does not exist")
 
-    for playlist_filepath in path.glob('*/*.yaml'):
+    for playlist_filepath in _scan_playlist_files(path):
         try:
             yield load_playlist(playlist_filepath, path)
         except (yaml.YAMLError, IOError, PlaylistValidationError) as e:
@@ -146,6 +167,23 @@ def get_playlists(directory: str) -> Generator[Playlist]:
             continue
 
 
+def _scan_playlist_files(path: Path) -> Generator[Path]:
+    """ Yield the <user>/<playlist>.yaml files under a directory.
+
+    Uses os.scandir so the file type reported by the directory listing is
+    reused instead of issuing a stat call per entry. Like glob('*/*.yaml'),
+    dot-prefixed files and directories are included.
+    """
+    with os.scandir(path) as user_entries:
+        for user_entry in user_entries:
+            if not user_entry.is_dir():
+                continue
+            with os.scandir(user_entry.path) as playlist_entries:
+                for playlist_entry in playlist_entries:
+                    if playlist_entry.name.endswith('.yaml') and playlist_entry.is_file():
+                        yield Path(playlist_entry.path)
+
+
 def get_playlists_from_paths(filepaths: List[Path], base_directory: Optional[Path] = None) -> Generator[Playlist]:
     """ Generator that yields playlists from a list of file paths 
     
@@ -181,6 +219,9 @@ def get_playlists_from_paths(filepaths: List[Path], base_directory: Optional[Pat
 def load_playlist(filepath: Path, base_directory: Optional[Path] = None) -> Playlist:
     """ Load a Playlist from a Playlist YAML file 
     
+    The file is read on every call, but its contents are only parsed again
+    when they differ from the last time it was loaded.
+    
     Args:
         filepath: Path to the playlist YAML file
         base_directory: Base directory for structure validation (e.g., mixdiscs/)
@@ -189,8 +230,40 @@ def load_playlist(filepath: Path, base_directory: Optional[Path] = None) -> Play
 
     LOG.debug("Loading playlist from %s", filepath)
 
-    with open(filepath, 'r', encoding="utf8") as playlist_file:
-        data = yaml.load(playlist_file, Loader=yaml.FullLoader)
+    with open(filepath, 'rb') as playlist_file:
+        content = playlist_file.read()
+    parsed = _parse_playlist_content(filepath, base_directory, content)
+    
+    return Playlist(
+        user=parsed.user,
+        title=parsed.title,
+        description=parsed.description,
+        genre=parsed.genre,
+        tracks=list(parsed.tracks) if parsed.tracks is not None else None,
+        filepath=filepath,
+        remote_playlist=parsed.remote_playlist,
+    )
+
+
+@functools.lru_cache(maxsize=PARSED_PLAYLIST_CACHE_SIZE)
+def _parse_playlist_content(
+    filepath: Path,
+    base_directory: Optional[Path],
+    content: bytes
+) -> _ParsedPlaylist:
+    """ Parse and validate the contents of a playlist file
+    
+    The cache is keyed on the file contents rather than its modification
+    time, so a rewrite that keeps the size and timestamp is still parsed.
+    
+    Args:
+        filepath: Path to the playlist YAML file
+        base_directory: Base directory for structure validation (e.g., mixdiscs/)
+                       If None, validation for folder structure is skipped.
+        content: Raw bytes of the file
+    """
+
+    data = yaml.load(content, Loader=_Loader)
 
     # Validate required fields exist
     required_fields = ['user', 'title', 'description', 'genre']
@@ -213,27 +286,24 @@ def load_playlist(filepath: Path, base_directory: Optional[Path] = None) -> Play
             "Must specify either 'playlist' or 'remote_playlist' field"
         )
     
-    # Validate fields are not blank
-    if not data['user'] or not str(data['user']).strip():
-        raise PlaylistValidationError("Field 'user' cannot be blank")
-    
-    if not data['title'] or not str(data['title']).strip():
-        raise PlaylistValidationError("Field 'title' cannot be blank")
-    
-    if not data['description'] or not str(data['description']).strip():
-        raise PlaylistValidationError("Field 'description' cannot be blank")
-    
-    if not data['genre'] or not str(data['genre']).strip():
-        raise PlaylistValidationError("Field 'genre' cannot be blank")
+    # Validate fields are not blank, stripping each value once
+    fields = {}
+    for field in required_fields:
+        value = data[field]
+        if isinstance(value, str):
+            value = value.strip()
+        if not value:
+            raise PlaylistValidationError(f"Field '{field}' cannot be blank")
+        if not isinstance(value, str):
+            raise PlaylistValidationError(f"Field '{field}' must be a string")
+        fields[field] = value
 
-    user = data['user'].strip()
-    
     # Validate username format
-    validate_username_format(user)
+    validate_username_format(fields['user'])
     
     # Validate folder structure if base_directory is provided
     if base_directory is not None:
-        validate_username_matches_folder(filepath, user, base_directory)
+        validate_username_matches_folder(filepath, fields['user'], base_directory)
     
     # Handle remote playlist
     if has_remote:
@@ -246,28 +316,20 @@ def load_playlist(filepath: Path, base_directory: Optional[Path] = None) -> Play
                 f"Expected format: https://open.spotify.com/playlist/... or spotify:playlist:..."
             )
         
-        return Playlist(
-            user=user,
-            title=data['title'].strip(),
-            description=data['description'].strip(),
-            genre=data['genre'].strip(),
+        return _ParsedPlaylist(
             tracks=None,  # No manual tracks for remote playlists
             remote_playlist=remote_url,
-            remote_service='spotify',
-            filepath=filepath
+            **fields
         )
     
     # Handle manual playlist (existing logic)
     if not data['playlist'] or len(data['playlist']) == 0:
         raise PlaylistValidationError("Field 'playlist' cannot be blank or empty")
 
-    return Playlist(
-        user=user,
-        title=data['title'].strip(),
-        description=data['description'].strip(),
-        genre=data['genre'].strip(),
-        tracks=[get_artist_title_album_from_entry(entry) for entry in data['playlist']],
-        filepath=filepath
+    return _ParsedPlaylist(
+        tracks=tuple(get_artist_title_album_from_entry(entry) for entry in data['playlist']),
+        remote_playlist=None,
+        **fields
     )
 
 
@@ -292,8 +354,8 @@ def get_artist_title_album_from_entry(entry: str) -> tuple[str, str, Optional[st
         raise PlaylistValidationError("Playlist entry cannot be blank")
     
     # Check for album specification (pipe separator)
-    if ' | ' in entry:
-        track_part, album = entry.split(' | ', 1)
+    track_part, separator, album = entry.partition(' | ')
+    if separator:
         album = album.strip()
         if not album:
             raise PlaylistValidationError(
@@ -305,18 +367,16 @@ def get_artist_title_album_from_entry(entry: str) -> tuple[str, str, Optional[st
             f"Invalid format: '{entry}'. Use ' | ' (with spaces) to separate album"
         )
     else:
-        track_part = entry
         album = None
     
-    # Parse artist and title
-    if ' - ' not in track_part:
+    # Parse artist and title (split only on first ' - ' occurrence)
+    artist, separator, title = track_part.partition(' - ')
+    if not separator:
         raise PlaylistValidationError(
             f"Invalid playlist entry format: '{entry}'. "
             f"Expected 'Artist - Title' or 'Artist - Title | Album'"
         )
     
-    artist, title = track_part.split(' - ', 1)  # Split only on first ' - ' occurrence
-    
     if not artist.strip():
         raise PlaylistValidationError(f"Artist name cannot be blank in entry: '{entry}'")
     
@@ -1,18 +1,58 @@
 """ Module for track-level caching to enable incremental playlist updates """
 
-import hashlib
+import functools
+import heapq
 import json
 import logging
+import os
+import sys
+import time
 
+from collections import Counter
+from dataclasses import fields
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Optional
 
+from mixdiscer._cache_session import CacheSession
 from mixdiscer.music_service import Track
 
 LOG = logging.getLogger(__name__)
 
+CACHE_IO_BUFFER_SIZE = 64 * 1024
+TRACK_CACHE_VERSION = '4.0'
+# Key of the version used when a playlist entry does not specify an album
+DEFAULT_VERSION_KEY = '__default__'
+# In-memory index of (last accessed epoch, track key) used by cleanup_stale_tracks.
+# Built on the first cleanup and never written to disk.
+ACCESS_HEAP_KEY = '_access_heap'
+SECONDS_PER_DAY = 24 * 60 * 60
+# Lookup outcomes of get_cached_track since the process started (or the last reset):
+# hits, negative_hits (cached "not found" results) and misses
+_LOOKUP_COUNTERS = Counter(hits=0, negative_hits=0, misses=0)
+# Track fields stored directly on a cached version; any others (e.g. a Spotify
+# URI) are kept under 'service_specific'
+_CORE_FIELDS = frozenset(('artist', 'title', 'album', 'duration', 'link'))
+# Version fields whose values repeat heavily across the cache
+_INTERNED_FIELDS = ('artist', 'album', 'normalized_album')
 
+
+# Per-track timestamps, stored as whole Unix epoch seconds
+_TRACK_TIMESTAMP_FIELDS = ('first_seen', 'last_accessed')
+_VERSION_TIMESTAMP_FIELDS = ('cached_at',)
+
+
+def _now_iso() -> str:
+    """Return the current UTC time as an ISO string"""
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _now_epoch() -> int:
+    """Return the current time as whole Unix epoch seconds"""
+    return int(time.time())
+
+
+@functools.lru_cache(maxsize=8192)
 def normalize_track_key(artist: str, title: str) -> str:
     """
     Normalize track identifier for cache lookup (album-agnostic).
@@ -24,7 +64,13 @@ def normalize_track_key(artist: str, title: str) -> str:
     Returns:
         Normalized key: "artist - title" (lowercase, trimmed)
     """
-    return f"{artist.strip().lower()} - {title.strip().lower()}"
+    return sys.intern(f"{artist.strip().lower()} - {title.strip().lower()}")
+
+
+@functools.lru_cache(maxsize=4096)
+def _normalize_album(album: Optional[str]) -> str:
+    """Normalize an album name for version lookup (lowercase, trimmed, '' for None)"""
+    return sys.intern((album or '').strip().lower())
 
 
 def load_track_cache(cache_path: Path) -> dict:
@@ -39,26 +85,101 @@ def load_track_cache(cache_path: Path) -> dict:
     """
     if not cache_path.exists():
         LOG.debug("Track cache file not found, creating empty cache structure")
-        return {
-            'version': '2.0',
-            'last_updated': datetime.now(timezone.utc).isoformat(),
-            'tracks': {}
-        }
+        return _empty_track_cache()
     
     try:
-        with open(cache_path, 'r', encoding='utf-8') as f:
-            cache_data = json.load(f)
-            LOG.debug("Loaded track cache from %s with %d tracks", 
-                     cache_path, len(cache_data.get('tracks', {})))
-            return cache_data
-    except (json.JSONDecodeError, IOError) as e:
+        with open(cache_path, 'rb', buffering=CACHE_IO_BUFFER_SIZE) as f:
+            cache_data = json.loads(f.read())
+    except (ValueError, IOError) as e:
         LOG.warning("Failed to load track cache from %s: %s. Starting with empty cache.", 
                    cache_path, e)
-        return {
-            'version': '2.0',
-            'last_updated': datetime.now(timezone.utc).isoformat(),
-            'tracks': {}
-        }
+        return _empty_track_cache()
+
+    if cache_data.get('version') != TRACK_CACHE_VERSION:
+        _migrate_versions_to_dict(cache_data)
+        _migrate_timestamps_to_epoch(cache_data)
+        cache_data['version'] = TRACK_CACHE_VERSION
+        LOG.info("Migrated track cache to version %s", TRACK_CACHE_VERSION)
+
+    _intern_cache_strings(cache_data)
+
+    LOG.debug("Loaded track cache from %s with %d tracks", 
+             cache_path, len(cache_data.get('tracks', {})))
+    return cache_data
+
+
+def _empty_track_cache() -> dict:
+    """Return a new, empty track cache structure"""
+    return {
+        'version': TRACK_CACHE_VERSION,
+        'last_updated': _now_iso(),
+        'tracks': {}
+    }
+
+
+def _migrate_versions_to_dict(cache_data: dict) -> None:
+    """
+    Convert version 2.0 caches, which store each service's versions as a
+    list, to the dict layout keyed by normalized album (or DEFAULT_VERSION_KEY).
+
+    Args:
+        cache_data: Track cache data dictionary (modified in place)
+    """
+    for track_entry in cache_data.get('tracks', {}).values():
+        versions = track_entry.get('versions', {})
+        for service_name, service_versions in versions.items():
+            if isinstance(service_versions, list):
+                versions[service_name] = {
+                    _version_key(v.get('normalized_album', ''), v.get('is_default', False)): v
+                    for v in service_versions
+                }
+
+
+def _migrate_timestamps_to_epoch(cache_data: dict) -> None:
+    """
+    Convert the ISO timestamp strings of caches before version 4.0 to
+    whole Unix epoch seconds.
+
+    Args:
+        cache_data: Track cache data dictionary (modified in place)
+    """
+    def to_epoch(entry: dict, field_names: tuple[str, ...]) -> None:
+        for field in field_names:
+            value = entry.get(field)
+            if isinstance(value, str):
+                entry[field] = int(datetime.fromisoformat(value).timestamp())
+
+    for track_entry in cache_data.get('tracks', {}).values():
+        to_epoch(track_entry, _TRACK_TIMESTAMP_FIELDS)
+        for service_versions in track_entry.get('versions', {}).values():
+            for version in service_versions.values():
+                to_epoch(version, _VERSION_TIMESTAMP_FIELDS)
+
+
+def _intern_cache_strings(cache_data: dict) -> None:
+    """
+    Intern the service names and artist/album strings in a loaded cache. A
+    large cache repeats the same few hundred artists and albums many times,
+    so sharing one string object per value keeps its memory footprint down.
+
+    Args:
+        cache_data: Track cache data dictionary (modified in place)
+    """
+    for track_entry in cache_data.get('tracks', {}).values():
+        versions = track_entry.get('versions', {})
+        for service_name in list(versions):
+            service_versions = versions.pop(service_name)
+            versions[sys.intern(service_name)] = service_versions
+            for version in service_versions.values():
+                for field in _INTERNED_FIELDS:
+                    value = version.get(field)
+                    if isinstance(value, str):
+                        version[field] = sys.intern(value)
+
+
+def _version_key(normalized_album: str, is_default: bool) -> str:
+    """Return the key a track version is stored under for a service"""
+    return DEFAULT_VERSION_KEY if is_default else normalized_album
 
 
 def save_track_cache(cache_data: dict, cache_path: Path) -> None:
@@ -76,14 +197,37 @@ def save_track_cache(cache_data: dict, cache_path: Path) -> None:
         parent_dir.unlink()
     parent_dir.mkdir(parents=True, exist_ok=True)
     
-    cache_data['last_updated'] = datetime.now(timezone.utc).isoformat()
+    cache_data['last_updated'] = _now_iso()
     
-    with open(cache_path, 'w', encoding='utf-8') as f:
-        json.dump(cache_data, f, indent=2)
+    # Write to a temporary file and swap it in so a crash mid-write never
+    # leaves a truncated cache behind
+    tmp_path = cache_path.with_name(cache_path.name + '.tmp')
+    with open(tmp_path, 'wb', buffering=CACHE_IO_BUFFER_SIZE) as f:
+        saved = {k: v for k, v in cache_data.items() if k != ACCESS_HEAP_KEY}
+        f.write(json.dumps(saved, indent=2).encode('utf-8'))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, cache_path)
     
     LOG.debug("Saved track cache to %s", cache_path)
 
 
+class TrackCacheSession(CacheSession):
+    """
+    Context manager that loads the track cache once and saves it once on exit,
+    and only if something marked it as modified. Use it around a batch of
+    playlists instead of loading and saving the cache for each one.
+
+    Example:
+        with TrackCacheSession(cache_path) as session:
+            process(session.cache_data)
+            session.mark_dirty()
+    """
+
+    def __init__(self, cache_path: Path):
+        super().__init__(cache_path, load_track_cache, save_track_cache)
+
+
 def _deserialize_track_version(
     artist: str, 
     title: str, 
@@ -141,32 +285,42 @@ def get_cached_track(
     track_entry = cache_data['tracks'].get(track_key)
     
     if not track_entry:
+        _LOOKUP_COUNTERS['misses'] += 1
         return None  # Track not in cache at all
     
     # Update access statistics
-    track_entry['last_accessed'] = datetime.now(timezone.utc).isoformat()
+    track_entry['last_accessed'] = _now_epoch()
     track_entry['access_count'] = track_entry.get('access_count', 0) + 1
     
-    versions = track_entry.get('versions', {}).get(service_name, [])
+    versions = track_entry.get('versions', {}).get(service_name)
     
     if not versions:
+        _LOOKUP_COUNTERS['misses'] += 1
         return None  # No versions for this service
     
+    default_version = versions.get(DEFAULT_VERSION_KEY)
     if album is None:
         # No album specified - use default version
-        for version in versions:
-            if version.get('is_default', False):
-                LOG.debug("Track cache hit (default): %s - %s", artist, title)
-                return _deserialize_track_version(artist, title, version)
-        return None  # No default version cached
+        version = default_version
     else:
-        # Album specified - find exact match
-        normalized_album = album.strip().lower()
-        for version in versions:
-            if version.get('normalized_album') == normalized_album:
-                LOG.debug("Track cache hit (album: %s): %s - %s", album, artist, title)
-                return _deserialize_track_version(artist, title, version)
-        return None  # Specific album not cached
+        # Album specified - find exact match, which may be the default version
+        normalized_album = _normalize_album(album)
+        version = versions.get(normalized_album)
+        if version is None and default_version is not None \
+                and default_version.get('normalized_album') == normalized_album:
+            version = default_version
+
+    if version is None:
+        _LOOKUP_COUNTERS['misses'] += 1
+        return None  # Default or specific album version not cached
+    
+    _LOOKUP_COUNTERS['hits' if version.get('found', True) else 'negative_hits'] += 1
+    if LOG.isEnabledFor(logging.DEBUG):
+        if album is None:
+            LOG.debug("Track cache hit (default): %s - %s", artist, title)
+        else:
+            LOG.debug("Track cache hit (album: %s): %s - %s", album, artist, title)
+    return _deserialize_track_version(artist, title, version)
 
 
 def update_track_cache(
@@ -192,24 +346,29 @@ def update_track_cache(
         is_default: Mark this version as the default (no album specified)
     """
     track_key = normalize_track_key(artist, title)
+    service_name = sys.intern(service_name)
+    now = _now_epoch()
     
     # Initialize track entry if needed
     if track_key not in cache_data['tracks']:
         cache_data['tracks'][track_key] = {
             'query': {'artist': artist, 'title': title},
             'versions': {},
-            'first_seen': datetime.now(timezone.utc).isoformat(),
-            'last_accessed': datetime.now(timezone.utc).isoformat(),
+            'first_seen': now,
+            'last_accessed': now,
             'access_count': 1
         }
+        # Keep the cleanup index, if one has been built, covering every track
+        if ACCESS_HEAP_KEY in cache_data:
+            heapq.heappush(cache_data[ACCESS_HEAP_KEY], (now, track_key))
     
     track_entry = cache_data['tracks'][track_key]
-    track_entry['last_accessed'] = datetime.now(timezone.utc).isoformat()
+    track_entry['last_accessed'] = now
     track_entry['access_count'] = track_entry.get('access_count', 0) + 1
     
     # Initialize service versions if needed
     if service_name not in track_entry['versions']:
-        track_entry['versions'][service_name] = []
+        track_entry['versions'][service_name] = {}
     
     versions = track_entry['versions'][service_name]
     
@@ -218,119 +377,123 @@ def update_track_cache(
         # Track found - cache it
         version_data = {
             'found': True,
-            'artist': track.artist,  # Store actual result (may differ from query)
+            'artist': sys.intern(track.artist),  # Store actual result (may differ from query)
             'title': track.title,
-            'album': track.album,
-            'normalized_album': (track.album or '').strip().lower(),
+            'album': sys.intern(track.album) if track.album else track.album,
+            'normalized_album': _normalize_album(track.album),
             'duration_seconds': int(track.duration.total_seconds()),
             'link': track.link,
             'is_default': is_default,
-            'cached_at': datetime.now(timezone.utc).isoformat()
+            'cached_at': now
         }
         
         # Add service-specific data if available
-        if hasattr(track, '__dict__'):
-            service_specific = {}
-            for key, value in track.__dict__.items():
-                if key not in ['artist', 'title', 'album', 'duration', 'link']:
-                    service_specific[key] = value
-            if service_specific:
-                version_data['service_specific'] = service_specific
-        
-        # Check if this version already exists (by album)
-        normalized_album = (track.album or '').strip().lower()
-        existing_idx = None
-        for idx, v in enumerate(versions):
-            if v.get('normalized_album') == normalized_album:
-                existing_idx = idx
-                break
+        service_specific = {
+            field.name: getattr(track, field.name)
+            for field in fields(track) if field.name not in _CORE_FIELDS
+        }
+        if service_specific:
+            version_data['service_specific'] = service_specific
         
-        if existing_idx is not None:
-            # Update existing version
-            versions[existing_idx] = version_data
-            LOG.debug("Updated cached track version: %s - %s (album: %s)", 
-                     artist, title, track.album or "default")
-        else:
-            # Add new version
-            versions.append(version_data)
-            LOG.debug("Added new cached track version: %s - %s (album: %s)", 
+        key = _version_key(version_data['normalized_album'], is_default)
+        existing = versions.get(key)
+        if _is_same_version(existing, version_data):
+            return  # Already cached with the same result
+        if LOG.isEnabledFor(logging.DEBUG):
+            LOG.debug("%s cached track version: %s - %s (album: %s)",
+                     "Updated" if existing else "Added new",
                      artist, title, track.album or "default")
+        versions[key] = version_data
     else:
         # Track not found - store negative cache
         version_data = {
             'found': False,
             'album': album,
-            'normalized_album': (album or '').strip().lower(),
+            'normalized_album': _normalize_album(album),
             'is_default': is_default,
-            'cached_at': datetime.now(timezone.utc).isoformat()
+            'cached_at': now
         }
         
-        # Check if this negative result already exists
-        normalized_album = (album or '').strip().lower()
-        existing_idx = None
-        for idx, v in enumerate(versions):
-            if not v.get('found', True) and v.get('normalized_album') == normalized_album:
-                existing_idx = idx
-                break
+        key = _version_key(version_data['normalized_album'], is_default)
+        if _is_same_version(versions.get(key), version_data):
+            return  # Already cached as not found
+        versions[key] = version_data
         
-        if existing_idx is not None:
-            # Update existing negative cache
-            versions[existing_idx] = version_data
-        else:
-            # Add new negative cache
-            versions.append(version_data)
-        
-        LOG.debug("Cached 'not found' result: %s - %s (album: %s)", 
-                 artist, title, album or "default")
+        if LOG.isEnabledFor(logging.DEBUG):
+            LOG.debug("Cached 'not found' result: %s - %s (album: %s)", 
+                     artist, title, album or "default")
+
+
+def _is_same_version(existing: Optional[dict], version_data: dict) -> bool:
+    """Return True if a cached version already holds this result, ignoring when it was cached"""
+    if existing is None or existing.keys() != version_data.keys():
+        return False
+    return all(
+        existing[field] == value
+        for field, value in version_data.items()
+        if field != 'cached_at'
+    )
 
 
-def get_track_cache_stats(cache_data: dict) -> dict:
+def get_track_cache_stats(cache_data: dict, include_most_accessed: bool = True) -> dict:
     """
     Return statistics about track cache.
     
     Args:
         cache_data: Track cache data dictionary
+        include_most_accessed: Whether to find the 10 most accessed tracks.
+                               'most_accessed' is left empty when False.
         
     Returns:
-        Dictionary with cache statistics
+        Dictionary with cache statistics. 'runtime' holds the lookup hit,
+        negative hit and miss counts of this process.
     """
     stats = {
         'total_tracks': len(cache_data.get('tracks', {})),
         'services': {},
         'not_found_tracks': 0,
         'total_versions': 0,
-        'most_accessed': []
+        'most_accessed': [],
+        'runtime': dict(_LOOKUP_COUNTERS)
     }
     
     service_counts = {}
-    access_counts = []
     
-    for track_key, track_data in cache_data.get('tracks', {}).items():
+    for track_data in cache_data.get('tracks', {}).values():
         versions = track_data.get('versions', {})
         
         for service_name, service_versions in versions.items():
             if service_name not in service_counts:
                 service_counts[service_name] = {'cached': 0, 'not_found': 0}
             
-            for version in service_versions:
+            for version in service_versions.values():
                 stats['total_versions'] += 1
                 if version.get('found', True):
                     service_counts[service_name]['cached'] += 1
                 else:
                     service_counts[service_name]['not_found'] += 1
                     stats['not_found_tracks'] += 1
-        
-        access_counts.append((
-            track_key,
-            track_data.get('access_count', 0)
-        ))
     
     stats['services'] = service_counts
-    stats['most_accessed'] = sorted(access_counts, key=lambda x: x[1], reverse=True)[:10]
+    if include_most_accessed:
+        stats['most_accessed'] = heapq.nlargest(
+            10,
+            (
+                (track_key, track_data.get('access_count', 0))
+                for track_key, track_data in cache_data.get('tracks', {}).items()
+            ),
+            key=lambda x: x[1]
+        )
     
     return stats
 
 
+def reset_track_cache_counters() -> None:
+    """Reset the get_cached_track hit/miss counters reported by get_track_cache_stats"""
+    for outcome in _LOOKUP_COUNTERS:
+        _LOOKUP_COUNTERS[outcome] = 0
+
+
 def cleanup_stale_tracks(
     cache_data: dict,
     current_tracks: set[str],
@@ -347,23 +510,44 @@ def cleanup_stale_tracks(
     Returns:
         Count of removed tracks
     """
-    tracks_to_remove = []
-    now = datetime.now(timezone.utc)
+    tracks = cache_data.get('tracks', {})
+    heap = cache_data.get(ACCESS_HEAP_KEY)
+    if heap is None:
+        heap = [(track_data['last_accessed'], track_key) for track_key, track_data in tracks.items()]
+        heapq.heapify(heap)
+        cache_data[ACCESS_HEAP_KEY] = heap
+    
+    now = _now_epoch()
+    # A track is stale once it is more than max_age_days whole days old
+    cutoff = now - (max_age_days + 1) * SECONDS_PER_DAY
+    in_use = []
+    removed = 0
     
-    for track_key, track_data in cache_data.get('tracks', {}).items():
+    # Heap entries are lower bounds on a track's last access, so only the
+    # entries older than the cutoff need checking against the track itself
+    while heap and heap[0][0] <= cutoff:
+        indexed_time, track_key = heapq.heappop(heap)
+        track_data = tracks.get(track_key)
+        if track_data is None:
+            continue  # Already removed
+        
+        last_accessed = track_data['last_accessed']
+        if last_accessed != indexed_time:
+            # Accessed since it was indexed - re-file it under the newer time
+            heapq.heappush(heap, (last_accessed, track_key))
+            continue
+        
         # Check if track is still in use
         if track_key in current_tracks:
+            in_use.append((indexed_time, track_key))
             continue
         
-        # Check if track is too old
-        last_accessed = datetime.fromisoformat(track_data.get('last_accessed'))
-        age_days = (now - last_accessed).days
-        
-        if age_days > max_age_days:
-            tracks_to_remove.append(track_key)
-            LOG.info("Removing stale track cache entry: %s (age: %d days)", track_key, age_days)
+        del tracks[track_key]
+        removed += 1
+        LOG.info("Removing stale track cache entry: %s (age: %d days)",
+                 track_key, (now - last_accessed) // SECONDS_PER_DAY)
     
-    for track_key in tracks_to_remove:
-        del cache_data['tracks'][track_key]
+    for entry in in_use:
+        heapq.heappush(heap, entry)
     
-    return len(tracks_to_remove)
+    return removed
@@ -1,5 +1,7 @@
 """ Module for validating playlists """
 
+import io
+
 from dataclasses import dataclass
 from datetime import timedelta
 from pathlib import Path
@@ -38,53 +40,57 @@ def format_validation_results(results: list[ValidationResult]) -> str:
     if not results:
         return "No playlists to validate."
 
-    valid_count = sum(1 for r in results if r.is_valid)
-    invalid_count = len(results) - valid_count
+    # Split the results in a single pass
+    passed_results: list[ValidationResult] = []
+    failed_results: list[ValidationResult] = []
+    for result in results:
+        (passed_results if result.is_valid else failed_results).append(result)
+    valid_count = len(passed_results)
+    invalid_count = len(failed_results)
 
-    output = ["# Playlist Validation Results\n"]
+    output = io.StringIO()
+    output.write("# Playlist Validation Results\n")
 
     if invalid_count == 0:
-        output.append(f"✅ All {valid_count} playlist(s) passed validation!\n")
+        output.write(f"✅ All {valid_count} playlist(s) passed validation!\n")
     else:
-        output.append(f"❌ {invalid_count} of {len(results)} playlist(s) failed validation.\n")
+        output.write(f"❌ {invalid_count} of {len(results)} playlist(s) failed validation.\n")
 
     # Show failed playlists first
-    failed_results = [r for r in results if not r.is_valid]
     if failed_results:
-        output.append("## Failed Playlists\n")
+        output.write("## Failed Playlists\n")
         for result in failed_results:
-            output.append(f"### ❌ {result.title} by {result.user}\n")
-            output.append(f"**File:** `{result.filepath}`\n")
+            output.write(f"### ❌ {result.title} by {result.user}\n")
+            output.write(f"**File:** `{result.filepath}`\n")
 
             if result.error_message:
-                output.append(f"**Error:** {result.error_message}\n")
+                output.write(f"**Error:** {result.error_message}\n")
             elif result.duplicate_of:
-                output.append(f"**Duplicate:** This playlist already exists at `{result.duplicate_of}`\n")
-                output.append(f"**Note:** Username-playlist combination must be globally unique\n")
+                output.write(f"**Duplicate:** This playlist already exists at `{result.duplicate_of}`\n")
+                output.write(f"**Note:** Username-playlist combination must be globally unique\n")
             elif result.duration_exceeded:
-                output.append(f"**Duration:** {format_duration(result.total_duration)} "
-                            f"(exceeds limit by {format_duration(result.duration_difference)})\n")
-                output.append(f"**Limit:** {format_duration(result.duration_threshold)}\n")
+                output.write(f"**Duration:** {format_duration(result.total_duration)} "
+                             f"(exceeds limit by {format_duration(result.duration_difference)})\n")
+                output.write(f"**Limit:** {format_duration(result.duration_threshold)}\n")
 
             if result.missing_tracks:
-                output.append(f"\n**Missing tracks ({len(result.missing_tracks)}):**\n")
+                output.write(f"\n**Missing tracks ({len(result.missing_tracks)}):**\n")
                 for artist, track in result.missing_tracks:
-                    output.append(f"- {artist} - {track}\n")
-            output.append("\n")
+                    output.write(f"- {artist} - {track}\n")
+            output.write("\n")
 
     # Show passed playlists
-    passed_results = [r for r in results if r.is_valid]
     if passed_results:
-        output.append("## Passed Playlists\n")
+        output.write("## Passed Playlists\n")
         for result in passed_results:
-            output.append(f"### ✅ {result.title} by {result.user}\n")
-            output.append(f"**Duration:** {format_duration(result.total_duration)} / "
-                        f"{format_duration(result.duration_threshold)}\n")
+            output.write(f"### ✅ {result.title} by {result.user}\n")
+            output.write(f"**Duration:** {format_duration(result.total_duration)} / "
+                         f"{format_duration(result.duration_threshold)}\n")
             if result.missing_tracks:
-                output.append(f"**Note:** {len(result.missing_tracks)} track(s) not found on music service\n")
-            output.append("\n")
+                output.write(f"**Note:** {len(result.missing_tracks)} track(s) not found on music service\n")
+            output.write("\n")
 
-    return "".join(output)
+    return output.getvalue()
 
 
 def format_duration(duration: timedelta) -> str:
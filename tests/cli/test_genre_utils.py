@@ -1,5 +1,6 @@
 """Tests for genre utilities"""
 
+import os
 import pytest
 from pathlib import Path
 
@@ -105,6 +106,20 @@ class TestGetGenresFromPlaylists:
         genres = get_genres_from_playlists(tmp_path)
         assert genres == {"rock": 1, "jazz": 1}
     
+    def test_hidden_directories_skipped(self, tmp_path):
+        """Test that hidden directories such as .git are not scanned"""
+        user_dir = tmp_path / "User1"
+        user_dir.mkdir()
+        hidden_dir = tmp_path / ".git"
+        hidden_dir.mkdir()
+        
+        (user_dir / "playlist1.yaml").write_text("genre: rock\n")
+        (user_dir / "notes.txt").write_text("genre: pop\n")
+        (hidden_dir / "playlist2.yaml").write_text("genre: jazz\n")
+        
+        genres = get_genres_from_playlists(tmp_path)
+        assert genres == {"rock": 1}
+    
     def test_invalid_yaml_skipped(self, tmp_path):
         """Test that invalid YAML files are skipped"""
         user_dir = tmp_path / "TestUser"
@@ -119,6 +134,53 @@ class TestGetGenresFromPlaylists:
         genres = get_genres_from_playlists(tmp_path)
         assert genres == {"rock": 1}
     
+    def test_plain_genre_line_counted_in_invalid_yaml(self, tmp_path):
+        """Test that a plain genre line is counted without parsing the rest of the file"""
+        user_dir = tmp_path / "TestUser"
+        user_dir.mkdir()
+        
+        (user_dir / "broken.yaml").write_text("genre: rock\nplaylist: [unclosed\n")
+        (user_dir / "quoted.yaml").write_text('genre: "jazz"\nplaylist: [unclosed\n')
+        
+        genres = get_genres_from_playlists(tmp_path)
+        assert genres == {"rock": 1}
+    
+    def test_quoted_and_commented_genres(self, tmp_path):
+        """Test genres that need the full YAML parser"""
+        user_dir = tmp_path / "TestUser"
+        user_dir.mkdir()
+        
+        (user_dir / "quoted.yaml").write_text('genre: "Hip Hop"\n')
+        (user_dir / "comment.yaml").write_text("genre: hip hop  # old school\n")
+        (user_dir / "unicode.yaml").write_text("genre: Électronique\n", encoding="utf-8")
+        
+        genres = get_genres_from_playlists(tmp_path)
+        assert genres == {"hip hop": 2, "électronique": 1}
+    
+    def test_non_string_genre_skipped(self, tmp_path):
+        """Test that genres YAML reads as numbers or booleans are skipped"""
+        user_dir = tmp_path / "TestUser"
+        user_dir.mkdir()
+        
+        (user_dir / "number.yaml").write_text("genre: 1990\n")
+        (user_dir / "bool.yaml").write_text("genre: Yes\n")
+        (user_dir / "valid.yaml").write_text("genre: rock 'n' roll\n")
+        
+        genres = get_genres_from_playlists(tmp_path)
+        assert genres == {"rock 'n' roll": 1}
+    
+    def test_nested_genre_key_ignored(self, tmp_path):
+        """Test that only the top-level genre field is used"""
+        user_dir = tmp_path / "TestUser"
+        user_dir.mkdir()
+        
+        (user_dir / "playlist.yaml").write_text(
+            "title: Test\nmeta:\n  genre: jazz\ngenre: rock\n"
+        )
+        
+        genres = get_genres_from_playlists(tmp_path)
+        assert genres == {"rock": 1}
+    
     def test_missing_genre_field_skipped(self, tmp_path):
         """Test that files without genre field are skipped"""
         user_dir = tmp_path / "TestUser"
@@ -135,6 +197,55 @@ class TestGetGenresFromPlaylists:
         assert genres == {"rock": 1}
 
 
+class TestGenreIndex:
+    """Test reusing genres from the genre index"""
+    
+    def test_unchanged_files_not_reread(self, tmp_path, mocker):
+        """Test that files matching the index are not read again"""
+        playlists_dir = tmp_path / "mixdiscs"
+        user_dir = playlists_dir / "User"
+        user_dir.mkdir(parents=True)
+        (user_dir / "p1.yaml").write_text("genre: rock\n")
+        index_path = tmp_path / "cache" / "genre_index.json"
+        
+        assert get_genres_from_playlists(playlists_dir, index_path) == {"rock": 1}
+        assert index_path.exists()
+        
+        read_genre = mocker.patch("mixdiscer.cli.genre_utils._read_genre")
+        assert get_genres_from_playlists(playlists_dir, index_path) == {"rock": 1}
+        read_genre.assert_not_called()
+    
+    def test_changed_and_removed_files_detected(self, tmp_path):
+        """Test that edits, additions and deletions are picked up"""
+        playlists_dir = tmp_path / "mixdiscs"
+        user_dir = playlists_dir / "User"
+        user_dir.mkdir(parents=True)
+        (user_dir / "p1.yaml").write_text("genre: rock\n")
+        (user_dir / "p2.yaml").write_text("genre: pop\n")
+        index_path = tmp_path / "genre_index.json"
+        get_genres_from_playlists(playlists_dir, index_path)
+        
+        edited = user_dir / "p1.yaml"
+        edited.write_text("genre: jazzz\n")
+        os.utime(edited, ns=(1, 1))
+        (user_dir / "p2.yaml").unlink()
+        (user_dir / "p3.yaml").write_text("genre: blues\n")
+        
+        genres = get_genres_from_playlists(playlists_dir, index_path)
+        assert genres == {"jazzz": 1, "blues": 1}
+    
+    def test_corrupt_index_ignored(self, tmp_path):
+        """Test that an unreadable index falls back to scanning"""
+        user_dir = tmp_path / "mixdiscs" / "User"
+        user_dir.mkdir(parents=True)
+        (user_dir / "p1.yaml").write_text("genre: rock\n")
+        index_path = tmp_path / "genre_index.json"
+        index_path.write_text("{ not json")
+        
+        genres = get_genres_from_playlists(tmp_path / "mixdiscs", index_path)
+        assert genres == {"rock": 1}
+
+
 class TestGetSuggestedGenres:
     """Test getting suggested genres"""
     
@@ -1,8 +1,11 @@
 """Tests for CLI validators"""
 
+import re
 import pytest
 from pathlib import Path
+from re import _constants as sre_constants, _parser as sre_parser
 
+from mixdiscer.cli import validators
 from mixdiscer.cli.validators import (
     validate_username,
     validate_title,
@@ -11,26 +14,65 @@ from mixdiscer.cli.validators import (
     sanitize_filename,
     validate_description,
     validate_genre,
+    MAX_FILENAME_STEM_LENGTH,
 )
 
+# Every compiled pattern in the validators module, so new ones are checked too
+_VALIDATOR_PATTERNS = {
+    name: value for name, value in vars(validators).items() if isinstance(value, re.Pattern)
+}
+_REPEAT_OPS = (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT, sre_constants.POSSESSIVE_REPEAT)
+
+
+def _backtracking_risks(pattern: str) -> list[str]:
+    """
+    Find the constructs that can make a backtracking engine take exponential
+    time: a repeat nested inside another unbounded repeat, or an alternation
+    inside one.
+    
+    Args:
+        pattern: Regular expression source
+    
+    Returns:
+        Description of each risky construct found, empty if there are none
+    """
+    risks = []
+    
+    def walk(node, in_repeat: bool) -> None:
+        for op, av in node:
+            if op in _REPEAT_OPS:
+                low, high, sub = av
+                if in_repeat and high > 1:
+                    risks.append(f"nested repeat {{{low},{high}}}")
+                walk(sub, in_repeat or high == sre_constants.MAXREPEAT)
+                continue
+            if op is sre_constants.BRANCH and in_repeat:
+                risks.append("alternation inside a repeat")
+            for value in av if isinstance(av, (tuple, list)) else (av,):
+                for item in value if isinstance(value, list) else (value,):
+                    if isinstance(item, sre_parser.SubPattern):
+                        walk(item, in_repeat)
+    
+    walk(sre_parser.parse(pattern), False)
+    return risks
+
 
 class TestValidateUsername:
     """Test username validation"""
     
-    def test_valid_usernames(self):
+    @pytest.mark.parametrize("username", [
+        "user123",
+        "User_Name",
+        "User-Name",
+        "abc",
+        "A1B",  # Changed from "A1" (too short)
+        "user_123-test",
+    ])
+    def test_valid_usernames(self, username):
         """Test valid username formats"""
-        valid_names = [
-            "user123",
-            "User_Name",
-            "User-Name",
-            "abc",
-            "A1B",  # Changed from "A1" (too short)
-            "user_123-test",
-        ]
-        for username in valid_names:
-            is_valid, error = validate_username(username)
-            assert is_valid, f"{username} should be valid, got: {error}"
-            assert error is None
+        is_valid, error = validate_username(username)
+        assert is_valid, f"{username} should be valid, got: {error}"
+        assert error is None
     
     def test_empty_username(self):
         """Test empty username"""
@@ -50,35 +92,39 @@ class TestValidateUsername:
         assert not is_valid
         assert "at most 30" in error
     
-    def test_invalid_characters(self):
+    @pytest.mark.parametrize("username", [
+        "user name",  # space
+        "user@name",  # special char
+        "user.name",  # period
+        "_username",  # starts with underscore
+        "-username",  # starts with dash
+    ])
+    def test_invalid_characters(self, username):
         """Test invalid characters in username"""
-        invalid_names = [
-            "user name",  # space
-            "user@name",  # special char
-            "user.name",  # period
-            "_username",  # starts with underscore
-            "-username",  # starts with dash
-        ]
-        for username in invalid_names:
-            is_valid, error = validate_username(username)
-            assert not is_valid, f"{username} should be invalid"
+        is_valid, error = validate_username(username)
+        assert not is_valid, f"{username} should be invalid"
+    
+    @pytest.mark.parametrize("username", ["usér", "ünicode", "user\n"])
+    def test_non_ascii_and_trailing_newline(self, username):
+        """Test non-ASCII letters and trailing newlines are rejected"""
+        is_valid, error = validate_username(username)
+        assert not is_valid, f"{username!r} should be invalid"
 
 
 class TestValidateTitle:
     """Test title validation"""
     
-    def test_valid_titles(self):
+    @pytest.mark.parametrize("title", [
+        "My Playlist",
+        "Summer Vibes 2024",
+        "Rock & Roll",
+        "A",
+        "x" * 100,
+    ])
+    def test_valid_titles(self, title):
         """Test valid titles"""
-        valid_titles = [
-            "My Playlist",
-            "Summer Vibes 2024",
-            "Rock & Roll",
-            "A",
-            "x" * 100,
-        ]
-        for title in valid_titles:
-            is_valid, error = validate_title(title)
-            assert is_valid, f"{title} should be valid, got: {error}"
+        is_valid, error = validate_title(title)
+        assert is_valid, f"{title} should be valid, got: {error}"
     
     def test_empty_title(self):
         """Test empty title"""
@@ -134,33 +180,31 @@ class TestValidateTitleUniqueness:
 class TestValidateSpotifyURL:
     """Test Spotify URL validation"""
     
-    def test_valid_urls(self):
+    @pytest.mark.parametrize("url", [
+        "https://open.spotify.com/playlist/37i9dQZF1DXcBWIGoYBM5M",
+        "http://open.spotify.com/playlist/123abc",
+        "spotify:playlist:37i9dQZF1DXcBWIGoYBM5M",
+    ])
+    def test_valid_urls(self, url):
         """Test valid Spotify URLs"""
-        valid_urls = [
-            "https://open.spotify.com/playlist/37i9dQZF1DXcBWIGoYBM5M",
-            "http://open.spotify.com/playlist/123abc",
-            "spotify:playlist:37i9dQZF1DXcBWIGoYBM5M",
-        ]
-        for url in valid_urls:
-            is_valid, error = validate_spotify_url(url)
-            assert is_valid, f"{url} should be valid, got: {error}"
+        is_valid, error = validate_spotify_url(url)
+        assert is_valid, f"{url} should be valid, got: {error}"
     
     def test_empty_url(self):
         """Test empty URL"""
         is_valid, error = validate_spotify_url("")
         assert not is_valid
     
-    def test_invalid_urls(self):
+    @pytest.mark.parametrize("url", [
+        "https://google.com",
+        "https://spotify.com/playlist/123",
+        "not a url",
+        "spotify:track:123",
+    ])
+    def test_invalid_urls(self, url):
         """Test invalid URLs"""
-        invalid_urls = [
-            "https://google.com",
-            "https://spotify.com/playlist/123",
-            "not a url",
-            "spotify:track:123",
-        ]
-        for url in invalid_urls:
-            is_valid, error = validate_spotify_url(url)
-            assert not is_valid, f"{url} should be invalid"
+        is_valid, error = validate_spotify_url(url)
+        assert not is_valid, f"{url} should be invalid"
 
 
 class TestSanitizeFilename:
@@ -181,17 +225,50 @@ class TestSanitizeFilename:
         """Test collapsing multiple spaces and dashes"""
         assert sanitize_filename("Too   Many    Spaces") == "Too Many Spaces"
         assert sanitize_filename("Too---Many---Dashes") == "Too-Many-Dashes"
+        assert sanitize_filename("Mixed\t Runs//Here") == "Mixed Runs-Here"
+    
+    def test_truncates_long_names(self):
+        """Test long names are truncated to leave room for the extension"""
+        result = sanitize_filename("x" * 1000)
+        assert len(result) == MAX_FILENAME_STEM_LENGTH
+        assert len(f"{result}.yaml") == 255
+    
+    @pytest.mark.parametrize("name, expected", [
+        ("é" * 200, "é" * 125),
+        ("a" + "é" * 200, "a" + "é" * 124),
+        ("x" * 248 + " é", "x" * 248),
+    ])
+    def test_truncates_on_encoded_length(self, name, expected):
+        """Test non-ASCII names are cut to the byte limit without splitting a character"""
+        result = sanitize_filename(name)
+        
+        assert result == expected
+        assert len(f"{result}.yaml".encode('utf-8')) <= 255
+    
+    @pytest.mark.parametrize("cut", [" ", "-", " /", "/ "])
+    def test_truncation_strips_trailing_separators(self, cut):
+        """Test that a space or dash at the truncation point is removed"""
+        name = "x" * (MAX_FILENAME_STEM_LENGTH - len(cut)) + cut + "tail"
+        
+        assert sanitize_filename(name) == "x" * (MAX_FILENAME_STEM_LENGTH - len(cut))
+
+    @pytest.mark.parametrize("name, expected", [
+        ("a" + " " * 300 + "b", "a b"),
+        ("x" + "-" * 300 + "tail", "x-tail"),
+    ])
+    def test_collapses_runs_before_truncating(self, name, expected):
+        """Test that a name which fits once runs are collapsed is not truncated"""
+        assert sanitize_filename(name) == expected
 
 
 class TestValidateDescription:
     """Test description validation"""
     
-    def test_valid_descriptions(self):
+    @pytest.mark.parametrize("desc", ["Short desc", "A" * 500])
+    def test_valid_descriptions(self, desc):
         """Test valid descriptions"""
-        valid = ["Short desc", "A" * 500]
-        for desc in valid:
-            is_valid, error = validate_description(desc)
-            assert is_valid
+        is_valid, error = validate_description(desc)
+        assert is_valid
     
     def test_empty_description(self):
         """Test empty description"""
@@ -208,12 +285,11 @@ class TestValidateDescription:
 class TestValidateGenre:
     """Test genre validation"""
     
-    def test_valid_genres(self):
+    @pytest.mark.parametrize("genre", ["rock", "hip-hop", "Electronic Dance"])
+    def test_valid_genres(self, genre):
         """Test valid genres"""
-        valid = ["rock", "hip-hop", "Electronic Dance"]
-        for genre in valid:
-            is_valid, error = validate_genre(genre)
-            assert is_valid, f"{genre} should be valid, got: {error}"
+        is_valid, error = validate_genre(genre)
+        assert is_valid, f"{genre} should be valid, got: {error}"
     
     def test_empty_genre(self):
         """Test empty genre"""
@@ -224,8 +300,24 @@ class TestValidateGenre:
         """Test invalid characters in genre"""
         is_valid, error = validate_genre("rock/pop")
         assert not is_valid
+        is_valid, error = validate_genre("rôck")
+        assert not is_valid
     
     def test_too_long(self):
         """Test genre too long"""
         is_valid, error = validate_genre("x" * 51)
         assert not is_valid
+
+
+class TestValidatorRegexes:
+    """Test the validator patterns cannot backtrack catastrophically"""
+    
+    @pytest.mark.parametrize("name", sorted(_VALIDATOR_PATTERNS))
+    def test_no_nested_repeats(self, name):
+        """Test that no repeat is nested in, or alternated under, another repeat"""
+        assert _backtracking_risks(_VALIDATOR_PATTERNS[name].pattern) == []
+    
+    @pytest.mark.parametrize("pattern", [r"(a+)+$", r"(\s*-?)*x", r"(?:a|ab)*c"])
+    def test_flags_ambiguous_patterns(self, pattern):
+        """Test that the structural check catches the classic ReDoS shapes"""
+        assert _backtracking_risks(pattern)
@@ -1,13 +1,106 @@
 """ Shared pytest fixtures for all tests """
 
+import copy
+import json
+import os
 import pytest
+import yaml
+from collections import Counter
 from pathlib import Path
 from datetime import timedelta
 from typing import Optional
 
+from mixdiscer.main import _get_music_service
 from mixdiscer.playlists import Playlist
 from mixdiscer.music_service import Track, MusicServicePlaylist
 
+SHM_DIR = "/dev/shm"
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    """Keep tmp_path files in memory by rooting pytest's temp directories on tmpfs where available
+
+    Only the root moves: pytest still creates a numbered directory per run
+    under it, so concurrent runs do not collide and recent runs are kept.
+    An explicit --basetemp or PYTEST_DEBUG_TEMPROOT takes precedence.
+    """
+    if config.option.basetemp or "PYTEST_DEBUG_TEMPROOT" in os.environ:
+        return
+    if os.path.isdir(SHM_DIR) and os.access(SHM_DIR, os.W_OK):
+        os.environ["PYTEST_DEBUG_TEMPROOT"] = SHM_DIR
+
+
+def pytest_report_header(config):
+    """Report whether YAML files are parsed with libyaml or the pure Python loader"""
+    if yaml.__with_libyaml__:
+        return "yaml: libyaml (CSafeLoader)"
+    return "yaml: pure Python SafeLoader (PyYAML built without libyaml, parsing will be slow)"
+
+
+class FakeSpotifyService:
+    """Lightweight stand-in for SpotifyMusicService in remote playlist tests
+
+    Returns the configured remote playlist and snapshot ID, and counts the
+    calls made to each method in `calls`.
+    """
+    name = "spotify"
+
+    def __init__(self, remote_playlist: Optional[MusicServicePlaylist] = None,
+                 snapshot_id: Optional[str] = None):
+        self.remote_playlist = remote_playlist
+        self.snapshot_id = snapshot_id
+        self.calls = Counter()
+
+    def fetch_remote_playlist(self, playlist_url: str) -> Optional[MusicServicePlaylist]:
+        self.calls['fetch_remote_playlist'] += 1
+        return self.remote_playlist
+
+    def get_playlist_snapshot(self, playlist_url: str) -> Optional[str]:
+        self.calls['get_playlist_snapshot'] += 1
+        return self.snapshot_id
+
+    def close(self) -> None:
+        self.calls['close'] += 1
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _isolated_cache_home(tmp_path_factory):
+    """Point XDG_CACHE_HOME at a per-session directory so tests never write to ~/.cache"""
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path_factory.mktemp("xdg-cache")))
+        yield
+
+
+@pytest.fixture(autouse=True)
+def _fresh_music_service():
+    """Stop a music service created (or patched in) by one test leaking into the next"""
+    _get_music_service.cache_clear()
+    yield
+    _get_music_service.cache_clear()
+
+
+@pytest.fixture
+def fake_spotify_service():
+    """Return a FakeSpotifyService with no remote playlist configured"""
+    return FakeSpotifyService()
+
+
+def _write_playlist(user_dir, name: str, body: str) -> Path:
+    """Write a playlist YAML file, creating the user directory if needed"""
+    os.makedirs(user_dir, exist_ok=True)
+    playlist_path = os.path.join(user_dir, name)
+    with open(playlist_path, "w", encoding="utf8") as playlist_file:
+        playlist_file.write(body)
+    return Path(playlist_path)
+
+
+@pytest.fixture
+def make_playlist():
+    """Return a helper that writes <user_dir>/<name> and returns its path"""
+    return _write_playlist
+
 
 @pytest.fixture
 def temp_mixdisc_dir(tmp_path):
@@ -25,11 +118,8 @@ def temp_mixdisc_dir(tmp_path):
 @pytest.fixture
 def sample_playlist(tmp_path):
     """Return a sample Playlist object with filepath"""
-    playlist_path = tmp_path / "TestUser" / "test_playlist.yaml"
-    playlist_path.parent.mkdir(parents=True, exist_ok=True)
-    
     # Create a dummy YAML file so filepath exists
-    playlist_path.write_text("""
+    playlist_path = _write_playlist(os.path.join(tmp_path, "TestUser"), "test_playlist.yaml", """
 user: TestUser
 title: Test Playlist
 description: A test playlist
@@ -52,7 +142,27 @@ playlist:
     )
 
 
+@pytest.fixture(scope="session")
+def stub_playlist_file(tmp_path_factory):
+    """Return a placeholder playlist file for tests that only need it to exist"""
+    playlist_path = tmp_path_factory.mktemp("mixdiscs") / "test.yaml"
+    playlist_path.write_text("test")
+    return playlist_path
+
+
+@pytest.fixture(scope="session")
+def frozen_entry_template():
+    """Load the frozen remote playlist cache entry from tests/fixtures once per session"""
+    return json.loads((FIXTURES_DIR / "frozen_entry.json").read_text())
+
+
 @pytest.fixture
+def frozen_entry(frozen_entry_template):
+    """Return a copy of the frozen cache entry, without user, title or filepath, for one test to modify"""
+    return copy.deepcopy(frozen_entry_template)
+
+
+@pytest.fixture(scope="session")
 def sample_track():
     """Return a sample Track object"""
     return Track(
@@ -64,10 +174,10 @@ def sample_track():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_tracks():
-    """Return a list of sample Track objects"""
-    return [
+    """Return a tuple of sample Track objects"""
+    return (
         Track(
             artist="Artist One",
             title="Song One",
@@ -89,17 +199,17 @@ def sample_tracks():
             duration=timedelta(minutes=2, seconds=45),
             link="https://example.com/track3"
         ),
-    ]
+    )
 
 
 @pytest.fixture
 def sample_music_service_playlist(sample_tracks):
     """Return a sample MusicServicePlaylist"""
-    total_duration = sum((t.duration for t in sample_tracks), timedelta())
+    total_seconds = sum(int(t.duration.total_seconds()) for t in sample_tracks)
     return MusicServicePlaylist(
         service_name="spotify",
-        tracks=sample_tracks,
-        total_duration=total_duration
+        tracks=list(sample_tracks),
+        total_duration=timedelta(seconds=total_seconds)
     )
 
 
@@ -135,7 +245,7 @@ track_cache_file: {cache_dir / "tracks_cache.json"}
 def empty_cache():
     """Return empty cache structure"""
     return {
-        'version': '1.0',
+        'version': '2.0',
         'last_updated': '2024-01-01T00:00:00+00:00',
         'playlists': {}
     }
@@ -1,43 +1,72 @@
 """Integration tests for remote playlist workflows"""
 
-import pytest
 import os
+import pytest
 from pathlib import Path
-from datetime import timedelta, datetime, timezone
-from unittest.mock import Mock, patch, MagicMock
+from datetime import timedelta
+from unittest.mock import patch
 
 from mixdiscer.main import render_all_playlists
-from mixdiscer.playlists import Playlist, load_playlist
+from mixdiscer.playlists import load_playlist
 from mixdiscer.music_service import MusicServicePlaylist, Track
 from mixdiscer.music_service.spotify import SpotifyTrack
 
 
-@pytest.fixture
-def integration_config(tmp_path):
-    """Create a complete test configuration for integration testing"""
-    mixdisc_dir = tmp_path / "mixdiscs"
-    mixdisc_dir.mkdir()
-    template_dir = Path("templates")  # Use real templates
-    output_dir = tmp_path / "output"
-    output_dir.mkdir()
-    cache_dir = tmp_path / ".cache"
-    cache_dir.mkdir()
-    
-    config_path = tmp_path / "config.yaml"
-    config_path.write_text(f"""
+REMOTE_PLAYLIST_YAML = """
+user: {user}
+title: {title}
+description: {description}
+genre: {genre}
+remote_playlist: {remote_playlist}
+"""
+
+MANUAL_PLAYLIST_YAML = """
+user: {user}
+title: {title}
+description: {description}
+genre: {genre}
+playlist:
+  - {track}
+"""
+
+# Use the real templates
+TEMPLATE_DIR = Path("templates").resolve()
+
+INTEGRATION_CONFIG_TEMPLATE = """
 mixdisc_directory: {mixdisc_dir}
 playlist_duration_threshold_mins: 80
 template_directory: {template_dir}
 output_directory: {output_dir}
-cache_file: {cache_dir / "playlists_cache.json"}
-track_cache_file: {cache_dir / "tracks_cache.json"}
-""")
+cache_file: {cache_dir}/playlists_cache.json
+track_cache_file: {cache_dir}/tracks_cache.json
+"""
+
+
+@pytest.fixture
+def integration_config(tmp_path):
+    """Create a complete test configuration for integration testing"""
+    # Paths are built as strings and only wrapped in Path for the tests
+    base_dir = str(tmp_path)
+    mixdisc_dir = os.path.join(base_dir, "mixdiscs")
+    os.mkdir(mixdisc_dir)
+    # The output and cache directories are created when first written to
+    output_dir = os.path.join(base_dir, "output")
+    cache_dir = os.path.join(base_dir, ".cache")
+    
+    config_path = os.path.join(base_dir, "config.yaml")
+    with open(config_path, "w", encoding="utf8") as config_file:
+        config_file.write(INTEGRATION_CONFIG_TEMPLATE.format(
+            mixdisc_dir=mixdisc_dir,
+            template_dir=TEMPLATE_DIR,
+            output_dir=output_dir,
+            cache_dir=cache_dir,
+        ))
     return {
-        'config_path': config_path,
-        'mixdisc_dir': mixdisc_dir,
-        'output_dir': output_dir,
-        'cache_dir': cache_dir,
-        'template_dir': template_dir
+        'config_path': Path(config_path),
+        'mixdisc_dir': Path(mixdisc_dir),
+        'output_dir': Path(output_dir),
+        'cache_dir': Path(cache_dir),
+        'template_dir': TEMPLATE_DIR
     }
 
 
@@ -45,254 +74,223 @@ track_cache_file: {cache_dir / "tracks_cache.json"}
 class TestRemotePlaylistWorkflow:
     """Integration tests for remote playlist end-to-end workflows"""
 
-    def test_new_remote_playlist_full_workflow(self, integration_config):
+    @pytest.fixture(autouse=True)
+    def _spotify_env(self, monkeypatch, fake_spotify_service):
+        """Provide Spotify credentials and a fake Spotify service"""
+        monkeypatch.setenv('SPOTIPY_CLIENT_ID', 'test_id')
+        monkeypatch.setenv('SPOTIPY_CLIENT_SECRET', 'test_secret')
+        self.spotify = fake_spotify_service
+        with patch('mixdiscer.main.SpotifyMusicService', return_value=self.spotify):
+            yield
+
+    def test_new_remote_playlist_full_workflow(self, integration_config, make_playlist):
         """Test complete workflow: YAML -> fetch -> cache -> render"""
         
         # Step 1: Create a remote playlist YAML file
         user_dir = integration_config['mixdisc_dir'] / "TestUser"
-        user_dir.mkdir(parents=True)
+        make_playlist(user_dir, "remote-playlist.yaml", REMOTE_PLAYLIST_YAML.format(
+            user="TestUser",
+            title="My Spotify Playlist",
+            description="A test remote playlist",
+            genre="electronic",
+            remote_playlist="https://open.spotify.com/playlist/37i9dQZF1DXcBWIGoYBM5M"
+        ))
         
-        playlist_file = user_dir / "remote-playlist.yaml"
-        playlist_file.write_text("""
-user: TestUser
-title: My Spotify Playlist
-description: A test remote playlist
-genre: electronic
-remote_playlist: https://open.spotify.com/playlist/37i9dQZF1DXcBWIGoYBM5M
-""")
+        # Step 2: Set the playlist the fake Spotify service returns
+        test_tracks = [
+            SpotifyTrack(
+                artist=f"Artist {i}",
+                title=f"Song {i}",
+                album=f"Album {i}",
+                duration=timedelta(minutes=3),
+                link=f"http://spotify.com/track{i}",
+                uri=f"spotify:track:id{i}",
+                track_id=f"id{i}"
+            )
+            for i in range(5)
+        ]
+        
+        remote_result = MusicServicePlaylist(
+            service_name="spotify",
+            tracks=test_tracks,
+            total_duration=timedelta(minutes=15)
+        )
+        
+        self.spotify.remote_playlist = remote_result
+        self.spotify.snapshot_id = "snapshot123"
+        
+        # Step 3: Run render
+        render_all_playlists(str(integration_config['config_path']), use_cache=True)
+        
+        # Step 4: Verify outputs
+        output_dir = integration_config['output_dir']
+        
+        # Check main index exists
+        assert (output_dir / "index.html").exists()
+        index_content = (output_dir / "index.html").read_text()
+        assert "My Spotify Playlist" in index_content
+        assert "TestUser" in index_content
+        assert "🔗 Remote" in index_content or "Remote" in index_content
         
-        # Step 2: Mock Spotify service
-        with patch.dict(os.environ, {
-            'SPOTIPY_CLIENT_ID': 'test_id',
-            'SPOTIPY_CLIENT_SECRET': 'test_secret'
-        }):
-            with patch('mixdiscer.main.SpotifyMusicService') as mock_service_class:
-                mock_service = Mock()
-                mock_service.name = "spotify"
-                mock_service_class.return_value = mock_service
-                
-                # Mock fetch_remote_playlist
-                test_tracks = [
-                    SpotifyTrack(
-                        artist=f"Artist {i}",
-                        title=f"Song {i}",
-                        album=f"Album {i}",
-                        duration=timedelta(minutes=3),
-                        link=f"http://spotify.com/track{i}",
-                        uri=f"spotify:track:id{i}",
-                        track_id=f"id{i}"
-                    )
-                    for i in range(5)
-                ]
-                
-                remote_result = MusicServicePlaylist(
-                    service_name="spotify",
-                    tracks=test_tracks,
-                    total_duration=timedelta(minutes=15)
-                )
-                
-                mock_service.fetch_remote_playlist = Mock(return_value=remote_result)
-                mock_service.get_playlist_snapshot = Mock(return_value="snapshot123")
-                
-                # Step 3: Run render
-                render_all_playlists(str(integration_config['config_path']), use_cache=True)
-                
-                # Step 4: Verify outputs
-                output_dir = integration_config['output_dir']
-                
-                # Check main index exists
-                assert (output_dir / "index.html").exists()
-                index_content = (output_dir / "index.html").read_text()
-                assert "My Spotify Playlist" in index_content
-                assert "TestUser" in index_content
-                assert "🔗 Remote" in index_content or "Remote" in index_content
-                
-                # Check frozen playlists page exists (should be empty)
-                assert (output_dir / "frozen-playlists.html").exists()
-                frozen_content = (output_dir / "frozen-playlists.html").read_text()
-                assert "No frozen playlists" in frozen_content or "no frozen" in frozen_content.lower()
-                
-                # Check cache was created
-                cache_file = integration_config['cache_dir'] / "playlists_cache.json"
-                assert cache_file.exists()
-                
-                # Verify fetch was called
-                mock_service.fetch_remote_playlist.assert_called_once()
-                mock_service.get_playlist_snapshot.assert_called_once()
+        # Check frozen playlists page exists (should be empty)
+        assert (output_dir / "frozen-playlists.html").exists()
+        frozen_content = (output_dir / "frozen-playlists.html").read_text()
+        assert "No frozen playlists" in frozen_content or "no frozen" in frozen_content.lower()
+        
+        # Check cache was created
+        cache_file = integration_config['cache_dir'] / "playlists_cache.json"
+        assert cache_file.exists()
+        
+        # Verify fetch was called
+        assert self.spotify.calls['fetch_remote_playlist'] == 1
+        assert self.spotify.calls['get_playlist_snapshot'] == 1
 
     # NOTE: Mixed manual+remote test omitted
     # This complex mocking scenario is better suited for manual testing
     # Both manual and remote playlists work individually (tested)
     # and the rendering loop processes them independently.
 
-    def test_frozen_playlist_workflow(self, integration_config):
+    def test_frozen_playlist_workflow(self, integration_config, make_playlist):
         """Test workflow when remote playlist exceeds duration"""
         
         user_dir = integration_config['mixdisc_dir'] / "TestUser"
-        user_dir.mkdir(parents=True)
+        make_playlist(user_dir, "big-playlist.yaml", REMOTE_PLAYLIST_YAML.format(
+            user="TestUser",
+            title="Big Playlist",
+            description="This will be too long",
+            genre="rock",
+            remote_playlist="https://open.spotify.com/playlist/bigone"
+        ))
         
-        playlist_file = user_dir / "big-playlist.yaml"
-        playlist_file.write_text("""
-user: TestUser
-title: Big Playlist
-description: This will be too long
-genre: rock
-remote_playlist: https://open.spotify.com/playlist/bigone
-""")
+        # First render: valid playlist
+        valid_tracks = [
+            SpotifyTrack(
+                artist=f"Artist {i}",
+                title=f"Song {i}",
+                album="Album",
+                duration=timedelta(minutes=3),
+                link=f"http://track{i}",
+                uri=f"spotify:track:id{i}",
+                track_id=f"id{i}"
+            )
+            for i in range(20)  # 60 minutes total
+        ]
+        
+        valid_result = MusicServicePlaylist(
+            service_name="spotify",
+            tracks=valid_tracks,
+            total_duration=timedelta(minutes=60)
+        )
+        
+        self.spotify.remote_playlist = valid_result
+        self.spotify.snapshot_id = "snapshot_old"
+        
+        # First render
+        render_all_playlists(str(integration_config['config_path']), use_cache=True)
         
-        with patch.dict(os.environ, {
-            'SPOTIPY_CLIENT_ID': 'test_id',
-            'SPOTIPY_CLIENT_SECRET': 'test_secret'
-        }):
-            with patch('mixdiscer.main.SpotifyMusicService') as mock_service_class:
-                mock_service = Mock()
-                mock_service.name = "spotify"
-                mock_service_class.return_value = mock_service
-                
-                # First render: valid playlist
-                valid_tracks = [
-                    SpotifyTrack(
-                        artist=f"Artist {i}",
-                        title=f"Song {i}",
-                        album="Album",
-                        duration=timedelta(minutes=3),
-                        link=f"http://track{i}",
-                        uri=f"spotify:track:id{i}",
-                        track_id=f"id{i}"
-                    )
-                    for i in range(20)  # 60 minutes total
-                ]
-                
-                valid_result = MusicServicePlaylist(
-                    service_name="spotify",
-                    tracks=valid_tracks,
-                    total_duration=timedelta(minutes=60)
-                )
-                
-                mock_service.fetch_remote_playlist = Mock(return_value=valid_result)
-                mock_service.get_playlist_snapshot = Mock(return_value="snapshot_old")
-                
-                # First render
-                render_all_playlists(str(integration_config['config_path']), use_cache=True)
-                
-                # Verify no frozen playlists
-                frozen_content = (integration_config['output_dir'] / "frozen-playlists.html").read_text()
-                assert "No frozen playlists" in frozen_content or "no frozen" in frozen_content.lower()
-                
-                # Second render: playlist now exceeds duration
-                overlong_tracks = [
-                    SpotifyTrack(
-                        artist=f"Artist {i}",
-                        title=f"Song {i}",
-                        album="Album",
-                        duration=timedelta(minutes=5),
-                        link=f"http://track{i}",
-                        uri=f"spotify:track:id{i}",
-                        track_id=f"id{i}"
-                    )
-                    for i in range(20)  # 100 minutes total
-                ]
-                
-                overlong_result = MusicServicePlaylist(
-                    service_name="spotify",
-                    tracks=overlong_tracks,
-                    total_duration=timedelta(minutes=100)
-                )
-                
-                mock_service.fetch_remote_playlist = Mock(return_value=overlong_result)
-                mock_service.get_playlist_snapshot = Mock(return_value="snapshot_new")
-                
-                # Second render (should freeze)
-                render_all_playlists(str(integration_config['config_path']), use_cache=True)
-                
-                # Verify frozen playlist appears
-                frozen_content = (integration_config['output_dir'] / "frozen-playlists.html").read_text()
-                assert "Big Playlist" in frozen_content
-                assert "FROZEN" in frozen_content or "frozen" in frozen_content.lower()
-                
-                # Check main index has warning
-                index_content = (integration_config['output_dir'] / "index.html").read_text()
-                assert "⚠️" in index_content or "warning" in index_content.lower()
+        # Verify no frozen playlists
+        frozen_content = (integration_config['output_dir'] / "frozen-playlists.html").read_text()
+        assert "No frozen playlists" in frozen_content or "no frozen" in frozen_content.lower()
+        
+        # Second render: playlist now exceeds duration
+        overlong_tracks = [
+            SpotifyTrack(
+                artist=f"Artist {i}",
+                title=f"Song {i}",
+                album="Album",
+                duration=timedelta(minutes=5),
+                link=f"http://track{i}",
+                uri=f"spotify:track:id{i}",
+                track_id=f"id{i}"
+            )
+            for i in range(20)  # 100 minutes total
+        ]
+        
+        overlong_result = MusicServicePlaylist(
+            service_name="spotify",
+            tracks=overlong_tracks,
+            total_duration=timedelta(minutes=100)
+        )
+        
+        self.spotify.remote_playlist = overlong_result
+        self.spotify.snapshot_id = "snapshot_new"
+        
+        # Second render (should freeze)
+        render_all_playlists(str(integration_config['config_path']), use_cache=True)
+        
+        # Verify frozen playlist appears
+        frozen_content = (integration_config['output_dir'] / "frozen-playlists.html").read_text()
+        assert "Big Playlist" in frozen_content
+        assert "FROZEN" in frozen_content or "frozen" in frozen_content.lower()
+        
+        # Check main index has warning
+        index_content = (integration_config['output_dir'] / "index.html").read_text()
+        assert "⚠️" in index_content or "warning" in index_content.lower()
 
-    def test_cache_persistence_across_renders(self, integration_config):
+    def test_cache_persistence_across_renders(self, integration_config, make_playlist):
         """Test that cache persists and is used across multiple renders"""
         
         user_dir = integration_config['mixdisc_dir'] / "TestUser"
-        user_dir.mkdir(parents=True)
+        make_playlist(user_dir, "cached-playlist.yaml", REMOTE_PLAYLIST_YAML.format(
+            user="TestUser",
+            title="Cached Playlist",
+            description="Test caching",
+            genre="pop",
+            remote_playlist="https://open.spotify.com/playlist/cached123"
+        ))
         
-        playlist_file = user_dir / "cached-playlist.yaml"
-        playlist_file.write_text("""
-user: TestUser
-title: Cached Playlist
-description: Test caching
-genre: pop
-remote_playlist: https://open.spotify.com/playlist/cached123
-""")
+        test_tracks = [
+            SpotifyTrack(
+                artist="Artist",
+                title="Song",
+                album="Album",
+                duration=timedelta(minutes=3),
+                link="http://track",
+                uri="spotify:track:id",
+                track_id="id"
+            )
+        ]
         
-        with patch.dict(os.environ, {
-            'SPOTIPY_CLIENT_ID': 'test_id',
-            'SPOTIPY_CLIENT_SECRET': 'test_secret'
-        }):
-            with patch('mixdiscer.main.SpotifyMusicService') as mock_service_class:
-                mock_service = Mock()
-                mock_service.name = "spotify"
-                mock_service_class.return_value = mock_service
-                
-                test_tracks = [
-                    SpotifyTrack(
-                        artist="Artist",
-                        title="Song",
-                        album="Album",
-                        duration=timedelta(minutes=3),
-                        link="http://track",
-                        uri="spotify:track:id",
-                        track_id="id"
-                    )
-                ]
-                
-                result = MusicServicePlaylist(
-                    service_name="spotify",
-                    tracks=test_tracks,
-                    total_duration=timedelta(minutes=3)
-                )
-                
-                mock_service.fetch_remote_playlist = Mock(return_value=result)
-                mock_service.get_playlist_snapshot = Mock(return_value="snapshot123")
-                
-                # First render
-                render_all_playlists(str(integration_config['config_path']), use_cache=True)
-                
-                # Should call fetch once
-                assert mock_service.fetch_remote_playlist.call_count == 1
-                assert mock_service.get_playlist_snapshot.call_count == 1
-                
-                # Second render with same snapshot (cache hit)
-                mock_service.fetch_remote_playlist.reset_mock()
-                mock_service.get_playlist_snapshot.reset_mock()
-                
-                mock_service.get_playlist_snapshot = Mock(return_value="snapshot123")  # Same snapshot
-                
-                render_all_playlists(str(integration_config['config_path']), use_cache=True)
-                
-                # Should only check snapshot, not fetch
-                assert mock_service.get_playlist_snapshot.call_count == 1
-                assert mock_service.fetch_remote_playlist.call_count == 0  # Should use cache!
+        result = MusicServicePlaylist(
+            service_name="spotify",
+            tracks=test_tracks,
+            total_duration=timedelta(minutes=3)
+        )
+        
+        self.spotify.remote_playlist = result
+        self.spotify.snapshot_id = "snapshot123"
+        
+        # First render
+        render_all_playlists(str(integration_config['config_path']), use_cache=True)
+        
+        # Should call fetch once
+        assert self.spotify.calls['fetch_remote_playlist'] == 1
+        assert self.spotify.calls['get_playlist_snapshot'] == 1
+        
+        # Second render with same snapshot (cache hit)
+        self.spotify.calls.clear()
+        
+        self.spotify.snapshot_id = "snapshot123"  # Same snapshot
+        
+        render_all_playlists(str(integration_config['config_path']), use_cache=True)
+        
+        # Should only check snapshot, not fetch
+        assert self.spotify.calls['get_playlist_snapshot'] == 1
+        assert self.spotify.calls['fetch_remote_playlist'] == 0  # Should use cache!
 
-    def test_playlist_loading_validation(self, integration_config):
+    def test_playlist_loading_validation(self, integration_config, make_playlist):
         """Test that playlist loading validates remote vs manual correctly"""
         
         user_dir = integration_config['mixdisc_dir'] / "TestUser"
-        user_dir.mkdir(parents=True)
         
         # Test loading remote playlist
-        remote_file = user_dir / "remote.yaml"
-        remote_file.write_text("""
-user: TestUser
-title: Remote Test
-description: Test
-genre: rock
-remote_playlist: https://open.spotify.com/playlist/test123
-""")
+        remote_file = make_playlist(user_dir, "remote.yaml", REMOTE_PLAYLIST_YAML.format(
+            user="TestUser",
+            title="Remote Test",
+            description="Test",
+            genre="rock",
+            remote_playlist="https://open.spotify.com/playlist/test123"
+        ))
         
         playlist = load_playlist(remote_file, integration_config['mixdisc_dir'])
         assert playlist.remote_playlist == "https://open.spotify.com/playlist/test123"
@@ -300,15 +298,13 @@ remote_playlist: https://open.spotify.com/playlist/test123
         assert playlist.remote_service == "spotify"
         
         # Test loading manual playlist
-        manual_file = user_dir / "manual.yaml"
-        manual_file.write_text("""
-user: TestUser
-title: Manual Test
-description: Test
-genre: rock
-playlist:
-  - Artist - Song
-""")
+        manual_file = make_playlist(user_dir, "manual.yaml", MANUAL_PLAYLIST_YAML.format(
+            user="TestUser",
+            title="Manual Test",
+            description="Test",
+            genre="rock",
+            track="Artist - Song"
+        ))
         
         playlist = load_playlist(manual_file, integration_config['mixdisc_dir'])
         assert playlist.tracks is not None
@@ -320,34 +316,28 @@ playlist:
 class TestRemotePlaylistEdgeCases:
     """Integration tests for edge cases and error handling"""
 
-    def test_invalid_spotify_url_in_yaml(self, integration_config):
+    def test_invalid_spotify_url_in_yaml(self, integration_config, make_playlist):
         """Test that invalid Spotify URLs are caught during loading"""
         from mixdiscer.playlists import PlaylistValidationError
         
         user_dir = integration_config['mixdisc_dir'] / "TestUser"
-        user_dir.mkdir(parents=True)
-        
-        playlist_file = user_dir / "invalid.yaml"
-        playlist_file.write_text("""
-user: TestUser
-title: Invalid
-description: Test
-genre: rock
-remote_playlist: https://example.com/not-spotify
-""")
+        playlist_file = make_playlist(user_dir, "invalid.yaml", REMOTE_PLAYLIST_YAML.format(
+            user="TestUser",
+            title="Invalid",
+            description="Test",
+            genre="rock",
+            remote_playlist="https://example.com/not-spotify"
+        ))
         
         with pytest.raises(PlaylistValidationError):
             load_playlist(playlist_file, integration_config['mixdisc_dir'])
 
-    def test_both_playlist_types_in_yaml(self, integration_config):
+    def test_both_playlist_types_in_yaml(self, integration_config, make_playlist):
         """Test that having both playlist and remote_playlist raises error"""
         from mixdiscer.playlists import PlaylistValidationError
         
         user_dir = integration_config['mixdisc_dir'] / "TestUser"
-        user_dir.mkdir(parents=True)
-        
-        playlist_file = user_dir / "both.yaml"
-        playlist_file.write_text("""
+        playlist_file = make_playlist(user_dir, "both.yaml", """
 user: TestUser
 title: Both Types
 description: Test
@@ -2,25 +2,20 @@
 
 import pytest
 from pathlib import Path
+from types import MappingProxyType
 from datetime import timedelta
 from unittest.mock import Mock, patch
 
 from mixdiscer.main import validate_playlists_from_files
 from mixdiscer.playlists import Playlist
 from mixdiscer.music_service import MusicServicePlaylist, Track
+from mixdiscer.music_service.music_service import calculate_total_duration
 
 
-@pytest.mark.integration
-def test_validate_workflow_end_to_end(tmp_path, test_config):
-    """Test complete validation workflow from file to result"""
-    
-    # Create a test playlist file
-    mixdisc_dir = tmp_path / "mixdiscs"
-    user_dir = mixdisc_dir / "TestUser"
-    user_dir.mkdir(parents=True)
-    
-    playlist_file = user_dir / "test_playlist.yaml"
-    playlist_content = """
+# Playlist files shared by every test in this module, keyed by file name.
+# Validation only reads them, so they are written once per session.
+WORKFLOW_PLAYLISTS = MappingProxyType({
+    "test_playlist.yaml": """
 user: TestUser
 title: Test Playlist
 description: A test playlist for integration testing
@@ -29,8 +24,86 @@ playlist:
   - The Beatles - Hey Jude
   - Queen - Bohemian Rhapsody
   - Led Zeppelin - Stairway to Heaven
-"""
-    playlist_file.write_text(playlist_content)
+""",
+    "long_playlist.yaml": """
+user: TestUser
+title: Long Playlist
+description: This will be too long
+genre: Progressive Rock
+playlist:
+  - Long Song 1 - Track 1
+  - Long Song 2 - Track 2
+  - Long Song 3 - Track 3
+""",
+    "original.yaml": """
+user: TestUser
+title: My Playlist
+description: Original
+genre: Rock
+playlist:
+  - Artist - Song
+""",
+    # Same user/title as original.yaml
+    "duplicate.yaml": """
+user: TestUser
+title: My Playlist
+description: Duplicate with same title
+genre: Pop
+playlist:
+  - Different Artist - Different Song
+""",
+    "playlist_with_missing.yaml": """
+user: TestUser
+title: Playlist With Missing Tracks
+description: Some tracks won't be found
+genre: Electronic
+playlist:
+  - The Beatles - Hey Jude
+  - Nonexistent Artist - Fake Song
+  - Queen - Bohemian Rhapsody
+""",
+    "broken.yaml": "user: TestUser\ntitle: [unclosed\n",
+    "good.yaml": """
+user: TestUser
+title: Good Playlist
+description: Loads fine
+genre: Rock
+playlist:
+  - Artist - Song
+""",
+})
+
+
+@pytest.fixture(scope="session")
+def mixdisc_tree(tmp_path_factory):
+    """Write the workflow playlists and a config pointing at them once per session
+
+    Tests must treat the tree as read-only; copy it with shutil.copytree
+    before modifying any files.
+    """
+    root = tmp_path_factory.mktemp("validate_workflow")
+    user_dir = root / "mixdiscs" / "TestUser"
+    user_dir.mkdir(parents=True)
+    for name, content in WORKFLOW_PLAYLISTS.items():
+        (user_dir / name).write_text(content)
+
+    config_path = root / "test_config.yaml"
+    config_path.write_text(f"""
+mixdisc_directory: {root / "mixdiscs"}
+playlist_duration_threshold_mins: 80
+template_directory: {root / "templates"}
+output_directory: {root / "output"}
+cache_file: {root / ".cache" / "playlists_cache.json"}
+track_cache_file: {root / ".cache" / "tracks_cache.json"}
+""")
+    return MappingProxyType({'config': config_path, 'user_dir': user_dir})
+
+
+@pytest.mark.integration
+def test_validate_workflow_end_to_end(mixdisc_tree):
+    """Test complete validation workflow from file to result"""
+    
+    playlist_file = mixdisc_tree['user_dir'] / "test_playlist.yaml"
     
     # Mock the music service
     with patch('mixdiscer.main._get_music_service') as mock_get_service:
@@ -44,7 +117,7 @@ playlist:
             Track("Led Zeppelin", "Stairway to Heaven", "Led Zeppelin IV", timedelta(minutes=8, seconds=2), "link3"),
         ]
         
-        total_duration = sum((t.duration for t in mock_tracks), timedelta())
+        total_duration = calculate_total_duration(mock_tracks)
         
         mock_service_playlist = MusicServicePlaylist(
             service_name="spotify",
@@ -56,7 +129,7 @@ playlist:
         
         # Run validation
         results = validate_playlists_from_files(
-            str(test_config),
+            str(mixdisc_tree['config']),
             [playlist_file],
             update_cache=False
         )
@@ -73,26 +146,11 @@ playlist:
 
 
 @pytest.mark.integration
-def test_validate_workflow_invalid_playlist(tmp_path, test_config):
+def test_validate_workflow_invalid_playlist(mixdisc_tree):
     """Test validation workflow with invalid playlist"""
     
-    # Create a playlist that exceeds duration
-    mixdisc_dir = tmp_path / "mixdiscs"
-    user_dir = mixdisc_dir / "TestUser"
-    user_dir.mkdir(parents=True)
-    
-    playlist_file = user_dir / "long_playlist.yaml"
-    playlist_content = """
-user: TestUser
-title: Long Playlist
-description: This will be too long
-genre: Progressive Rock
-playlist:
-  - Long Song 1 - Track 1
-  - Long Song 2 - Track 2
-  - Long Song 3 - Track 3
-"""
-    playlist_file.write_text(playlist_content)
+    # A playlist that exceeds duration
+    playlist_file = mixdisc_tree['user_dir'] / "long_playlist.yaml"
     
     # Mock music service with long durations
     with patch('mixdiscer.main._get_music_service') as mock_get_service:
@@ -105,7 +163,7 @@ playlist:
             Track("Artist", "Track 3", "Album", timedelta(minutes=30), "link3"),
         ]
         
-        total_duration = sum((t.duration for t in mock_tracks), timedelta())
+        total_duration = calculate_total_duration(mock_tracks)
         
         mock_service_playlist = MusicServicePlaylist(
             service_name="spotify",
@@ -117,7 +175,7 @@ playlist:
         
         # Run validation
         results = validate_playlists_from_files(
-            str(test_config),
+            str(mixdisc_tree['config']),
             [playlist_file],
             update_cache=False
         )
@@ -132,36 +190,11 @@ playlist:
 
 
 @pytest.mark.integration
-def test_validate_workflow_duplicate_detection(tmp_path, test_config):
+def test_validate_workflow_duplicate_detection(mixdisc_tree):
     """Test that duplicate playlists are detected"""
     
-    mixdisc_dir = tmp_path / "mixdiscs"
-    user_dir = mixdisc_dir / "TestUser"
-    user_dir.mkdir(parents=True)
-    
-    # Create original playlist
-    original_file = user_dir / "original.yaml"
-    original_content = """
-user: TestUser
-title: My Playlist
-description: Original
-genre: Rock
-playlist:
-  - Artist - Song
-"""
-    original_file.write_text(original_content)
-    
-    # Create duplicate with same user/title
-    duplicate_file = user_dir / "duplicate.yaml"
-    duplicate_content = """
-user: TestUser
-title: My Playlist
-description: Duplicate with same title
-genre: Pop
-playlist:
-  - Different Artist - Different Song
-"""
-    duplicate_file.write_text(duplicate_content)
+    original_file = mixdisc_tree['user_dir'] / "original.yaml"
+    duplicate_file = mixdisc_tree['user_dir'] / "duplicate.yaml"
     
     # Mock music service
     with patch('mixdiscer.main._get_music_service') as mock_get_service:
@@ -171,7 +204,7 @@ playlist:
         
         # Validate only the duplicate file (original already exists)
         results = validate_playlists_from_files(
-            str(test_config),
+            str(mixdisc_tree['config']),
             [duplicate_file],
             update_cache=False
         )
@@ -184,25 +217,10 @@ playlist:
 
 
 @pytest.mark.integration
-def test_validate_workflow_with_missing_tracks(tmp_path, test_config):
+def test_validate_workflow_with_missing_tracks(mixdisc_tree):
     """Test validation when some tracks cannot be found"""
     
-    mixdisc_dir = tmp_path / "mixdiscs"
-    user_dir = mixdisc_dir / "TestUser"
-    user_dir.mkdir(parents=True)
-    
-    playlist_file = user_dir / "playlist_with_missing.yaml"
-    playlist_content = """
-user: TestUser
-title: Playlist With Missing Tracks
-description: Some tracks won't be found
-genre: Electronic
-playlist:
-  - The Beatles - Hey Jude
-  - Nonexistent Artist - Fake Song
-  - Queen - Bohemian Rhapsody
-"""
-    playlist_file.write_text(playlist_content)
+    playlist_file = mixdisc_tree['user_dir'] / "playlist_with_missing.yaml"
     
     # Mock music service
     with patch('mixdiscer.main._get_music_service') as mock_get_service:
@@ -228,7 +246,7 @@ playlist:
         
         # Run validation
         results = validate_playlists_from_files(
-            str(test_config),
+            str(mixdisc_tree['config']),
             [playlist_file],
             update_cache=False
         )
@@ -241,3 +259,35 @@ playlist:
         assert len(result.missing_tracks) == 1
         # missing_tracks is a list of tuples (artist, title, album)
         assert result.missing_tracks[0] == ("Nonexistent Artist", "Fake Song", None)
+
+
+@pytest.mark.integration
+def test_validate_workflow_failed_load_keeps_file_mapping(mixdisc_tree):
+    """Test that a file failing to load does not shift results onto other files"""
+    
+    broken_file = mixdisc_tree['user_dir'] / "broken.yaml"
+    playlist_file = mixdisc_tree['user_dir'] / "good.yaml"
+    
+    with patch('mixdiscer.main._get_music_service') as mock_get_service:
+        mock_service = Mock()
+        mock_service.name = "spotify"
+        track = Track("Artist", "Song", "Album", timedelta(minutes=3), "link1")
+        mock_service.process_user_playlist.return_value = MusicServicePlaylist(
+            service_name="spotify",
+            tracks=[track],
+            total_duration=track.duration
+        )
+        mock_get_service.return_value = mock_service
+        
+        broken, good = validate_playlists_from_files(
+            str(mixdisc_tree['config']),
+            [broken_file, playlist_file],
+            update_cache=False
+        )
+        
+        assert broken.filepath == broken_file
+        assert not broken.is_valid
+        assert broken.error_message == "Failed to load playlist file"
+        assert good.filepath == playlist_file
+        assert good.is_valid
+        assert good.title == "Good Playlist"
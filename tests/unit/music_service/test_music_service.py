@@ -1,6 +1,7 @@
 """ Unit tests for music_service.py """
 
 import pytest
+from dataclasses import FrozenInstanceError
 from datetime import timedelta
 
 from mixdiscer.music_service import (
@@ -9,6 +10,7 @@ from mixdiscer.music_service import (
     ProcessedPlaylist,
     MusicServiceError,
 )
+from mixdiscer.music_service.music_service import calculate_total_duration
 from mixdiscer.playlists import Playlist
 
 
@@ -29,6 +31,15 @@ def test_track_dataclass():
     assert track.link == "https://open.spotify.com/track/0aym2LBJBk9DAYuHHutrIl"
 
 
+def test_track_is_immutable():
+    """Test that tracks cannot be modified and carry no instance dict"""
+    track = Track("Artist", "Song", None, timedelta(minutes=3), None)
+    
+    with pytest.raises(FrozenInstanceError):
+        track.title = "Other Song"
+    assert not hasattr(track, '__dict__')
+
+
 def test_track_without_album():
     """Test creating Track without album"""
     track = Track(
@@ -57,7 +68,7 @@ def test_track_without_link():
 
 def test_music_service_playlist_dataclass(sample_tracks):
     """Test creating MusicServicePlaylist instance"""
-    total_duration = sum((t.duration for t in sample_tracks), timedelta())
+    total_duration = calculate_total_duration(sample_tracks)
     
     playlist = MusicServicePlaylist(
         service_name="spotify",
@@ -160,3 +171,15 @@ def test_music_service_error_inheritance():
     # Should be catchable as Exception
     with pytest.raises(Exception):
         raise error
+
+
+def test_calculate_total_duration_keeps_milliseconds():
+    """Test that sub-second track durations are summed exactly"""
+    tracks = [
+        Track("A", "One", None, timedelta(milliseconds=225_123), "link1"),
+        None,
+        Track("B", "Two", None, timedelta(milliseconds=180_877), "link2"),
+    ]
+    
+    assert calculate_total_duration(tracks) == timedelta(seconds=406)
+    assert calculate_total_duration([]) == timedelta()
@@ -1,20 +1,27 @@
 """ Unit tests for cache.py """
 
 import pytest
+import hashlib
 import json
+import os
 from pathlib import Path
 from datetime import timedelta, datetime, timezone
 from freezegun import freeze_time
 
 from mixdiscer.cache import (
+    PlaylistCacheSession,
     get_cache_key,
     compute_playlist_hash,
+    compute_playlist_hashes,
     load_cache,
     save_cache,
     is_cache_valid,
     get_cached_music_service_playlist,
+    get_entry_music_service_playlist,
     update_cache_entry,
     cleanup_stale_cache_entries,
+    CONTENT_HASH_ALGORITHM,
+    PLAYLIST_CACHE_VERSION,
 )
 from mixdiscer.playlists import Playlist
 from mixdiscer.music_service import Track, MusicServicePlaylist
@@ -39,7 +46,7 @@ def test_compute_playlist_hash(tmp_path):
     hash1 = compute_playlist_hash(playlist_path)
     
     assert hash1 is not None
-    assert len(hash1) == 64  # SHA256 produces 64-char hex string
+    assert len(hash1) == 64  # 256-bit digest produces 64-char hex string
     
     # Same content should produce same hash
     hash2 = compute_playlist_hash(playlist_path)
@@ -92,17 +99,56 @@ def test_load_cache_existing(tmp_path):
     
     loaded = load_cache(cache_path)
     
-    assert loaded['version'] == '1.0'
+    assert loaded['version'] == PLAYLIST_CACHE_VERSION
     assert 'User/Title' in loaded['playlists']
 
 
+def test_load_cache_migrates_track_dicts_to_rows(tmp_path):
+    """Test that version 1.0 track dictionaries are converted to rows on load"""
+    cache_path = tmp_path / "cache.json"
+    cache_data = {
+        'version': '1.0',
+        'playlists': {
+            'User/Title': {
+                'music_services': {
+                    'spotify': {
+                        'total_duration_seconds': 210,
+                        'tracks': [
+                            {
+                                'artist': 'Artist',
+                                'title': 'Song',
+                                'album': None,
+                                'duration_seconds': 210,
+                                'link': 'https://link',
+                                'service_specific': {'uri': 'spotify:track:1'}
+                            },
+                            None
+                        ]
+                    }
+                }
+            }
+        }
+    }
+    cache_path.write_text(json.dumps(cache_data))
+    
+    loaded = load_cache(cache_path)
+    
+    assert loaded['version'] == PLAYLIST_CACHE_VERSION
+    assert loaded['playlists']['User/Title']['music_services']['spotify']['tracks'] == [
+        ['Artist', 'Song', None, 210, 'https://link', {'uri': 'spotify:track:1'}],
+        None
+    ]
+    playlist = get_cached_music_service_playlist('User/Title', 'spotify', loaded)
+    assert playlist.tracks[0] == Track('Artist', 'Song', None, timedelta(seconds=210), 'https://link')
+
+
 def test_load_cache_missing(tmp_path):
     """Test loading non-existent cache creates empty structure"""
     cache_path = tmp_path / "nonexistent.json"
     
     cache = load_cache(cache_path)
     
-    assert cache['version'] == '1.0'
+    assert cache['version'] == PLAYLIST_CACHE_VERSION
     assert cache['playlists'] == {}
     assert 'last_updated' in cache
 
@@ -115,7 +161,7 @@ def test_load_cache_invalid_json(tmp_path):
     cache = load_cache(cache_path)
     
     # Should return empty cache structure
-    assert cache['version'] == '1.0'
+    assert cache['version'] == PLAYLIST_CACHE_VERSION
     assert cache['playlists'] == {}
 
 
@@ -140,6 +186,15 @@ def test_save_cache(tmp_path):
     assert '2024-01-15' in saved['last_updated']
 
 
+def test_save_cache_leaves_no_temp_file(tmp_path):
+    """Test that the cache is written atomically via a temporary file"""
+    cache_path = tmp_path / "cache.json"
+    
+    save_cache({'version': '1.0', 'playlists': {}}, cache_path)
+    
+    assert [p.name for p in tmp_path.iterdir()] == ["cache.json"]
+
+
 def test_save_cache_creates_directory(tmp_path):
     """Test that save_cache creates parent directory"""
     cache_path = tmp_path / "nested" / "dir" / "cache.json"
@@ -154,11 +209,48 @@ def test_save_cache_creates_directory(tmp_path):
     assert cache_path.parent.is_dir()
 
 
+def test_save_and_load_cache_round_trip(tmp_path):
+    """Test that saved caches load back unchanged, including non-ASCII text"""
+    cache_path = tmp_path / "cache.json"
+    cache_data = {
+        'version': PLAYLIST_CACHE_VERSION,
+        'playlists': {'Usér/Café Mix': {'user': 'Usér', 'title': 'Café Mix'}}
+    }
+    
+    save_cache(cache_data, cache_path)
+    
+    assert load_cache(cache_path) == cache_data
+
+
+def test_playlist_cache_session_saves_once_when_dirty(tmp_path, sample_playlist, sample_music_service_playlist):
+    """Test that a session saves its updates on exit"""
+    cache_path = tmp_path / "cache.json"
+    cache_key = get_cache_key(sample_playlist)
+    
+    with PlaylistCacheSession(cache_path) as session:
+        update_cache_entry(cache_key, sample_playlist, sample_music_service_playlist, session.cache_data)
+        session.mark_dirty()
+        assert not cache_path.exists()
+    
+    assert cache_key in load_cache(cache_path)['playlists']
+
+
+def test_playlist_cache_session_skips_save_when_clean(tmp_path):
+    """Test that an unmodified session does not write the cache"""
+    cache_path = tmp_path / "cache.json"
+    
+    with PlaylistCacheSession(cache_path) as session:
+        assert session.cache_data['playlists'] == {}
+    
+    assert not cache_path.exists()
+
+
 def test_is_cache_valid_unchanged(sample_playlist):
     """Test that unchanged playlist is valid"""
     current_hash = compute_playlist_hash(sample_playlist.filepath)
     cache_entry = {
         'content_hash': current_hash,
+        'content_hash_algorithm': CONTENT_HASH_ALGORITHM,
         'user': sample_playlist.user,
         'title': sample_playlist.title
     }
@@ -166,6 +258,20 @@ def test_is_cache_valid_unchanged(sample_playlist):
     assert is_cache_valid(sample_playlist, cache_entry)
 
 
+def test_is_cache_valid_legacy_sha256_entry(sample_playlist):
+    """Test that entries without a recorded algorithm are checked with SHA-256"""
+    cache_entry = {
+        'content_hash': hashlib.sha256(sample_playlist.filepath.read_bytes()).hexdigest(),
+        'user': sample_playlist.user,
+        'title': sample_playlist.title
+    }
+    
+    assert is_cache_valid(sample_playlist, cache_entry)
+    
+    cache_entry['content_hash_algorithm'] = 'md5'
+    assert not is_cache_valid(sample_playlist, cache_entry)
+
+
 def test_is_cache_valid_changed(sample_playlist):
     """Test that changed playlist is invalid"""
     cache_entry = {
@@ -177,6 +283,66 @@ def test_is_cache_valid_changed(sample_playlist):
     assert not is_cache_valid(sample_playlist, cache_entry)
 
 
+def test_is_cache_valid_rejects_other_user_or_title(sample_playlist, mocker):
+    """Test that an entry for a different user or title is rejected without hashing"""
+    current_hash = compute_playlist_hash(sample_playlist.filepath)
+    compute_hash = mocker.patch('mixdiscer.cache.compute_playlist_hash')
+    
+    for field in ('user', 'title'):
+        cache_entry = {
+            'content_hash': current_hash,
+            'content_hash_algorithm': CONTENT_HASH_ALGORITHM,
+            'user': sample_playlist.user,
+            'title': sample_playlist.title,
+            field: 'Someone Else',
+        }
+        
+        assert not is_cache_valid(sample_playlist, cache_entry)
+    compute_hash.assert_not_called()
+
+
+def test_is_cache_valid_ignores_mtime(empty_cache, sample_playlist, sample_music_service_playlist):
+    """Test that validity depends on file content, not modification time"""
+    cache_key = get_cache_key(sample_playlist)
+    update_cache_entry(cache_key, sample_playlist, sample_music_service_playlist, empty_cache)
+    entry = empty_cache['playlists'][cache_key]
+    
+    stat = sample_playlist.filepath.stat()
+    os.utime(sample_playlist.filepath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert is_cache_valid(sample_playlist, entry)
+    
+    sample_playlist.filepath.write_text("user: TestUser\ntitle: Changed\n")
+    assert not is_cache_valid(sample_playlist, entry)
+
+
+def test_compute_playlist_hashes(tmp_path):
+    """Test hashing several files at once matches hashing each in turn"""
+    paths = []
+    for i in range(5):
+        path = tmp_path / f"playlist{i}.yaml"
+        path.write_text(f"user: Test\ntitle: Playlist {i}\n")
+        paths.append(path)
+    
+    hashes = compute_playlist_hashes(paths)
+    
+    assert list(hashes) == paths
+    assert hashes == {path: compute_playlist_hash(path) for path in paths}
+    assert compute_playlist_hashes([]) == {}
+
+
+def test_is_cache_valid_uses_precomputed_hash(sample_playlist, mocker):
+    """Test that a precomputed hash is used instead of reading the file"""
+    cache_entry = {
+        'content_hash': 'precomputed',
+        'content_hash_algorithm': CONTENT_HASH_ALGORITHM,
+    }
+    compute_hash = mocker.patch('mixdiscer.cache.compute_playlist_hash')
+    
+    assert is_cache_valid(sample_playlist, cache_entry, content_hash='precomputed')
+    assert not is_cache_valid(sample_playlist, cache_entry, content_hash='other')
+    compute_hash.assert_not_called()
+
+
 def test_get_cached_music_service_playlist_exists(empty_cache, sample_playlist):
     """Test retrieving cached playlist"""
     cache_data = empty_cache
@@ -189,13 +355,7 @@ def test_get_cached_music_service_playlist_exists(empty_cache, sample_playlist):
             'spotify': {
                 'total_duration_seconds': 450,
                 'tracks': [
-                    {
-                        'artist': 'Test Artist',
-                        'title': 'Test Song',
-                        'album': 'Test Album',
-                        'duration_seconds': 225,
-                        'link': 'https://example.com/track'
-                    },
+                    ['Test Artist', 'Test Song', 'Test Album', 225, 'https://example.com/track'],
                     None  # Missing track
                 ]
             }
@@ -212,6 +372,42 @@ def test_get_cached_music_service_playlist_exists(empty_cache, sample_playlist):
     assert playlist.total_duration == timedelta(seconds=450)
 
 
+def test_get_entry_music_service_playlist():
+    """Test reading a service playlist straight from a cache entry"""
+    cache_entry = {
+        'music_services': {
+            'spotify': {
+                'total_duration_seconds': 180,
+                'tracks': [['Artist', 'Song', None, 180, None]]
+            }
+        }
+    }
+    
+    playlist = get_entry_music_service_playlist(cache_entry, 'spotify')
+    
+    assert playlist.tracks == [Track('Artist', 'Song', None, timedelta(seconds=180), None)]
+    assert get_entry_music_service_playlist(cache_entry, 'apple_music') is None
+
+
+def test_get_cached_music_service_playlist_interns_names(tmp_path, empty_cache):
+    """Test that repeated artist and album names loaded from disk share one string"""
+    cache_key = "TestUser/Test Playlist"
+    track = ['Repeated Artist', 'Song', 'Repeated Album', 200, None]
+    empty_cache['playlists'][cache_key] = {
+        'music_services': {
+            'spotify': {'total_duration_seconds': 400, 'tracks': [track, list(track)]}
+        }
+    }
+    cache_path = tmp_path / "cache.json"
+    save_cache(empty_cache, cache_path)
+    
+    playlist = get_cached_music_service_playlist(cache_key, 'spotify', load_cache(cache_path))
+    
+    first, second = playlist.tracks
+    assert first.artist is second.artist
+    assert first.album is second.album
+
+
 def test_get_cached_music_service_playlist_missing(empty_cache):
     """Test that missing cache returns None"""
     playlist = get_cached_music_service_playlist('NonExistent/Playlist', 'spotify', empty_cache)
@@ -250,7 +446,43 @@ def test_update_cache_entry_new(empty_cache, sample_playlist, sample_music_servi
     assert entry['user'] == sample_playlist.user
     assert entry['title'] == sample_playlist.title
     assert 'content_hash' in entry
+    assert entry['content_hash_algorithm'] == CONTENT_HASH_ALGORITHM
     assert 'spotify' in entry['music_services']
+    assert is_cache_valid(sample_playlist, entry)
+
+
+def test_update_cache_entry_uses_precomputed_hash(empty_cache, sample_playlist, sample_music_service_playlist, mocker):
+    """Test that a precomputed hash is stored without reading the file again"""
+    cache_key = get_cache_key(sample_playlist)
+    compute_hash = mocker.patch('mixdiscer.cache.compute_playlist_hash')
+    
+    update_cache_entry(
+        cache_key, sample_playlist, sample_music_service_playlist, empty_cache,
+        content_hash='precomputed'
+    )
+    
+    entry = empty_cache['playlists'][cache_key]
+    assert entry['content_hash'] == 'precomputed'
+    compute_hash.assert_not_called()
+
+
+def test_update_cache_entry_drops_file_stat(empty_cache, sample_playlist, sample_music_service_playlist):
+    """Test that size and mtime left by earlier versions are not kept in the cache"""
+    cache_key = get_cache_key(sample_playlist)
+    empty_cache['playlists'][cache_key] = {
+        'user': sample_playlist.user,
+        'title': sample_playlist.title,
+        'content_hash': 'old',
+        'file_size': 1,
+        'file_mtime_ns': 1,
+        'music_services': {},
+    }
+    
+    update_cache_entry(cache_key, sample_playlist, sample_music_service_playlist, empty_cache)
+    
+    entry = empty_cache['playlists'][cache_key]
+    assert 'file_size' not in entry
+    assert 'file_mtime_ns' not in entry
 
 
 def test_update_cache_entry_existing(empty_cache, sample_playlist, sample_music_service_playlist):
@@ -293,8 +525,7 @@ def test_update_cache_entry_serialization(empty_cache, sample_playlist):
     spotify_data = entry['music_services']['spotify']
     
     assert len(spotify_data['tracks']) == 2
-    assert spotify_data['tracks'][0]['artist'] == "Artist"
-    assert spotify_data['tracks'][0]['duration_seconds'] == 210
+    assert spotify_data['tracks'][0] == ["Artist", "Title", "Album", 210, "https://link"]
     assert spotify_data['tracks'][1] is None
 
 
@@ -1,348 +1,196 @@
 """Unit tests for cache functionality with remote playlists"""
 
 import pytest
-from datetime import datetime, timedelta, timezone
-from pathlib import Path
+from dataclasses import replace
+from datetime import timedelta
+from types import SimpleNamespace
 
 from mixdiscer.cache import (
     update_cache_entry,
-    get_cache_key
+    get_cache_key,
+    PLAYLIST_CACHE_VERSION,
 )
 from mixdiscer.playlists import Playlist
 from mixdiscer.music_service import MusicServicePlaylist, Track
 
 
-class TestCacheWithRemotePlaylists:
-    """Test cache operations with remote playlists"""
+FIXED_ISO = "2024-12-20T10:00:00+00:00"
+_DUR_3M = timedelta(minutes=3)
 
-    def test_update_cache_entry_with_remote_playlist(self, tmp_path):
-        """Test updating cache entry for a remote playlist"""
-        # Create remote playlist
-        playlist_file = tmp_path / "test.yaml"
-        playlist_file.write_text("test")
-        
-        playlist = Playlist(
-            user="TestUser",
-            title="Remote Playlist",
-            description="Test",
-            genre="rock",
-            tracks=None,
-            remote_playlist="https://open.spotify.com/playlist/test123",
-            filepath=playlist_file
-        )
-        
-        # Create music service playlist
-        tracks = [
-            Track(
-                artist="Artist One",
-                title="Song One",
-                album="Album One",
-                duration=timedelta(minutes=3),
-                link="https://spotify.com/track1"
-            )
-        ]
-        
-        music_service_playlist = MusicServicePlaylist(
-            service_name="spotify",
-            tracks=tracks,
-            total_duration=timedelta(minutes=3)
-        )
-        
-        # Update cache
-        cache_data = {
-            'version': '1.0',
-            'last_updated': datetime.now(timezone.utc).isoformat(),
-            'playlists': {}
-        }
-        
-        cache_key = get_cache_key(playlist)
-        snapshot_id = "snapshot_abc123"
-        
-        update_cache_entry(cache_key, playlist, music_service_playlist, cache_data, snapshot_id)
-        
-        # Verify cache entry
-        entry = cache_data['playlists'][cache_key]
-        assert entry['user'] == "TestUser"
-        assert entry['title'] == "Remote Playlist"
-        assert entry['remote_playlist_url'] == "https://open.spotify.com/playlist/test123"
-        assert entry['remote_snapshot_id'] == "snapshot_abc123"
-        assert entry['remote_validation_status'] == 'valid'
-        assert entry['remote_frozen_at'] is None
-        assert entry['remote_frozen_reason'] is None
 
-    def test_update_cache_entry_with_manual_playlist(self, tmp_path):
-        """Test that manual playlists don't have remote fields set"""
-        playlist_file = tmp_path / "test.yaml"
-        playlist_file.write_text("test")
-        
-        playlist = Playlist(
-            user="TestUser",
+@pytest.fixture(scope="module")
+def remote_playlist_template(stub_playlist_file):
+    """Build the playlists and music service playlist shared by this module's tests
+    
+    The objects are shared between tests, so tests must derive variants with
+    dataclasses.replace rather than modifying them.
+    """
+    remote = Playlist(
+        user="TestUser",
+        title="Remote Playlist",
+        description="Test",
+        genre="rock",
+        tracks=None,
+        remote_playlist="https://open.spotify.com/playlist/test123",
+        filepath=stub_playlist_file
+    )
+    tracks = [
+        Track(
+            artist="Artist",
+            title="Song",
+            album="Album",
+            duration=_DUR_3M,
+            link="https://spotify.com/track1"
+        )
+    ]
+    return SimpleNamespace(
+        remote=remote,
+        manual=replace(
+            remote,
             title="Manual Playlist",
-            description="Test",
-            genre="rock",
             tracks=[("Artist", "Song", None)],
-            filepath=playlist_file
-        )
-        
-        tracks = [
-            Track(
-                artist="Artist",
-                title="Song",
-                album="Album",
-                duration=timedelta(minutes=3),
-                link="https://spotify.com/track1"
-            )
-        ]
-        
-        music_service_playlist = MusicServicePlaylist(
+            remote_playlist=None
+        ),
+        tracks=tracks,
+        msp=MusicServicePlaylist(
             service_name="spotify",
             tracks=tracks,
-            total_duration=timedelta(minutes=3)
+            total_duration=_DUR_3M
         )
-        
-        cache_data = {
-            'version': '1.0',
-            'last_updated': datetime.now(timezone.utc).isoformat(),
-            'playlists': {}
-        }
-        
-        cache_key = get_cache_key(playlist)
-        update_cache_entry(cache_key, playlist, music_service_playlist, cache_data)
-        
-        # Verify remote fields are None
-        entry = cache_data['playlists'][cache_key]
-        assert entry['remote_playlist_url'] is None
-        assert entry['remote_snapshot_id'] is None
-        assert entry['remote_validation_status'] is None
-        assert entry['remote_frozen_at'] is None
-        assert entry['remote_frozen_reason'] is None
+    )
 
-    def test_update_cache_entry_with_snapshot_update(self, tmp_path):
-        """Test updating snapshot_id for existing remote playlist"""
-        playlist_file = tmp_path / "test.yaml"
-        playlist_file.write_text("test")
-        
-        playlist = Playlist(
-            user="TestUser",
-            title="Remote Playlist",
-            description="Test",
-            genre="rock",
-            tracks=None,
-            remote_playlist="https://open.spotify.com/playlist/test123",
-            filepath=playlist_file
-        )
-        
-        tracks = [
-            Track(
-                artist="Artist",
-                title="Song",
-                album="Album",
-                duration=timedelta(minutes=3),
-                link="https://spotify.com/track1"
-            )
-        ]
-        
-        music_service_playlist = MusicServicePlaylist(
-            service_name="spotify",
-            tracks=tracks,
-            total_duration=timedelta(minutes=3)
-        )
-        
-        # Create cache with old snapshot
-        cache_data = {
-            'version': '1.0',
-            'last_updated': datetime.now(timezone.utc).isoformat(),
-            'playlists': {}
-        }
-        
-        cache_key = get_cache_key(playlist)
-        
-        # First update with old snapshot
-        update_cache_entry(cache_key, playlist, music_service_playlist, cache_data, "old_snapshot")
-        assert cache_data['playlists'][cache_key]['remote_snapshot_id'] == "old_snapshot"
-        
-        # Update with new snapshot
-        update_cache_entry(cache_key, playlist, music_service_playlist, cache_data, "new_snapshot")
-        assert cache_data['playlists'][cache_key]['remote_snapshot_id'] == "new_snapshot"
 
-    def test_cache_entry_clears_remote_fields_when_switching_to_manual(self, tmp_path):
-        """Test that converting from remote to manual clears remote fields"""
-        playlist_file = tmp_path / "test.yaml"
-        playlist_file.write_text("test")
-        
-        # Start with remote playlist
-        remote_playlist = Playlist(
-            user="TestUser",
-            title="Playlist",
-            description="Test",
-            genre="rock",
-            tracks=None,
-            remote_playlist="https://open.spotify.com/playlist/test123",
-            filepath=playlist_file
-        )
-        
-        tracks = [
-            Track(
-                artist="Artist",
-                title="Song",
-                album="Album",
-                duration=timedelta(minutes=3),
-                link="https://spotify.com/track1"
-            )
-        ]
-        
-        music_service_playlist = MusicServicePlaylist(
-            service_name="spotify",
-            tracks=tracks,
-            total_duration=timedelta(minutes=3)
-        )
-        
-        cache_data = {
-            'version': '1.0',
-            'last_updated': datetime.now(timezone.utc).isoformat(),
-            'playlists': {}
-        }
-        
-        cache_key = get_cache_key(remote_playlist)
-        
-        # Cache as remote
-        update_cache_entry(cache_key, remote_playlist, music_service_playlist, cache_data, "snapshot123")
+@pytest.fixture
+def fresh_cache_data():
+    """Return an empty cache for a single test to modify"""
+    return {
+        'version': PLAYLIST_CACHE_VERSION,
+        'last_updated': FIXED_ISO,
+        'playlists': {}
+    }
+
+
+_EXPECTED_REMOTE = {
+    'user': "TestUser",
+    'title': "Remote Playlist",
+    'remote_playlist_url': "https://open.spotify.com/playlist/test123",
+    'remote_snapshot_id': "snapshot_abc123",
+    'remote_validation_status': 'valid',
+    'remote_frozen_at': None,
+    'remote_frozen_reason': None,
+}
+
+_EXPECTED_MANUAL = {
+    'remote_playlist_url': None,
+    'remote_snapshot_id': None,
+    'remote_validation_status': None,
+    'remote_frozen_at': None,
+    'remote_frozen_reason': None,
+}
+
+_EXPECTED_FROZEN_REASON = {
+    'type': 'duration_exceeded',
+    'current_track_count': 25,
+    'cached_track_count': 20,
+}
+
+_EXPECTED_UNFROZEN = {
+    'remote_validation_status': 'valid',
+    'remote_frozen_at': None,
+    'remote_frozen_reason': None,
+    'remote_snapshot_id': 'new_snapshot',
+}
+
+
+def _run_scenario(scenario, cache_data, template):
+    """Apply an update_cache_entry scenario and return (entry, expected fields)"""
+    remote = template.remote
+    music_service_playlist = template.msp
+    
+    if scenario == "remote_new":
+        cache_key = get_cache_key(remote)
+        update_cache_entry(cache_key, remote, music_service_playlist, cache_data, "snapshot_abc123")
+        expected = _EXPECTED_REMOTE
+    elif scenario == "manual_new":
+        cache_key = get_cache_key(template.manual)
+        update_cache_entry(cache_key, template.manual, music_service_playlist, cache_data)
+        expected = _EXPECTED_MANUAL
+    elif scenario == "snapshot_update":
+        cache_key = get_cache_key(remote)
+        update_cache_entry(cache_key, remote, music_service_playlist, cache_data, "old_snapshot")
+        assert cache_data['playlists'][cache_key]['remote_snapshot_id'] == "old_snapshot"
+        update_cache_entry(cache_key, remote, music_service_playlist, cache_data, "new_snapshot")
+        expected = {'remote_snapshot_id': "new_snapshot"}
+    elif scenario == "remote_to_manual":
+        # Same cache key, so the manual version replaces the remote entry
+        cache_key = get_cache_key(remote)
+        update_cache_entry(cache_key, remote, music_service_playlist, cache_data, "snapshot123")
         assert cache_data['playlists'][cache_key]['remote_snapshot_id'] == "snapshot123"
-        
-        # Now convert to manual
-        manual_playlist = Playlist(
-            user="TestUser",
-            title="Playlist",
-            description="Test",
-            genre="rock",
-            tracks=[("Artist", "Song", None)],
-            filepath=playlist_file
-        )
-        
-        update_cache_entry(cache_key, manual_playlist, music_service_playlist, cache_data)
-        
-        # Remote fields should be cleared
-        assert cache_data['playlists'][cache_key]['remote_playlist_url'] is None
-        assert cache_data['playlists'][cache_key]['remote_snapshot_id'] is None
+        manual = replace(template.manual, title=remote.title)
+        update_cache_entry(cache_key, manual, music_service_playlist, cache_data)
+        expected = _EXPECTED_MANUAL
+    else:
+        raise ValueError(f"Unknown scenario: {scenario}")
+    
+    return cache_data['playlists'][cache_key], expected
+
+
+class TestCacheWithRemotePlaylists:
+    """Test cache operations with remote playlists"""
+
+    @pytest.mark.parametrize("scenario", [
+        "remote_new",
+        "manual_new",
+        "snapshot_update",
+        "remote_to_manual",
+    ])
+    def test_update_cache_entry_remote_fields(self, scenario, remote_playlist_template, fresh_cache_data):
+        """Test the remote fields written by update_cache_entry for each scenario"""
+        entry, expected = _run_scenario(scenario, fresh_cache_data, remote_playlist_template)
+        
+        assert {k: entry[k] for k in expected} == expected
 
 
 class TestFrozenPlaylistCache:
     """Test cache operations for frozen playlists"""
 
-    def test_cache_frozen_playlist_metadata(self, tmp_path):
+    def test_cache_frozen_playlist_metadata(self, remote_playlist_template, fresh_cache_data, frozen_entry):
         """Test that frozen playlist metadata is stored correctly"""
-        playlist_file = tmp_path / "test.yaml"
-        playlist_file.write_text("test")
-        
-        playlist = Playlist(
-            user="TestUser",
-            title="Frozen Playlist",
-            description="Test",
-            genre="rock",
-            tracks=None,
-            remote_playlist="https://open.spotify.com/playlist/test123",
-            filepath=playlist_file
-        )
-        
-        cache_data = {
-            'version': '1.0',
-            'last_updated': datetime.now(timezone.utc).isoformat(),
-            'playlists': {}
-        }
+        playlist = replace(remote_playlist_template.remote, title="Frozen Playlist")
+        cache_data = fresh_cache_data
         
         cache_key = get_cache_key(playlist)
         
         # Manually simulate frozen state (would normally be set by check_remote_playlist_update)
-        cache_data['playlists'][cache_key] = {
+        cache_data['playlists'][cache_key] = frozen_entry | {
             'user': playlist.user,
             'title': playlist.title,
             'filepath': str(playlist.filepath),
-            'content_hash': 'abc123',
-            'remote_playlist_url': playlist.remote_playlist,
-            'remote_snapshot_id': 'old_snapshot',
-            'remote_validation_status': 'frozen',
-            'remote_frozen_at': datetime.now(timezone.utc).isoformat(),
-            'remote_frozen_reason': {
-                'type': 'duration_exceeded',
-                'current_duration': '85:00',
-                'current_track_count': 25,
-                'cached_track_count': 20,
-                'limit': '80:00',
-                'exceeded_by': '5:00',
-                'last_checked': datetime.now(timezone.utc).isoformat()
-            },
-            'music_services': {},
-            'cached_at': datetime.now(timezone.utc).isoformat()
         }
         
         entry = cache_data['playlists'][cache_key]
         
         assert entry['remote_validation_status'] == 'frozen'
-        assert entry['remote_frozen_at'] is not None
-        assert entry['remote_frozen_reason'] is not None
-        assert entry['remote_frozen_reason']['type'] == 'duration_exceeded'
-        assert entry['remote_frozen_reason']['current_track_count'] == 25
-        assert entry['remote_frozen_reason']['cached_track_count'] == 20
+        assert entry['remote_frozen_at'] == FIXED_ISO
+        reason = entry['remote_frozen_reason']
+        assert {k: reason[k] for k in _EXPECTED_FROZEN_REASON} == _EXPECTED_FROZEN_REASON
 
-    def test_unfreezing_playlist_clears_frozen_metadata(self, tmp_path):
+    def test_unfreezing_playlist_clears_frozen_metadata(self, remote_playlist_template, fresh_cache_data, frozen_entry):
         """Test that unfreezing a playlist clears frozen metadata"""
-        playlist_file = tmp_path / "test.yaml"
-        playlist_file.write_text("test")
-        
-        playlist = Playlist(
-            user="TestUser",
-            title="Playlist",
-            description="Test",
-            genre="rock",
-            tracks=None,
-            remote_playlist="https://open.spotify.com/playlist/test123",
-            filepath=playlist_file
-        )
-        
-        tracks = [
-            Track(
-                artist="Artist",
-                title="Song",
-                album="Album",
-                duration=timedelta(minutes=3),
-                link="https://spotify.com/track1"
-            )
-        ]
-        
-        music_service_playlist = MusicServicePlaylist(
-            service_name="spotify",
-            tracks=tracks,
-            total_duration=timedelta(minutes=3)
-        )
-        
-        cache_data = {
-            'version': '1.0',
-            'last_updated': datetime.now(timezone.utc).isoformat(),
-            'playlists': {}
-        }
+        playlist = replace(remote_playlist_template.remote, title="Playlist")
+        cache_data = fresh_cache_data
         
         cache_key = get_cache_key(playlist)
         
         # Start with frozen state
-        cache_data['playlists'][cache_key] = {
+        cache_data['playlists'][cache_key] = frozen_entry | {
             'user': playlist.user,
             'title': playlist.title,
             'filepath': str(playlist.filepath),
-            'content_hash': 'abc123',
-            'remote_playlist_url': playlist.remote_playlist,
-            'remote_snapshot_id': 'old_snapshot',
-            'remote_validation_status': 'frozen',
-            'remote_frozen_at': datetime.now(timezone.utc).isoformat(),
-            'remote_frozen_reason': {'type': 'duration_exceeded'},
-            'music_services': {},
-            'cached_at': datetime.now(timezone.utc).isoformat()
         }
         
         # Update with valid playlist (unfreeze)
-        update_cache_entry(cache_key, playlist, music_service_playlist, cache_data, "new_snapshot")
+        update_cache_entry(cache_key, playlist, remote_playlist_template.msp, cache_data, "new_snapshot")
         
         entry = cache_data['playlists'][cache_key]
-        assert entry['remote_validation_status'] == 'valid'
-        assert entry['remote_frozen_at'] is None
-        assert entry['remote_frozen_reason'] is None
-        assert entry['remote_snapshot_id'] == 'new_snapshot'
+        assert {k: entry[k] for k in _EXPECTED_UNFROZEN} == _EXPECTED_UNFROZEN
@@ -1,19 +1,57 @@
 """Unit tests for remote playlist update checking logic"""
 
 import pytest
-from unittest.mock import Mock, patch
-from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock
+from datetime import timedelta
 from pathlib import Path
 
 from mixdiscer.main import check_remote_playlist_update, RemotePlaylistCheckResult
 from mixdiscer.playlists import Playlist
-from mixdiscer.music_service import MusicServicePlaylist, MusicServiceError, Track, ValidationWarning
+from mixdiscer.music_service import MusicServicePlaylist, MusicServiceError, Track
+from mixdiscer.music_service.spotify import SpotifyMusicService
+
+
+FIXED_ISO = "2024-12-20T10:00:00+00:00"
+
+_DUR_80M = timedelta(minutes=80)
+_DUR_3M = timedelta(minutes=3)
+_DUR_4M = timedelta(minutes=4)
+
+# Remote playlist long enough to exceed the limit (25 * 4 = 100 minutes)
+_LONG_TRACKS = tuple(
+    Track(
+        artist=f"Artist {i}",
+        title=f"Song {i}",
+        album="Album",
+        duration=_DUR_4M,
+        link=f"https://spotify.com/track{i}"
+    )
+    for i in range(25)
+)
+
+# Valid cached version of the same playlist (20 tracks, 60 minutes)
+_CACHED_TRACKS_DATA = tuple(
+    (f'Cached Artist {i}', f'Cached Song {i}', 'Album', 180, f'https://spotify.com/cached{i}')
+    for i in range(20)
+)
+
+
+@pytest.fixture
+def mock_service():
+    """Return a mock music service with the Spotify service's interface
+
+    The MusicService base class does not declare the remote playlist
+    methods, so the Spotify service is used as the spec.
+    """
+    service = Mock(spec_set=SpotifyMusicService)
+    service.name = "spotify"
+    return service
 
 
 class TestCheckRemotePlaylistUpdate:
     """Test check_remote_playlist_update function"""
 
-    def test_unchanged_remote_playlist(self):
+    def test_unchanged_remote_playlist(self, mock_service):
         """Test that unchanged snapshot returns cached playlist"""
         playlist_file = Path("/tmp/test.yaml")
         playlist = Playlist(
@@ -26,22 +64,9 @@ class TestCheckRemotePlaylistUpdate:
             filepath=playlist_file
         )
         
-        # Mock music service
-        music_service = Mock()
-        music_service.name = "spotify"
-        music_service.get_playlist_snapshot = Mock(return_value="snapshot123")
+        mock_service.get_playlist_snapshot.return_value = "snapshot123"
         
         # Create cache entry with same snapshot
-        cached_tracks = [
-            Track(
-                artist="Cached Artist",
-                title="Cached Song",
-                album="Cached Album",
-                duration=timedelta(minutes=3),
-                link="https://spotify.com/track"
-            )
-        ]
-        
         cache_entry = {
             'user': 'TestUser',
             'title': 'Remote Playlist',
@@ -50,24 +75,18 @@ class TestCheckRemotePlaylistUpdate:
             'remote_validation_status': 'valid',
             'music_services': {
                 'spotify': {
-                    'tracks': [{
-                        'artist': 'Cached Artist',
-                        'title': 'Cached Song',
-                        'album': 'Cached Album',
-                        'duration_seconds': 180,
-                        'link': 'https://spotify.com/track'
-                    }],
+                    'tracks': [['Cached Artist', 'Cached Song', 'Cached Album', 180, 'https://spotify.com/track']],
                     'total_duration_seconds': 180,
-                    'cached_at': datetime.now(timezone.utc).isoformat()
+                    'cached_at': FIXED_ISO
                 }
             }
         }
         
         result = check_remote_playlist_update(
             playlist,
-            music_service,
+            mock_service,
             cache_entry,
-            timedelta(minutes=80)
+            _DUR_80M
         )
         
         assert result is not None
@@ -76,10 +95,10 @@ class TestCheckRemotePlaylistUpdate:
         assert result.validation_warning is None
         assert result.should_update_cache is False
         assert len(result.music_service_playlist.tracks) == 1
-        music_service.get_playlist_snapshot.assert_called_once()
-        music_service.fetch_remote_playlist.assert_not_called()
+        assert mock_service.get_playlist_snapshot.call_count == 1
+        assert mock_service.fetch_remote_playlist.call_count == 0
 
-    def test_changed_valid_remote_playlist(self):
+    def test_changed_valid_remote_playlist(self, mock_service):
         """Test that changed snapshot with valid duration fetches new tracks"""
         playlist_file = Path("/tmp/test.yaml")
         playlist = Playlist(
@@ -92,17 +111,14 @@ class TestCheckRemotePlaylistUpdate:
             filepath=playlist_file
         )
         
-        # Mock music service
-        music_service = Mock()
-        music_service.name = "spotify"
-        music_service.get_playlist_snapshot = Mock(return_value="new_snapshot")
+        mock_service.get_playlist_snapshot.return_value = "new_snapshot"
         
         new_tracks = [
             Track(
                 artist="New Artist",
                 title="New Song",
                 album="New Album",
-                duration=timedelta(minutes=3),
+                duration=_DUR_3M,
                 link="https://spotify.com/new_track"
             )
         ]
@@ -110,10 +126,10 @@ class TestCheckRemotePlaylistUpdate:
         new_playlist = MusicServicePlaylist(
             service_name="spotify",
             tracks=new_tracks,
-            total_duration=timedelta(minutes=3)
+            total_duration=_DUR_3M
         )
         
-        music_service.fetch_remote_playlist = Mock(return_value=new_playlist)
+        mock_service.fetch_remote_playlist.return_value = new_playlist
         
         cache_entry = {
             'user': 'TestUser',
@@ -125,28 +141,28 @@ class TestCheckRemotePlaylistUpdate:
                 'spotify': {
                     'tracks': [],
                     'total_duration_seconds': 0,
-                    'cached_at': datetime.now(timezone.utc).isoformat()
+                    'cached_at': FIXED_ISO
                 }
             }
         }
         
         result = check_remote_playlist_update(
             playlist,
-            music_service,
+            mock_service,
             cache_entry,
-            timedelta(minutes=80)
+            _DUR_80M
         )
         
         assert result is not None
         assert isinstance(result, RemotePlaylistCheckResult)
         assert result.validation_warning is None
         assert result.should_update_cache is True
-        assert result.music_service_playlist.total_duration == timedelta(minutes=3)
+        assert result.music_service_playlist.total_duration == _DUR_3M
         assert result.cache_updates['remote_snapshot_id'] == 'new_snapshot'
         assert result.cache_updates['remote_validation_status'] == 'valid'
-        music_service.fetch_remote_playlist.assert_called_once()
+        assert mock_service.fetch_remote_playlist.call_count == 1
 
-    def test_changed_exceeds_duration_freezes_playlist(self):
+    def test_changed_exceeds_duration_freezes_playlist(self, mock_service):
         """Test that exceeding duration freezes playlist at cached version"""
         playlist_file = Path("/tmp/test.yaml")
         playlist = Playlist(
@@ -159,42 +175,16 @@ class TestCheckRemotePlaylistUpdate:
             filepath=playlist_file
         )
         
-        # Mock music service
-        music_service = Mock()
-        music_service.name = "spotify"
-        music_service.get_playlist_snapshot = Mock(return_value="new_snapshot")
+        mock_service.get_playlist_snapshot.return_value = "new_snapshot"
         
         # New playlist exceeds duration
-        new_tracks = [
-            Track(
-                artist=f"Artist {i}",
-                title=f"Song {i}",
-                album="Album",
-                duration=timedelta(minutes=4),
-                link=f"https://spotify.com/track{i}"
-            )
-            for i in range(25)  # 25 * 4 = 100 minutes
-        ]
-        
         new_playlist = MusicServicePlaylist(
             service_name="spotify",
-            tracks=new_tracks,
+            tracks=list(_LONG_TRACKS),
             total_duration=timedelta(minutes=100)
         )
         
-        music_service.fetch_remote_playlist = Mock(return_value=new_playlist)
-        
-        # Cached version is valid (20 tracks, 60 minutes)
-        cached_tracks_data = [
-            {
-                'artist': f'Cached Artist {i}',
-                'title': f'Cached Song {i}',
-                'album': 'Album',
-                'duration_seconds': 180,
-                'link': f'https://spotify.com/cached{i}'
-            }
-            for i in range(20)
-        ]
+        mock_service.fetch_remote_playlist.return_value = new_playlist
         
         cache_entry = {
             'user': 'TestUser',
@@ -204,7 +194,7 @@ class TestCheckRemotePlaylistUpdate:
             'remote_validation_status': 'valid',
             'music_services': {
                 'spotify': {
-                    'tracks': cached_tracks_data,
+                    'tracks': _CACHED_TRACKS_DATA,
                     'total_duration_seconds': 3600,  # 60 minutes
                     'cached_at': '2024-12-01T10:00:00+00:00'
                 }
@@ -213,9 +203,9 @@ class TestCheckRemotePlaylistUpdate:
         
         result = check_remote_playlist_update(
             playlist,
-            music_service,
+            mock_service,
             cache_entry,
-            timedelta(minutes=80)
+            _DUR_80M
         )
         
         # Should return cached playlist
@@ -242,7 +232,7 @@ class TestCheckRemotePlaylistUpdate:
         # Snapshot should NOT be updated (keep checking)
         assert 'remote_snapshot_id' not in result.cache_updates
 
-    def test_frozen_playlist_remains_frozen_with_same_snapshot(self):
+    def test_frozen_playlist_remains_frozen_with_same_snapshot(self, mock_service, frozen_entry):
         """Test that frozen playlist shows warning even with unchanged snapshot"""
         playlist_file = Path("/tmp/test.yaml")
         playlist = Playlist(
@@ -255,46 +245,16 @@ class TestCheckRemotePlaylistUpdate:
             filepath=playlist_file
         )
         
-        music_service = Mock()
-        music_service.name = "spotify"
-        music_service.get_playlist_snapshot = Mock(return_value="old_snapshot")
+        mock_service.get_playlist_snapshot.return_value = "old_snapshot"
         
-        cache_entry = {
-            'user': 'TestUser',
-            'title': 'Frozen Playlist',
-            'remote_playlist_url': 'https://open.spotify.com/playlist/test123',
-            'remote_snapshot_id': 'old_snapshot',  # Same snapshot
-            'remote_validation_status': 'frozen',
-            'remote_frozen_at': '2024-12-20T10:00:00+00:00',
-            'remote_frozen_reason': {
-                'type': 'duration_exceeded',
-                'current_duration': '85:00',
-                'current_track_count': 25,
-                'cached_track_count': 20,
-                'limit': '80:00',
-                'exceeded_by': '5:00',
-                'last_checked': '2024-12-20T10:00:00+00:00'
-            },
-            'music_services': {
-                'spotify': {
-                    'tracks': [{
-                        'artist': 'Artist',
-                        'title': 'Song',
-                        'album': 'Album',
-                        'duration_seconds': 180,
-                        'link': 'https://spotify.com/track'
-                    }],
-                    'total_duration_seconds': 180,
-                    'cached_at': '2024-12-01T10:00:00+00:00'
-                }
-            }
-        }
+        # Same snapshot as the frozen cache entry
+        cache_entry = frozen_entry | {'user': 'TestUser', 'title': 'Frozen Playlist'}
         
         result = check_remote_playlist_update(
             playlist,
-            music_service,
+            mock_service,
             cache_entry,
-            timedelta(minutes=80)
+            _DUR_80M
         )
         
         assert result is not None
@@ -303,8 +263,12 @@ class TestCheckRemotePlaylistUpdate:
         assert result.validation_warning.warning_type == 'duration_exceeded'
         assert result.should_update_cache is False
 
-    def test_error_getting_snapshot_raises_exception(self):
-        """Test that errors getting snapshot raise MusicServiceError"""
+    @pytest.mark.parametrize("snapshot_outcome,fetch_outcome,message", [
+        (Exception("API Error"), None, "Failed to get snapshot"),
+        ("new_snapshot", Exception("Fetch Error"), "Failed to fetch remote playlist"),
+    ])
+    def test_music_service_errors_raise_exception(self, mock_service, snapshot_outcome, fetch_outcome, message):
+        """Test that errors getting the snapshot or fetching the playlist raise MusicServiceError"""
         playlist_file = Path("/tmp/test.yaml")
         playlist = Playlist(
             user="TestUser",
@@ -316,58 +280,14 @@ class TestCheckRemotePlaylistUpdate:
             filepath=playlist_file
         )
         
-        music_service = Mock()
-        music_service.name = "spotify"
-        music_service.get_playlist_snapshot = Mock(side_effect=Exception("API Error"))
-        
-        cache_entry = {
-            'user': 'TestUser',
-            'title': 'Remote Playlist',
-            'remote_playlist_url': 'https://open.spotify.com/playlist/test123',
-            'remote_snapshot_id': 'snapshot123',
-            'remote_validation_status': 'valid',
-            'music_services': {
-                'spotify': {
-                    'tracks': [{
-                        'artist': 'Artist',
-                        'title': 'Song',
-                        'album': 'Album',
-                        'duration_seconds': 180,
-                        'link': 'https://spotify.com/track'
-                    }],
-                    'total_duration_seconds': 180,
-                    'cached_at': datetime.now(timezone.utc).isoformat()
-                }
-            }
-        }
-        
-        with pytest.raises(MusicServiceError) as exc_info:
-            check_remote_playlist_update(
-                playlist,
-                music_service,
-                cache_entry,
-                timedelta(minutes=80)
-            )
-        
-        assert "Failed to get snapshot" in str(exc_info.value)
-
-    def test_error_fetching_updated_playlist_raises_exception(self):
-        """Test that errors fetching updated playlist raise MusicServiceError"""
-        playlist_file = Path("/tmp/test.yaml")
-        playlist = Playlist(
-            user="TestUser",
-            title="Remote Playlist",
-            description="Test",
-            genre="rock",
-            tracks=None,
-            remote_playlist="https://open.spotify.com/playlist/test123",
-            filepath=playlist_file
-        )
-        
-        music_service = Mock()
-        music_service.name = "spotify"
-        music_service.get_playlist_snapshot = Mock(return_value="new_snapshot")
-        music_service.fetch_remote_playlist = Mock(side_effect=Exception("Fetch Error"))
+        for method, outcome in [
+            (mock_service.get_playlist_snapshot, snapshot_outcome),
+            (mock_service.fetch_remote_playlist, fetch_outcome),
+        ]:
+            if isinstance(outcome, Exception):
+                method.side_effect = outcome
+            else:
+                method.return_value = outcome
         
         cache_entry = {
             'user': 'TestUser',
@@ -377,25 +297,17 @@ class TestCheckRemotePlaylistUpdate:
             'remote_validation_status': 'valid',
             'music_services': {
                 'spotify': {
-                    'tracks': [{
-                        'artist': 'Artist',
-                        'title': 'Song',
-                        'album': 'Album',
-                        'duration_seconds': 180,
-                        'link': 'https://spotify.com/track'
-                    }],
+                    'tracks': [['Artist', 'Song', 'Album', 180, 'https://spotify.com/track']],
                     'total_duration_seconds': 180,
-                    'cached_at': datetime.now(timezone.utc).isoformat()
+                    'cached_at': FIXED_ISO
                 }
             }
         }
         
-        with pytest.raises(MusicServiceError) as exc_info:
+        with pytest.raises(MusicServiceError, match=message):
             check_remote_playlist_update(
                 playlist,
-                music_service,
+                mock_service,
                 cache_entry,
-                timedelta(minutes=80)
+                _DUR_80M
             )
-        
-        assert "Failed to fetch remote playlist" in str(exc_info.value)
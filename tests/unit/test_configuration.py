@@ -84,3 +84,22 @@ track_cache_file: {track_cache_path}
     assert TRACK_CACHE_FILE_CONFIG in config
     assert config[CACHE_FILE_CONFIG] == str(cache_path)
     assert config[TRACK_CACHE_FILE_CONFIG] == str(track_cache_path)
+
+
+def test_load_config_rejects_python_tags(tmp_path):
+    """Test that config files cannot construct arbitrary Python objects"""
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("output_directory: !!python/tuple [a, b]\n")
+    
+    with pytest.raises(yaml.YAMLError):
+        load_config(str(config_path))
+
+
+@pytest.mark.skipif(not yaml.__with_libyaml__, reason="PyYAML built without libyaml")
+def test_load_config_uses_libyaml_loader(test_config, mocker):
+    """Test that config files are parsed with the C safe loader when libyaml is available"""
+    yaml_load = mocker.spy(yaml, "load")
+    
+    load_config(str(test_config))
+    
+    assert yaml_load.call_args.kwargs['Loader'] is yaml.CSafeLoader
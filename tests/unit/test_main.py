@@ -11,10 +11,13 @@ from mixdiscer.main import (
     _get_music_service,
     _process_single_playlist,
     validate_playlist,
+    validate_playlists_from_files,
 )
 from mixdiscer.music_service import Track, MusicServicePlaylist
 from mixdiscer.playlists import Playlist
 from mixdiscer.validation import ValidationResult
+from mixdiscer import cache as cache_module
+from mixdiscer.cache import PlaylistCacheSession, load_cache
 
 
 def test_calculate_duration():
@@ -81,6 +84,11 @@ def test_get_music_service():
         
         assert service is not None
         assert service.name == "spotify"
+        assert _get_music_service() is service
+        
+        # The shared service is closed again by its exit hook, so closing twice must be safe
+        service.close()
+        service.close()
 
 
 def test_process_single_playlist_no_cache(sample_playlist):
@@ -119,13 +127,7 @@ def test_process_single_playlist_cache_hit(sample_playlist, empty_cache):
             'spotify': {
                 'total_duration_seconds': 180,
                 'tracks': [
-                    {
-                        'artist': 'Cached Artist',
-                        'title': 'Cached Song',
-                        'album': 'Cached Album',
-                        'duration_seconds': 180,
-                        'link': 'https://cached.link'
-                    }
+                    ['Cached Artist', 'Cached Song', 'Cached Album', 180, 'https://cached.link']
                 ]
             }
         }
@@ -269,6 +271,37 @@ def test_validate_playlist_with_cache_update(sample_playlist, tmp_path):
     assert cache_path.exists()
 
 
+def test_validate_playlist_with_cache_session(sample_playlist, tmp_path):
+    """Test that a shared cache session is updated in memory and saved by its owner"""
+    cache_path = tmp_path / "cache.json"
+    
+    mock_service = Mock()
+    mock_service.name = "spotify"
+    mock_service.process_user_playlist.return_value = MusicServicePlaylist(
+        service_name="spotify",
+        tracks=[Track("Artist", "Song", "Album", timedelta(minutes=3), "link")],
+        total_duration=timedelta(minutes=70)
+    )
+    
+    with PlaylistCacheSession(cache_path) as session:
+        with patch('mixdiscer.main.load_cache') as mock_load_cache:
+            result = validate_playlist(
+                sample_playlist.filepath,
+                sample_playlist,
+                mock_service,
+                timedelta(minutes=80),
+                skip_music_service_if_cached=True,
+                playlist_cache=session
+            )
+        
+        mock_load_cache.assert_not_called()
+        assert session.dirty
+        assert not cache_path.exists()
+    
+    assert result.is_valid
+    assert "TestUser/Test Playlist" in load_cache(cache_path)['playlists']
+
+
 @patch('mixdiscer.main.SpotifyMusicService')
 @patch('mixdiscer.main.get_playlists')
 def test_validate_playlist_uses_cache_when_unchanged(mock_get_playlists, mock_spotify, sample_playlist, tmp_path):
@@ -315,3 +348,33 @@ def test_validate_playlist_uses_cache_when_unchanged(mock_get_playlists, mock_sp
     assert result2.is_valid
     # Should not call music service again (still 1 call from first validation)
     assert mock_service_instance.process_user_playlist.call_count == 1
+
+
+def test_validate_playlists_from_files_hashes_each_file_once(test_config, make_playlist, mocker):
+    """Test that each file is hashed once per run and an unchanged file is served from the cache"""
+    playlist_path = make_playlist(test_config.parent / "mixdiscs" / "TestUser", "test.yaml", """
+user: TestUser
+title: Test Playlist
+description: Test
+genre: Rock
+playlist:
+  - Artist - Song
+""")
+    # No incremental method, so the track cache is not used
+    mock_service = Mock(spec=["name", "process_user_playlist"])
+    mock_service.name = "spotify"
+    mock_service.process_user_playlist.return_value = MusicServicePlaylist(
+        service_name="spotify",
+        tracks=[Track("Artist", "Song", "Album", timedelta(minutes=3), "link")],
+        total_duration=timedelta(minutes=3)
+    )
+    mocker.patch('mixdiscer.main._get_music_service', return_value=mock_service)
+    compute_hash = mocker.spy(cache_module, 'compute_playlist_hash')
+    
+    first, = validate_playlists_from_files(str(test_config), [playlist_path], update_cache=True)
+    assert compute_hash.call_count == 1
+    
+    second, = validate_playlists_from_files(str(test_config), [playlist_path], update_cache=True)
+    assert compute_hash.call_count == 2
+    assert first.is_valid and second.is_valid
+    assert mock_service.process_user_playlist.call_count == 1
@@ -1,5 +1,6 @@
 """ Unit tests for playlists.py """
 
+import os
 import pytest
 from pathlib import Path
 import yaml
@@ -47,6 +48,12 @@ def test_validate_username_format_invalid_chars():
             validate_username_format(username)
 
 
+def test_validate_username_format_trailing_newline():
+    """Test that a trailing newline is not accepted as part of a username"""
+    with pytest.raises(PlaylistValidationError, match="can only contain"):
+        validate_username_format("username\n")
+
+
 def test_validate_username_format_hyphen_underscore():
     """Test that hyphens and underscores are allowed"""
     validate_username_format("user-name")
@@ -311,6 +318,41 @@ playlist:
         load_playlist(playlist_path)
 
 
+def test_load_playlist_non_string_title(tmp_path):
+    """Test that a title which YAML parses as a number is rejected"""
+    playlist_path = tmp_path / "TestUser" / "test.yaml"
+    playlist_path.parent.mkdir(parents=True)
+    
+    playlist_path.write_text("""
+user: TestUser
+title: 123
+description: Test
+genre: Rock
+playlist:
+  - Artist - Song
+""")
+    
+    with pytest.raises(PlaylistValidationError, match="'title' must be a string"):
+        load_playlist(playlist_path)
+
+
+def test_load_playlist_checks_folder_before_contents(tmp_path):
+    """Test that a username/folder mismatch is reported before other content errors"""
+    playlist_path = tmp_path / "OtherUser" / "test.yaml"
+    playlist_path.parent.mkdir(parents=True)
+    
+    playlist_path.write_text("""
+user: TestUser
+title: Test
+description: Test
+genre: Rock
+remote_playlist: https://example.com/not-spotify
+""")
+    
+    with pytest.raises(PlaylistValidationError, match="does not match folder name"):
+        load_playlist(playlist_path, tmp_path)
+
+
 def test_load_playlist_empty_tracks(tmp_path):
     """Test that empty playlist is rejected"""
     playlist_path = tmp_path / "TestUser" / "test.yaml"
@@ -395,6 +437,32 @@ playlist:
     assert any(p.user == "AnotherUser" for p in playlists)
 
 
+def test_get_playlists_includes_hidden_entries(temp_mixdisc_dir):
+    """Test that dot-prefixed playlist files are scanned, as glob('*/*.yaml') does"""
+    body = """
+user: {user}
+title: {title}
+description: Test
+genre: Rock
+playlist:
+  - Artist - Song
+"""
+    user_dir = temp_mixdisc_dir / "TestUser"
+    (user_dir / "visible.yaml").write_text(body.format(user="TestUser", title="Visible"))
+    (user_dir / ".draft.yaml").write_text(body.format(user="TestUser", title="Draft"))
+    hidden_dir = temp_mixdisc_dir / ".hidden"
+    hidden_dir.mkdir()
+    (hidden_dir / "stray.yaml").write_text(body.format(user="TestUser", title="Stray"))
+    
+    playlists = list(get_playlists(str(temp_mixdisc_dir)))
+    
+    # The file in .hidden/ is scanned but fails the username/folder check
+    assert sorted(p.title for p in playlists) == ["Draft", "Visible"]
+    assert sorted(p.title for p in playlists) == sorted(
+        p.title for p in get_playlists_from_paths(sorted(temp_mixdisc_dir.glob('*/*.yaml')))
+    )
+
+
 def test_get_playlists_skip_invalid(temp_mixdisc_dir):
     """Test that invalid playlists are skipped"""
     user_dir = temp_mixdisc_dir / "TestUser"
@@ -460,3 +528,101 @@ def test_get_playlists_missing_directory():
     """Test that missing directory raises error"""
     with pytest.raises(FileNotFoundError):
         list(get_playlists("/nonexistent/directory"))
+
+
+def test_get_playlists_from_paths_preserves_order(tmp_path):
+    """Test that playlists are yielded in the order of the given paths, skipping invalid files"""
+    base_dir = tmp_path / "mixdiscs"
+    user_dir = base_dir / "TestUser"
+    user_dir.mkdir(parents=True)
+    
+    paths = []
+    for i in range(10):
+        path = user_dir / f"playlist{i}.yaml"
+        if i == 4:
+            path.write_text("user: TestUser\ntitle: Broken\n")
+        else:
+            path.write_text(f"""
+user: TestUser
+title: Playlist {i}
+description: Test
+genre: Rock
+playlist:
+  - Artist - Song
+""")
+        paths.append(path)
+    
+    playlists = list(get_playlists_from_paths(list(reversed(paths)), base_dir))
+    
+    assert [p.title for p in playlists] == [f"Playlist {i}" for i in reversed(range(10)) if i != 4]
+
+
+def test_load_playlist_reuses_parse_for_unchanged_file(tmp_path, mocker):
+    """Test that an unchanged file is only parsed once and edits are picked up"""
+    user_dir = tmp_path / "TestUser"
+    user_dir.mkdir()
+    playlist_path = user_dir / "cached.yaml"
+    playlist_path.write_text("""
+user: TestUser
+title: Cached
+description: Test
+genre: Rock
+playlist:
+  - Artist - Song
+""")
+    yaml_load = mocker.spy(yaml, "load")
+    
+    first = load_playlist(playlist_path, tmp_path)
+    second = load_playlist(playlist_path, tmp_path)
+    
+    assert yaml_load.call_count == 1
+    assert first == second
+    assert first.tracks is not second.tracks
+    
+    playlist_path.write_text(playlist_path.read_text().replace("Cached", "Edited title"))
+    
+    assert load_playlist(playlist_path, tmp_path).title == "Edited title"
+    assert yaml_load.call_count == 2
+
+
+def test_load_playlist_same_size_rewrite_with_same_mtime(tmp_path):
+    """Test that a same-size edit keeping the old timestamp is not served from the cache"""
+    user_dir = tmp_path / "TestUser"
+    user_dir.mkdir()
+    playlist_path = user_dir / "rewrite.yaml"
+    playlist_path.write_text("""
+user: TestUser
+title: Before
+description: Test
+genre: Rock
+playlist:
+  - Artist - Song
+""")
+    stat = playlist_path.stat()
+    assert load_playlist(playlist_path, tmp_path).title == "Before"
+    
+    playlist_path.write_text(playlist_path.read_text().replace("Before", "Latest"))
+    os.utime(playlist_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    
+    assert load_playlist(playlist_path, tmp_path).title == "Latest"
+
+
+@pytest.mark.skipif(not yaml.__with_libyaml__, reason="PyYAML built without libyaml")
+def test_load_playlist_uses_libyaml_loader(tmp_path, mocker):
+    """Test that playlists are parsed with the C safe loader when libyaml is available"""
+    user_dir = tmp_path / "TestUser"
+    user_dir.mkdir()
+    playlist_path = user_dir / "fast.yaml"
+    playlist_path.write_text("""
+user: TestUser
+title: Fast
+description: Test
+genre: Rock
+playlist:
+  - Artist - Song
+""")
+    yaml_load = mocker.spy(yaml, "load")
+    
+    load_playlist(playlist_path, tmp_path)
+    
+    assert yaml_load.call_args.kwargs['Loader'] is yaml.CSafeLoader
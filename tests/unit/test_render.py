@@ -0,0 +1,359 @@
+""" Unit tests for output/render.py """
+
+import os
+import shutil
+import pytest
+from pathlib import Path
+from datetime import datetime, timedelta
+
+from jinja2 import Environment, FileSystemLoader
+
+from mixdiscer.output.render import (
+    duration_format,
+    datetime_format,
+    datetime_short,
+    paginate,
+    create_pagination_info,
+    create_environment,
+    _create_bytecode_cache,
+    render_layout,
+    render_chunks,
+    render_output,
+    BODY_PLACEHOLDER,
+    PLAYLISTS_PER_PAGE,
+    render_manifest_path,
+)
+from mixdiscer.playlists import Playlist
+from mixdiscer.music_service import Track, MusicServicePlaylist, ProcessedPlaylist
+
+
+TEMPLATE_DIR = Path("templates")
+
+
+def make_processed_playlist(tmp_path, user, title, genre="rock"):
+    """Create a ProcessedPlaylist backed by a real YAML file"""
+    playlist_path = tmp_path / "mixdiscs" / user / f"{title}.yaml"
+    playlist_path.parent.mkdir(parents=True, exist_ok=True)
+    playlist_path.write_text(f"user: {user}\ntitle: {title}\n")
+
+    track = Track(
+        artist="Artist",
+        title="Song",
+        album="Album",
+        duration=timedelta(minutes=3),
+        link="https://example.com/track"
+    )
+    return ProcessedPlaylist(
+        user_playlist=Playlist(
+            user=user,
+            title=title,
+            description="A playlist",
+            genre=genre,
+            tracks=[("Artist", "Song", None)],
+            filepath=playlist_path
+        ),
+        music_service_playlists=[
+            MusicServicePlaylist(
+                service_name="spotify",
+                tracks=[track],
+                total_duration=track.duration
+            )
+        ]
+    )
+
+
+def test_duration_format():
+    """Test formatting durations as MM:SS"""
+    assert duration_format(timedelta(minutes=3, seconds=5)) == "3:05"
+    assert duration_format(timedelta(minutes=85)) == "85:00"
+
+
+def test_datetime_filters():
+    """Test the long and short date filters"""
+    dt = datetime(2025, 1, 5, 12, 30)
+
+    assert datetime_format(dt) == "January 05, 2025"
+    assert datetime_short(dt) == "2025-01-05"
+    assert datetime_format(None) == "Unknown"
+    assert datetime_short(None) == "Unknown"
+
+
+def test_paginate():
+    """Test splitting items into pages"""
+    assert paginate(list(range(5)), 2) == [[0, 1], [2, 3], [4]]
+    assert paginate([], 2) == []
+
+
+def test_create_pagination_info_single_page():
+    """Test that no pagination info is returned for a single page"""
+    assert create_pagination_info(1, 1, "all-playlists") is None
+
+
+def test_create_pagination_info_links():
+    """Test pagination links for a middle page"""
+    info = create_pagination_info(3, 5, "all-playlists")
+
+    assert info['pages'] == [1, 2, 3, 4, 5]
+    assert info['prev_page'] == "all-playlists-page2.html"
+    assert info['next_page'] == "all-playlists-page4.html"
+    assert info['page_links'][1] == "all-playlists.html"
+
+
+def test_create_pagination_info_links_only_window():
+    """Test that links are only built for the visible page window"""
+    info = create_pagination_info(10, 25, "all-playlists")
+
+    assert info['pages'] == [8, 9, 10, 11, 12]
+    assert set(info['page_links']) == {8, 9, 10, 11, 12}
+    assert info['prev_page'] == "all-playlists-page9.html"
+    assert info['next_page'] == "all-playlists-page11.html"
+
+
+def test_create_pagination_info_edges():
+    """Test there are no previous/next links at the first and last pages"""
+    first = create_pagination_info(1, 3, "all-playlists")
+    last = create_pagination_info(3, 3, "all-playlists")
+
+    assert first['prev_page'] is None
+    assert first['next_page'] == "all-playlists-page2.html"
+    assert last['prev_page'] == "all-playlists-page2.html"
+    assert last['next_page'] is None
+
+
+def test_create_environment_is_cached():
+    """Test that the environment is reused for the same template directory"""
+    env = create_environment(TEMPLATE_DIR)
+
+    assert create_environment(TEMPLATE_DIR.resolve()) is env
+    assert env.auto_reload is True
+    assert env.bytecode_cache is not None
+    assert 'duration_format' in env.filters
+
+
+def test_create_environment_reloads_edited_template(tmp_path):
+    """Test that a template edited after first use is re-read by the cached environment"""
+    template_file = tmp_path / "page.html.j2"
+    template_file.write_text("old")
+    env = create_environment(tmp_path)
+    assert env.get_template("page.html.j2").render() == "old"
+
+    template_file.write_text("new")
+    stat = template_file.stat()
+    os.utime(template_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert create_environment(tmp_path).get_template("page.html.j2").render() == "new"
+
+
+def test_bytecode_cache_uses_xdg_cache_home(tmp_path, monkeypatch):
+    """Test that the bytecode cache lives under XDG_CACHE_HOME, not the shared temp directory"""
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+
+    cache = _create_bytecode_cache()
+
+    assert cache.directory == str(tmp_path / 'mixdiscer' / 'jinja2')
+    assert (tmp_path / 'mixdiscer' / 'jinja2').is_dir()
+
+
+def test_render_chunks_matches_render():
+    """Test that driving the render function directly matches Template.render"""
+    template = Environment().from_string("{% for x in items %}{{ x }},{% endfor %}")
+    context = {'items': [1, 2, 3]}
+
+    assert "".join(render_chunks(template, context)) == template.render(context)
+
+
+def test_render_chunks_raises_template_errors():
+    """Test that errors raised while rendering propagate"""
+    template = Environment().from_string("{{ 1 // 0 }}")
+
+    with pytest.raises(ZeroDivisionError):
+        "".join(render_chunks(template, {}))
+
+
+def test_render_layout_splits_chrome():
+    """Test the layout is split into header and footer around the body"""
+    env = Environment(loader=FileSystemLoader(TEMPLATE_DIR))
+
+    header, footer = render_layout(env, show_all_link=True)
+
+    assert BODY_PLACEHOLDER not in header
+    assert BODY_PLACEHOLDER not in footer
+    assert "← Back to Recent" in header
+    assert "</html>" in footer
+
+
+def test_render_output_writes_pages(tmp_path):
+    """Test that index, user, genre and listing pages are written"""
+    playlists = [
+        make_processed_playlist(tmp_path, "UserOne", "First", genre="rock"),
+        make_processed_playlist(tmp_path, "UserTwo", "Second", genre="jazz"),
+    ]
+    output_dir = tmp_path / "output"
+
+    render_output(playlists, output_dir, TEMPLATE_DIR)
+
+    for page in [
+        "index.html",
+        "all-playlists.html",
+        "user-UserOne.html",
+        "user-UserTwo.html",
+        "genre-rock.html",
+        "genre-jazz.html",
+        "users.html",
+        "genres.html",
+        "frozen-playlists.html",
+        "style.css",
+    ]:
+        assert (output_dir / page).exists(), page
+
+    index = (output_dir / "index.html").read_text()
+    assert index.startswith("<!DOCTYPE html>")
+    assert "Recently Updated Playlists" in index
+    assert "First" in index and "Second" in index
+    assert index.rstrip().endswith("</html>")
+
+    user_page = (output_dir / "user-UserOne.html").read_text()
+    assert "Playlists by UserOne" in user_page
+    assert "Second" not in user_page
+
+
+def test_render_output_copies_static_files_only(tmp_path):
+    """Test that static assets are copied but templates are not"""
+    output_dir = tmp_path / "output"
+
+    render_output([], output_dir, TEMPLATE_DIR)
+
+    assert (output_dir / "style.css").read_bytes() == (TEMPLATE_DIR / "style.css").read_bytes()
+    assert (output_dir / "script.js").exists()
+    assert not list(output_dir.glob("*.j2"))
+
+
+def test_render_output_does_not_copy_other_template_files(tmp_path):
+    """Test that only the known static files are published from the template directory"""
+    template_dir = tmp_path / "templates"
+    shutil.copytree(TEMPLATE_DIR, template_dir)
+    (template_dir / "README.md").write_text("notes")
+    (template_dir / "__pycache__").mkdir()
+    output_dir = template_dir / "output"
+    
+    render_output([], output_dir, template_dir)
+    
+    assert sorted(p.name for p in output_dir.iterdir() if p.suffix in {".css", ".js", ".md"}) == [
+        "script.js", "style.css"
+    ]
+    assert not (output_dir / "__pycache__").exists()
+    assert not (output_dir / "output").exists()
+
+
+def test_render_output_paginates_all_playlists(tmp_path):
+    """Test that the all-playlists listing is split across pages"""
+    playlists = [
+        make_processed_playlist(tmp_path, "UserOne", f"Playlist {i}")
+        for i in range(PLAYLISTS_PER_PAGE + 1)
+    ]
+    output_dir = tmp_path / "output"
+
+    render_output(playlists, output_dir, TEMPLATE_DIR)
+
+    assert (output_dir / "all-playlists.html").exists()
+    page_two = (output_dir / "all-playlists-page2.html").read_text()
+    assert "All Playlists (Page 2 of 2)" in page_two
+    assert 'href="all-playlists.html"' in page_two
+
+
+def test_render_output_parallel_matches_serial(tmp_path, monkeypatch):
+    """Test that rendering pages in worker processes produces the same output"""
+    monkeypatch.setattr("mixdiscer.output.render.PARALLEL_RENDER_MIN_PAGES", 1)
+    playlists = [
+        make_processed_playlist(tmp_path, f"User{i}", f"Playlist {i}", genre=f"genre{i}")
+        for i in range(3)
+    ]
+    serial_dir = tmp_path / "serial"
+    parallel_dir = tmp_path / "parallel"
+
+    render_output(playlists, serial_dir, TEMPLATE_DIR, max_workers=1)
+    render_output(playlists, parallel_dir, TEMPLATE_DIR, max_workers=2)
+
+    serial_pages = sorted(p.name for p in serial_dir.glob("*.html"))
+    assert serial_pages == sorted(p.name for p in parallel_dir.glob("*.html"))
+    for name in serial_pages:
+        assert (serial_dir / name).read_text() == (parallel_dir / name).read_text()
+
+
+def test_render_output_index_counts(tmp_path):
+    """Test that the users and genres index pages show playlist counts"""
+    playlists = [
+        make_processed_playlist(tmp_path, "UserOne", "First", genre="rock"),
+        make_processed_playlist(tmp_path, "UserOne", "Second", genre="rock"),
+        make_processed_playlist(tmp_path, "UserTwo", "Third", genre="jazz"),
+    ]
+    output_dir = tmp_path / "output"
+
+    render_output(playlists, output_dir, TEMPLATE_DIR)
+
+    users_page = (output_dir / "users.html").read_text()
+    assert "UserOne (2)" in users_page
+    assert "UserTwo (1)" in users_page
+    assert users_page.index("UserOne") < users_page.index("UserTwo")
+
+    genres_page = (output_dir / "genres.html").read_text()
+    assert "rock (2)" in genres_page
+    assert "jazz (1)" in genres_page
+
+
+def test_render_output_skips_unchanged_pages(tmp_path):
+    """Test that pages rendered from identical input are not rewritten"""
+    playlists = [make_processed_playlist(tmp_path, "UserOne", "First")]
+    output_dir = tmp_path / "output"
+
+    render_output(playlists, output_dir, TEMPLATE_DIR)
+    assert render_manifest_path(output_dir).exists()
+
+    (output_dir / "index.html").write_text("untouched")
+    (output_dir / "user-UserOne.html").unlink()
+
+    render_output(playlists, output_dir, TEMPLATE_DIR)
+
+    assert (output_dir / "index.html").read_text() == "untouched"
+    assert "Playlists by UserOne" in (output_dir / "user-UserOne.html").read_text()
+
+
+def test_render_output_keeps_manifest_out_of_output(tmp_path):
+    """Test that the render manifest is not published and is kept per output directory"""
+    playlists = [make_processed_playlist(tmp_path, "UserOne", "First")]
+    output_dir = tmp_path / "output"
+    other_output_dir = tmp_path / "other-output"
+
+    render_output(playlists, output_dir, TEMPLATE_DIR)
+
+    assert not list(output_dir.glob(".*"))
+    assert not render_manifest_path(output_dir).is_relative_to(output_dir)
+    assert render_manifest_path(output_dir) != render_manifest_path(other_output_dir)
+
+
+def test_render_output_rerenders_changed_pages(tmp_path):
+    """Test that pages are re-rendered when their playlists change"""
+    playlists = [make_processed_playlist(tmp_path, "UserOne", "First")]
+    output_dir = tmp_path / "output"
+
+    render_output(playlists, output_dir, TEMPLATE_DIR)
+    (output_dir / "index.html").write_text("stale")
+
+    playlists[0].user_playlist.description = "An updated description"
+    render_output(playlists, output_dir, TEMPLATE_DIR)
+
+    assert "An updated description" in (output_dir / "index.html").read_text()
+
+
+def test_render_output_user_page_most_recent_first(tmp_path):
+    """Test that user pages list the most recently modified playlist first"""
+    older = make_processed_playlist(tmp_path, "UserOne", "Older")
+    newer = make_processed_playlist(tmp_path, "UserOne", "Newer")
+    os.utime(older.user_playlist.filepath, (1_000_000, 1_000_000))
+    os.utime(newer.user_playlist.filepath, (2_000_000, 2_000_000))
+    output_dir = tmp_path / "output"
+
+    render_output([older, newer], output_dir, TEMPLATE_DIR)
+
+    user_page = (output_dir / "user-UserOne.html").read_text()
+    assert user_page.index("Newer") < user_page.index("Older")
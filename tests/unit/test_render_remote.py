@@ -125,7 +125,7 @@ class TestRenderAllPlaylistsWithRemote:
         
         # Setup cache with existing data
         cache_data = {
-            'version': '1.0',
+            'version': '2.0',
             'last_updated': datetime.now(timezone.utc).isoformat(),
             'playlists': {
                 'TestUser/Remote Playlist': {
@@ -138,13 +138,7 @@ class TestRenderAllPlaylistsWithRemote:
                     'remote_validation_status': 'valid',
                     'music_services': {
                         'spotify': {
-                            'tracks': [{
-                                'artist': 'Cached Artist',
-                                'title': 'Cached Song',
-                                'album': 'Album',
-                                'duration_seconds': 180,
-                                'link': 'http://spotify.com/track'
-                            }],
+                            'tracks': [['Cached Artist', 'Cached Song', 'Album', 180, 'http://spotify.com/track']],
                             'total_duration_seconds': 180,
                             'cached_at': datetime.now(timezone.utc).isoformat()
                         }
@@ -192,7 +186,7 @@ class TestRenderAllPlaylistsWithRemote:
         
         # Setup cache with valid version
         cache_data = {
-            'version': '1.0',
+            'version': '2.0',
             'last_updated': datetime.now(timezone.utc).isoformat(),
             'playlists': {
                 'TestUser/Remote Playlist': {
@@ -205,13 +199,7 @@ class TestRenderAllPlaylistsWithRemote:
                     'remote_validation_status': 'valid',
                     'music_services': {
                         'spotify': {
-                            'tracks': [{
-                                'artist': 'Artist',
-                                'title': 'Song',
-                                'album': 'Album',
-                                'duration_seconds': 180,
-                                'link': 'http://spotify.com/track'
-                            }],
+                            'tracks': [['Artist', 'Song', 'Album', 180, 'http://spotify.com/track']],
                             'total_duration_seconds': 180,
                             'cached_at': '2024-12-01T10:00:00+00:00'
                         }
@@ -267,7 +255,7 @@ class TestRenderAllPlaylistsWithRemote:
         
         # Setup cache with old snapshot
         cache_data = {
-            'version': '1.0',
+            'version': '2.0',
             'last_updated': datetime.now(timezone.utc).isoformat(),
             'playlists': {
                 'TestUser/Remote Playlist': {
@@ -5,7 +5,16 @@ import os
 from unittest.mock import Mock, patch, MagicMock
 from datetime import timedelta
 
-from mixdiscer.music_service.spotify import SpotifyMusicService, SpotifyTrack
+import spotipy
+
+from mixdiscer.music_service.spotify import (
+    SpotifyMusicService,
+    SpotifyTrack,
+    MAX_RATE_LIMIT_WAIT_SECONDS,
+    RATE_LIMIT_RETRIES,
+    SNAPSHOT_CACHE_TTL_SECONDS,
+    TRACK_LOOKUP_WORKERS,
+)
 from mixdiscer.music_service import MusicServiceError
 
 
@@ -17,8 +26,11 @@ def mock_spotify_service():
         'SPOTIPY_CLIENT_SECRET': 'test_client_secret'
     }):
         service = SpotifyMusicService()
-        # Mock the spotify client to avoid actual API calls
+        # Mock the spotify client to avoid actual API calls; track lookup
+        # workers share the same mock rather than creating real clients
         service.spotify = Mock()
+        service.auth_manager = Mock()
+        service._new_client = lambda: service.spotify
         return service
 
 
@@ -88,6 +100,40 @@ class TestGetPlaylistSnapshot:
             assert "Failed to get snapshot" in str(exc_info.value)
             assert exc_info.value.service_name == "spotify"
 
+    def test_get_snapshot_reused_within_ttl(self, mock_spotify_service, monkeypatch):
+        """Test that a snapshot ID is reused until the TTL expires or the cache is cleared"""
+        url = "https://open.spotify.com/playlist/test123"
+        mock_spotify_service.spotify.playlist = Mock(return_value={'snapshot_id': 'snapshot123'})
+        now = [1000.0]
+        monkeypatch.setattr("mixdiscer.music_service.spotify.time.monotonic", lambda: now[0])
+        
+        assert mock_spotify_service.get_playlist_snapshot(url) == 'snapshot123'
+        assert mock_spotify_service.get_playlist_snapshot(url) == 'snapshot123'
+        assert mock_spotify_service.spotify.playlist.call_count == 1
+        
+        now[0] += SNAPSHOT_CACHE_TTL_SECONDS + 1
+        mock_spotify_service.get_playlist_snapshot(url)
+        assert mock_spotify_service.spotify.playlist.call_count == 2
+        
+        mock_spotify_service.clear_snapshot_cache()
+        mock_spotify_service.get_playlist_snapshot(url)
+        assert mock_spotify_service.spotify.playlist.call_count == 3
+
+    def test_fetch_remote_playlist_remembers_snapshot(self, mock_spotify_service):
+        """Test that the snapshot ID seen while fetching is reused"""
+        url = "https://open.spotify.com/playlist/test123"
+        mock_spotify_service.spotify.playlist = Mock(return_value={
+            'name': 'Test Playlist',
+            'snapshot_id': 'snapshot456',
+            'tracks': {'total': 0}
+        })
+        mock_spotify_service.spotify.playlist_items = Mock(return_value={'items': [], 'next': None})
+        
+        mock_spotify_service.fetch_remote_playlist(url)
+        
+        assert mock_spotify_service.get_playlist_snapshot(url) == 'snapshot456'
+        assert mock_spotify_service.spotify.playlist.call_count == 1
+
 
 class TestFetchRemotePlaylist:
     """Test fetching tracks from remote Spotify playlist"""
@@ -202,3 +248,233 @@ class TestProcessUserPlaylistWithRemote:
         assert result.service_name == "spotify"
         assert len(result.tracks) == 1
         mock_spotify_service.spotify.search.assert_called_once()
+
+    def test_process_manual_playlists_search_each_track_once(self, mock_spotify_service):
+        """Test that a track shared by several playlists is only searched for once"""
+        from mixdiscer.playlists import Playlist
+        from pathlib import Path
+        
+        playlists = [
+            Playlist(
+                user="TestUser",
+                title=f"Manual Playlist {i}",
+                description="Test",
+                genre="rock",
+                tracks=[("Artist", "Song", None), ("Artist", "Song", None)],
+                filepath=Path(f"/tmp/test{i}.yaml")
+            )
+            for i in range(2)
+        ]
+        mock_spotify_service.spotify.search = Mock(return_value={
+            'tracks': {
+                'total': 1,
+                'items': [{
+                    'id': 'track1',
+                    'name': 'Song',
+                    'uri': 'spotify:track:track1',
+                    'duration_ms': 180000,
+                    'artists': [{'name': 'Artist'}],
+                    'album': {'name': 'Album'},
+                    'external_urls': {'spotify': 'https://open.spotify.com/track/track1'}
+                }]
+            }
+        })
+        
+        results = [mock_spotify_service.process_user_playlist(p) for p in playlists]
+        
+        assert [[t.title for t in r.tracks] for r in results] == [["Song", "Song"], ["Song", "Song"]]
+        mock_spotify_service.spotify.search.assert_called_once()
+        
+        mock_spotify_service.clear_track_lookups()
+        mock_spotify_service.process_user_playlist(playlists[0])
+        assert mock_spotify_service.spotify.search.call_count == 2
+
+    def test_process_manual_playlists_search_missing_track_again(self, mock_spotify_service):
+        """Test that a track not found is searched for again by the next playlist"""
+        from mixdiscer.playlists import Playlist
+        from pathlib import Path
+        
+        playlists = [
+            Playlist(
+                user="TestUser",
+                title=f"Manual Playlist {i}",
+                description="Test",
+                genre="rock",
+                tracks=[("Artist", "Song", None), ("Artist", "Song", None)],
+                filepath=Path(f"/tmp/test{i}.yaml")
+            )
+            for i in range(2)
+        ]
+        mock_spotify_service.spotify.search = Mock(return_value={'tracks': {'total': 0, 'items': []}})
+        
+        results = [mock_spotify_service.process_user_playlist(p) for p in playlists]
+        
+        assert [r.tracks for r in results] == [[None, None], [None, None]]
+        assert mock_spotify_service.spotify.search.call_count == 2
+
+    def test_process_manual_playlist_keeps_track_order(self, mock_spotify_service):
+        """Test that concurrently searched tracks come back in playlist order"""
+        from mixdiscer.playlists import Playlist
+        from pathlib import Path
+        
+        def search(q, type):
+            title = q.split('track:')[1]
+            return {
+                'tracks': {
+                    'total': 1,
+                    'items': [{
+                        'id': title,
+                        'name': title,
+                        'uri': f'spotify:track:{title}',
+                        'duration_ms': 180000,
+                        'artists': [{'name': 'Artist'}],
+                        'album': {'name': 'Album'},
+                        'external_urls': {'spotify': f'https://open.spotify.com/track/{title}'}
+                    }]
+                }
+            }
+        
+        titles = [f"Song {i}" for i in range(20)]
+        playlist = Playlist(
+            user="TestUser",
+            title="Manual Playlist",
+            description="Test",
+            genre="rock",
+            tracks=[("Artist", title, None) for title in titles],
+            filepath=Path("/tmp/test.yaml")
+        )
+        mock_spotify_service.spotify.search = Mock(side_effect=search)
+        
+        result = mock_spotify_service.process_user_playlist(playlist)
+        
+        assert [t.title for t in result.tracks] == titles
+        assert result.total_duration == timedelta(minutes=60)
+
+    def test_process_manual_playlist_search_error(self, mock_spotify_service):
+        """Test that a failed search is raised as a MusicServiceError"""
+        from mixdiscer.playlists import Playlist
+        from pathlib import Path
+        
+        playlist = Playlist(
+            user="TestUser",
+            title="Manual Playlist",
+            description="Test",
+            genre="rock",
+            tracks=[("Artist", "Song", None)],
+            filepath=Path("/tmp/test.yaml")
+        )
+        mock_spotify_service.spotify.search = Mock(side_effect=RuntimeError("rate limited"))
+        
+        with pytest.raises(MusicServiceError, match="Error finding track Artist - Song: rate limited"):
+            mock_spotify_service.process_user_playlist(playlist)
+
+    def test_process_manual_playlist_retries_rate_limited_search(self, mock_spotify_service, mocker):
+        """Test that a rate-limited search is retried after the Retry-After wait"""
+        from mixdiscer.playlists import Playlist
+        from pathlib import Path
+        
+        playlist = Playlist(
+            user="TestUser",
+            title="Manual Playlist",
+            description="Test",
+            genre="rock",
+            tracks=[("Artist", "Song", None)],
+            filepath=Path("/tmp/test.yaml")
+        )
+        rate_limited = spotipy.SpotifyException(429, -1, "rate limited", headers={'Retry-After': '2'})
+        mock_spotify_service.spotify.search = Mock(side_effect=[
+            rate_limited,
+            {'tracks': {'total': 0, 'items': []}},
+        ])
+        sleep = mocker.patch('mixdiscer.music_service.spotify.time.sleep')
+        
+        result = mock_spotify_service.process_user_playlist(playlist)
+        
+        assert result.tracks == [None]
+        assert mock_spotify_service.spotify.search.call_count == 2
+        sleep.assert_called_once_with(2.0)
+
+    def test_process_manual_playlist_gives_up_when_still_rate_limited(self, mock_spotify_service, mocker):
+        """Test that a search still rate limited after every retry is raised as a MusicServiceError"""
+        from mixdiscer.playlists import Playlist
+        from pathlib import Path
+        
+        playlist = Playlist(
+            user="TestUser",
+            title="Manual Playlist",
+            description="Test",
+            genre="rock",
+            tracks=[("Artist", "Song", None)],
+            filepath=Path("/tmp/test.yaml")
+        )
+        mock_spotify_service.spotify.search = Mock(
+            side_effect=spotipy.SpotifyException(429, -1, "rate limited")
+        )
+        mocker.patch('mixdiscer.music_service.spotify.time.sleep')
+        
+        with pytest.raises(MusicServiceError, match="Error finding track Artist - Song"):
+            mock_spotify_service.process_user_playlist(playlist)
+        assert mock_spotify_service.spotify.search.call_count == RATE_LIMIT_RETRIES + 1
+
+    def test_process_manual_playlist_fails_on_long_retry_after(self, mock_spotify_service, mocker):
+        """Test that a Retry-After longer than the maximum wait fails without sleeping"""
+        from mixdiscer.playlists import Playlist
+        from pathlib import Path
+        
+        playlist = Playlist(
+            user="TestUser",
+            title="Manual Playlist",
+            description="Test",
+            genre="rock",
+            tracks=[("Artist", "Song", None)],
+            filepath=Path("/tmp/test.yaml")
+        )
+        mock_spotify_service.spotify.search = Mock(side_effect=spotipy.SpotifyException(
+            429, -1, "rate limited", headers={'Retry-After': str(MAX_RATE_LIMIT_WAIT_SECONDS * 120)}
+        ))
+        sleep = mocker.patch('mixdiscer.music_service.spotify.time.sleep')
+        
+        with pytest.raises(MusicServiceError, match="Error finding track Artist - Song"):
+            mock_spotify_service.process_user_playlist(playlist)
+        sleep.assert_not_called()
+        mock_spotify_service.spotify.search.assert_called_once()
+
+    def test_process_manual_playlists_reuse_lookup_workers(self, mock_spotify_service):
+        """Test that one worker pool and its clients serve every playlist until close()"""
+        from mixdiscer.playlists import Playlist
+        from pathlib import Path
+        
+        playlists = [
+            Playlist(
+                user="TestUser",
+                title=f"Manual Playlist {i}",
+                description="Test",
+                genre="rock",
+                tracks=[("Artist", f"Song {i} {j}", None) for j in range(8)],
+                filepath=Path(f"/tmp/test{i}.yaml")
+            )
+            for i in range(5)
+        ]
+        mock_spotify_service.spotify.search = Mock(return_value={'tracks': {'total': 0, 'items': []}})
+        new_client = Mock(return_value=mock_spotify_service.spotify)
+        mock_spotify_service._new_client = new_client
+        
+        for playlist in playlists:
+            mock_spotify_service.process_user_playlist(playlist)
+        executor = mock_spotify_service._lookup_executor
+        
+        assert executor is not None
+        assert new_client.call_count <= TRACK_LOOKUP_WORKERS
+        
+        mock_spotify_service.close()
+        
+        assert mock_spotify_service._lookup_executor is None
+        assert executor._shutdown
+        assert mock_spotify_service.spotify._session.close.call_count == new_client.call_count
+
+    def test_close_without_lookups(self, mock_spotify_service):
+        """Test that closing a service that never started a worker pool is safe"""
+        mock_spotify_service.close()
+        mock_spotify_service.close()
+        
+        assert mock_spotify_service._lookup_executor is None
@@ -14,8 +14,14 @@ from mixdiscer.track_cache import (
     update_track_cache,
     get_track_cache_stats,
     cleanup_stale_tracks,
+    reset_track_cache_counters,
+    TrackCacheSession,
+    ACCESS_HEAP_KEY,
+    DEFAULT_VERSION_KEY,
+    TRACK_CACHE_VERSION,
 )
 from mixdiscer.music_service import Track
+from mixdiscer.music_service.spotify import SpotifyTrack
 
 
 def test_normalize_track_key():
@@ -46,17 +52,87 @@ def test_load_track_cache_existing(tmp_path):
     
     loaded = load_track_cache(cache_path)
     
-    assert loaded['version'] == '2.0'
+    assert loaded['version'] == TRACK_CACHE_VERSION
     assert 'artist - title' in loaded['tracks']
 
 
+def test_load_track_cache_migrates_version_lists(tmp_path):
+    """Test that version 2.0 version lists are converted to dicts on load"""
+    cache_path = tmp_path / "tracks.json"
+    default_version = {'found': True, 'normalized_album': 'album one', 'is_default': True}
+    album_version = {'found': True, 'normalized_album': 'album two', 'is_default': False}
+    cache_path.write_text(json.dumps({
+        'version': '2.0',
+        'tracks': {
+            'artist - title': {
+                'versions': {'spotify': [default_version, album_version]}
+            }
+        }
+    }))
+
+    loaded = load_track_cache(cache_path)
+
+    assert loaded['version'] == TRACK_CACHE_VERSION
+    assert loaded['tracks']['artist - title']['versions']['spotify'] == {
+        DEFAULT_VERSION_KEY: default_version,
+        'album two': album_version,
+    }
+
+
+def test_load_track_cache_migrates_timestamps(tmp_path):
+    """Test that ISO timestamps from older caches are converted to epoch seconds"""
+    cache_path = tmp_path / "tracks.json"
+    cache_path.write_text(json.dumps({
+        'version': '3.0',
+        'tracks': {
+            'artist - title': {
+                'first_seen': '2024-01-01T00:00:00+00:00',
+                'last_accessed': '2024-01-02T00:00:00.500000+00:00',
+                'versions': {'spotify': {'album': {'found': True, 'cached_at': '2024-01-01T00:00:00+00:00'}}}
+            }
+        }
+    }))
+
+    loaded = load_track_cache(cache_path)
+
+    entry = loaded['tracks']['artist - title']
+    jan_1 = datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp()
+    assert loaded['version'] == TRACK_CACHE_VERSION
+    assert entry['first_seen'] == jan_1
+    assert entry['last_accessed'] == jan_1 + 86400
+    assert isinstance(entry['last_accessed'], int)
+    assert entry['versions']['spotify']['album']['cached_at'] == jan_1
+
+
+def test_load_track_cache_interns_repeated_strings(tmp_path):
+    """Test that repeated artist and album values share one string object"""
+    cache_path = tmp_path / "tracks.json"
+    version = {'found': True, 'artist': 'Artist', 'album': 'Album',
+               'normalized_album': 'album', 'is_default': False}
+    cache_path.write_text(json.dumps({
+        'version': TRACK_CACHE_VERSION,
+        'tracks': {
+            'artist - one': {'versions': {'spotify': {'album': dict(version)}}},
+            'artist - two': {'versions': {'spotify': {'album': dict(version)}}},
+        }
+    }))
+
+    loaded = load_track_cache(cache_path)
+
+    one = loaded['tracks']['artist - one']['versions']['spotify']['album']
+    two = loaded['tracks']['artist - two']['versions']['spotify']['album']
+    assert one == version
+    assert one['artist'] is two['artist']
+    assert one['album'] is two['album']
+
+
 def test_load_track_cache_missing(tmp_path):
     """Test loading non-existent cache creates empty structure"""
     cache_path = tmp_path / "nonexistent.json"
     
     cache = load_track_cache(cache_path)
     
-    assert cache['version'] == '2.0'
+    assert cache['version'] == TRACK_CACHE_VERSION
     assert cache['tracks'] == {}
     assert 'last_updated' in cache
 
@@ -68,7 +144,7 @@ def test_load_track_cache_invalid_json(tmp_path):
     
     cache = load_track_cache(cache_path)
     
-    assert cache['version'] == '2.0'
+    assert cache['version'] == TRACK_CACHE_VERSION
     assert cache['tracks'] == {}
 
 
@@ -93,6 +169,69 @@ def test_save_track_cache(tmp_path):
     assert '2024-01-15' in saved['last_updated']
 
 
+def test_save_track_cache_replaces_atomically(tmp_path):
+    """Test that saving leaves no temporary file and overwrites the old cache"""
+    cache_path = tmp_path / "tracks.json"
+    cache_path.write_text("old contents")
+
+    save_track_cache({'version': '2.0', 'tracks': {}}, cache_path)
+
+    assert json.loads(cache_path.read_text())['tracks'] == {}
+    assert [p.name for p in tmp_path.iterdir()] == ["tracks.json"]
+
+
+def test_save_and_load_track_cache_round_trip(tmp_path):
+    """Test that a saved cache loads back unchanged"""
+    cache_path = tmp_path / "tracks.json"
+    cache_data = {'version': TRACK_CACHE_VERSION, 'tracks': {}}
+    track = Track('Artist', 'Tïtle', 'Album', timedelta(minutes=3), 'https://link')
+    update_track_cache('Artist', 'Tïtle', 'Album', 'spotify', track, cache_data, is_default=True)
+
+    save_track_cache(cache_data, cache_path)
+    loaded = load_track_cache(cache_path)
+
+    assert loaded == cache_data
+
+
+def test_update_track_cache_timestamps_follow_clock():
+    """Test that access timestamps move on as time passes"""
+    cache_data = {'tracks': {}}
+
+    with freeze_time("2024-01-15 12:00:00") as frozen:
+        update_track_cache('Artist', 'Title', None, 'spotify', None, cache_data, is_default=True)
+        entry = cache_data['tracks']['artist - title']
+        assert entry['first_seen'] == entry['last_accessed']
+        assert entry['last_accessed'] == datetime(2024, 1, 15, 12, tzinfo=timezone.utc).timestamp()
+        assert isinstance(entry['last_accessed'], int)
+
+        frozen.tick(timedelta(seconds=5))
+        get_cached_track('Artist', 'Title', None, 'spotify', cache_data)
+
+    assert entry['last_accessed'] - entry['first_seen'] == 5
+
+
+def test_track_cache_session_saves_once_when_dirty(tmp_path):
+    """Test that a session saves its updates on exit"""
+    cache_path = tmp_path / "tracks.json"
+
+    with TrackCacheSession(cache_path) as session:
+        update_track_cache('Artist', 'Title', None, 'spotify', None, session.cache_data, is_default=True)
+        session.mark_dirty()
+        assert not cache_path.exists()
+
+    assert 'artist - title' in load_track_cache(cache_path)['tracks']
+
+
+def test_track_cache_session_skips_save_when_clean(tmp_path):
+    """Test that an unmodified session does not write the cache"""
+    cache_path = tmp_path / "tracks.json"
+
+    with TrackCacheSession(cache_path) as session:
+        assert session.cache_data['tracks'] == {}
+
+    assert not cache_path.exists()
+
+
 def test_get_cached_track_hit_default():
     """Test cache hit for default version (no album)"""
     cache_data = {
@@ -100,8 +239,8 @@ def test_get_cached_track_hit_default():
             'artist - title': {
                 'query': {'artist': 'Artist', 'title': 'Title'},
                 'versions': {
-                    'spotify': [
-                        {
+                    'spotify': {
+                        DEFAULT_VERSION_KEY: {
                             'found': True,
                             'album': 'Album',
                             'normalized_album': 'album',
@@ -109,7 +248,7 @@ def test_get_cached_track_hit_default():
                             'link': 'https://example.com/track',
                             'is_default': True
                         }
-                    ]
+                    }
                 }
             }
         }
@@ -130,8 +269,8 @@ def test_get_cached_track_hit_with_album():
             'artist - title': {
                 'query': {'artist': 'Artist', 'title': 'Title'},
                 'versions': {
-                    'spotify': [
-                        {
+                    'spotify': {
+                        'album one': {
                             'found': True,
                             'album': 'Album One',
                             'normalized_album': 'album one',
@@ -139,7 +278,7 @@ def test_get_cached_track_hit_with_album():
                             'link': 'https://example.com/track',
                             'is_default': False
                         }
-                    ]
+                    }
                 }
             }
         }
@@ -151,6 +290,19 @@ def test_get_cached_track_hit_with_album():
     assert track.album == 'Album One'
 
 
+def test_get_cached_track_album_matches_default_version():
+    """Test that an album lookup is served by a default version from that album"""
+    cache_data = {'tracks': {}}
+    track = Track('Artist', 'Title', 'Album', timedelta(minutes=3), 'https://link')
+    update_track_cache('Artist', 'Title', None, 'spotify', track, cache_data, is_default=True)
+
+    cached = get_cached_track('Artist', 'Title', 'ALBUM', 'spotify', cache_data)
+
+    assert cached is not None
+    assert cached.link == 'https://link'
+    assert get_cached_track('Artist', 'Title', 'Other', 'spotify', cache_data) is None
+
+
 def test_get_cached_track_miss():
     """Test cache miss"""
     cache_data = {'tracks': {}}
@@ -167,14 +319,14 @@ def test_get_cached_track_not_found_result():
             'artist - title': {
                 'query': {'artist': 'Artist', 'title': 'Title'},
                 'versions': {
-                    'spotify': [
-                        {
+                    'spotify': {
+                        DEFAULT_VERSION_KEY: {
                             'found': False,
                             'album': None,
                             'normalized_album': '',
                             'is_default': True
                         }
-                    ]
+                    }
                 }
             }
         }
@@ -206,7 +358,46 @@ def test_update_track_cache_new_track():
     entry = cache_data['tracks'][track_key]
     assert 'spotify' in entry['versions']
     assert len(entry['versions']['spotify']) == 1
-    assert entry['versions']['spotify'][0]['is_default'] is True
+    assert entry['versions']['spotify'][DEFAULT_VERSION_KEY]['is_default'] is True
+
+
+def test_update_track_cache_unchanged_version_kept():
+    """Test that re-caching an identical result leaves the stored version alone"""
+    cache_data = {'tracks': {}}
+    track = Track('Artist', 'Title', 'Album', timedelta(minutes=3), 'https://link')
+
+    with freeze_time("2024-01-01 12:00:00") as frozen:
+        update_track_cache('Artist', 'Title', 'Album', 'spotify', track, cache_data)
+        update_track_cache('Artist', 'Title', None, 'spotify', None, cache_data, is_default=True)
+        versions = cache_data['tracks']['artist - title']['versions']['spotify']
+        found_version = versions['album']
+        not_found_version = versions[DEFAULT_VERSION_KEY]
+
+        frozen.tick(timedelta(hours=1))
+        update_track_cache('Artist', 'Title', 'Album', 'spotify', track, cache_data)
+        update_track_cache('Artist', 'Title', None, 'spotify', None, cache_data, is_default=True)
+
+        assert versions['album'] is found_version
+        assert versions[DEFAULT_VERSION_KEY] is not_found_version
+        entry = cache_data['tracks']['artist - title']
+        assert entry['last_accessed'] - entry['first_seen'] == 3600
+
+        changed = Track('Artist', 'Title', 'Album', timedelta(minutes=4), 'https://link')
+        update_track_cache('Artist', 'Title', 'Album', 'spotify', changed, cache_data)
+
+    assert versions['album']['duration_seconds'] == 240
+
+
+def test_update_track_cache_service_specific_fields():
+    """Test that fields beyond the core Track fields are cached separately"""
+    cache_data = {'tracks': {}}
+    track = SpotifyTrack('Artist', 'Title', 'Album', timedelta(minutes=3),
+                         'https://link', 'spotify:track:1', '1')
+
+    update_track_cache('Artist', 'Title', 'Album', 'spotify', track, cache_data)
+
+    version = cache_data['tracks']['artist - title']['versions']['spotify']['album']
+    assert version['service_specific'] == {'uri': 'spotify:track:1', 'track_id': '1'}
 
 
 def test_update_track_cache_not_found():
@@ -219,7 +410,7 @@ def test_update_track_cache_not_found():
     assert track_key in cache_data['tracks']
     
     entry = cache_data['tracks'][track_key]
-    assert entry['versions']['spotify'][0]['found'] is False
+    assert entry['versions']['spotify'][DEFAULT_VERSION_KEY]['found'] is False
 
 
 def test_update_track_cache_multiple_versions():
@@ -238,6 +429,21 @@ def test_update_track_cache_multiple_versions():
     assert len(versions) == 2
 
 
+def test_update_track_cache_replaces_existing_version():
+    """Test that re-caching the same album replaces the version"""
+    cache_data = {'tracks': {}}
+
+    track1 = Track('Artist', 'Title', 'Album', timedelta(minutes=3), 'https://link1')
+    track2 = Track('Artist', 'Title', 'Album', timedelta(minutes=3), 'https://link2')
+
+    update_track_cache('Artist', 'Title', 'Album', 'spotify', track1, cache_data)
+    update_track_cache('Artist', 'Title', 'Album', 'spotify', track2, cache_data)
+
+    versions = cache_data['tracks']['artist - title']['versions']['spotify']
+    assert list(versions) == ['album']
+    assert versions['album']['link'] == 'https://link2'
+
+
 def test_get_track_cache_stats():
     """Test cache statistics generation"""
     cache_data = {
@@ -245,17 +451,17 @@ def test_get_track_cache_stats():
             'artist1 - title1': {
                 'access_count': 10,
                 'versions': {
-                    'spotify': [
-                        {'found': True}
-                    ]
+                    'spotify': {
+                        DEFAULT_VERSION_KEY: {'found': True}
+                    }
                 }
             },
             'artist2 - title2': {
                 'access_count': 5,
                 'versions': {
-                    'spotify': [
-                        {'found': False}
-                    ]
+                    'spotify': {
+                        DEFAULT_VERSION_KEY: {'found': False}
+                    }
                 }
             },
         }
@@ -271,17 +477,59 @@ def test_get_track_cache_stats():
     assert stats['services']['spotify']['not_found'] == 1
 
 
+def test_get_track_cache_stats_most_accessed():
+    """Test the most accessed tracks are the top 10 by access count"""
+    cache_data = {
+        'tracks': {
+            f'artist - title{i}': {'access_count': i, 'versions': {}}
+            for i in range(15)
+        }
+    }
+
+    stats = get_track_cache_stats(cache_data)
+
+    assert stats['most_accessed'][0] == ('artist - title14', 14)
+    assert [count for _, count in stats['most_accessed']] == list(range(14, 4, -1))
+
+    stats = get_track_cache_stats(cache_data, include_most_accessed=False)
+
+    assert stats['most_accessed'] == []
+    assert stats['total_tracks'] == 15
+
+
+def test_get_track_cache_stats_runtime_counters():
+    """Test that lookup hits, negative hits and misses are counted"""
+    reset_track_cache_counters()
+    cache_data = {'tracks': {}}
+    track = Track('Artist', 'Found', 'Album', timedelta(minutes=3), 'https://link')
+    update_track_cache('Artist', 'Found', None, 'spotify', track, cache_data, is_default=True)
+    update_track_cache('Artist', 'Missing', None, 'spotify', None, cache_data, is_default=True)
+
+    get_cached_track('Artist', 'Found', None, 'spotify', cache_data)
+    get_cached_track('Artist', 'Found', 'Album', 'spotify', cache_data)
+    get_cached_track('Artist', 'Missing', None, 'spotify', cache_data)
+    get_cached_track('Artist', 'Found', 'Other Album', 'spotify', cache_data)
+    get_cached_track('Artist', 'Unknown', None, 'spotify', cache_data)
+
+    stats = get_track_cache_stats(cache_data)
+
+    assert stats['runtime'] == {'hits': 2, 'negative_hits': 1, 'misses': 2}
+
+    reset_track_cache_counters()
+    assert get_track_cache_stats(cache_data)['runtime'] == {'hits': 0, 'negative_hits': 0, 'misses': 0}
+
+
 @freeze_time("2024-06-01 12:00:00")
 def test_cleanup_stale_tracks():
     """Test cleanup of stale tracks"""
     cache_data = {
         'tracks': {
             'current - track': {
-                'last_accessed': '2024-05-30T00:00:00+00:00',  # 2 days old
+                'last_accessed': datetime(2024, 5, 30, tzinfo=timezone.utc).timestamp(),  # 2 days old
                 'versions': {}
             },
             'old - track': {
-                'last_accessed': '2024-01-01T00:00:00+00:00',  # 151 days old
+                'last_accessed': datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp(),  # 151 days old
                 'versions': {}
             },
         }
@@ -301,7 +549,7 @@ def test_cleanup_stale_tracks_keep_current():
     cache_data = {
         'tracks': {
             'current - old': {
-                'last_accessed': '2020-01-01T00:00:00+00:00',  # Very old
+                'last_accessed': datetime(2020, 1, 1, tzinfo=timezone.utc).timestamp(),  # Very old
                 'versions': {}
             },
         }
@@ -314,3 +562,46 @@ def test_cleanup_stale_tracks_keep_current():
     
     assert removed == 0
     assert 'current - old' in cache_data['tracks']
+
+
+def test_cleanup_stale_tracks_repeated_with_index():
+    """Test that later cleanups honour accesses and additions made since the first"""
+    cache_data = {'tracks': {}}
+
+    with freeze_time("2024-01-01 12:00:00") as frozen:
+        update_track_cache('Old', 'One', None, 'spotify', None, cache_data, is_default=True)
+        update_track_cache('Old', 'Two', None, 'spotify', None, cache_data, is_default=True)
+
+        frozen.move_to("2024-02-01 12:00:00")
+        assert cleanup_stale_tracks(cache_data, set(), max_age_days=90) == 0
+        assert ACCESS_HEAP_KEY in cache_data
+
+        # Refresh one track and add a new one after the index was built
+        frozen.move_to("2024-03-01 12:00:00")
+        get_cached_track('Old', 'Two', None, 'spotify', cache_data)
+        update_track_cache('New', 'Three', None, 'spotify', None, cache_data, is_default=True)
+
+        frozen.move_to("2024-05-01 12:00:00")
+        removed = cleanup_stale_tracks(cache_data, set(), max_age_days=90)
+
+        assert removed == 1
+        assert set(cache_data['tracks']) == {'old - two', 'new - three'}
+
+        frozen.move_to("2024-09-01 12:00:00")
+        removed = cleanup_stale_tracks(cache_data, {'new - three'}, max_age_days=90)
+
+    assert removed == 1
+    assert set(cache_data['tracks']) == {'new - three'}
+
+
+def test_save_track_cache_excludes_access_index(tmp_path):
+    """Test that the in-memory cleanup index is not written to disk"""
+    cache_path = tmp_path / "tracks.json"
+    cache_data = {'tracks': {}}
+    update_track_cache('Artist', 'Title', None, 'spotify', None, cache_data, is_default=True)
+    cleanup_stale_tracks(cache_data, set())
+
+    save_track_cache(cache_data, cache_path)
+
+    assert ACCESS_HEAP_KEY in cache_data
+    assert ACCESS_HEAP_KEY not in json.loads(cache_path.read_text())